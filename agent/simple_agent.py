@@ -5,7 +5,11 @@ class SimpleAgent:
     A simple agent for the embodied agent framework.
     - Action space: keyboard (w, a, s, d, e, space), mouse movement (left/right/up/down), mouse click (left/right), and noop (do nothing).
     - At each step, selects a random combination of actions or chooses to do nothing.
+    - feature_subscriptions lists the perception features act() reads (none: it ignores the observation);
+      pass it as VisualPerception/AudioPerception(subscriptions=...) so unused extractors are not run.
     """
+    feature_subscriptions = ()
+
     def __init__(self):
         self.keyboard_keys = ['w', 'a', 's', 'd', 'e', 'space']
         self.mouse_moves = [(10,0), (-10,0), (0,10), (0,-10)]  # dx, dy
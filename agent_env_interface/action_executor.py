@@ -0,0 +1,256 @@
+"""
+action_executor.py
+
+Batched, timed action dispatch for AgentEnvInterface.
+- The agent thread submits whole action batches (the list returned by agent.act) to a queue and returns at once.
+- An executor thread expands each action into press/hold/release operations on a schedule (a heap of due times),
+  so timed releases never sleep on the agent thread.
+- Consecutive mouse moves due at the same time are coalesced into one move (never across a click or button op).
+- Mouse buttons are resolved once (not imported per call); keys/buttons still held are released on stop/release_all,
+  which also cancels every pending operation (presses, releases, moves and clicks).
+- Records the dispatch latency of every operation (actual dispatch time - scheduled time) and submit-to-dispatch time.
+
+Action format (extends the one used by send_action):
+    {'type': 'keyboard', 'key': 'w', 'press': True}           press (or release if press is False)
+    {'type': 'keyboard', 'key': 'w', 'hold': 0.2}             press, release 0.2 s later
+    {'type': 'mouse', 'move': (dx, dy)}                         relative move
+    {'type': 'mouse', 'click': 'left'}                          click
+    {'type': 'mouse', 'button': 'left', 'hold': 0.3}           press, release 0.3 s later
+    {'type': 'noop'}
+Any action may carry 'delay': seconds after submission at which it starts.
+"""
+
+import collections
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+def default_button_map():
+    """Mouse button names -> pynput buttons (imported once, here)."""
+    from pynput.mouse import Button
+    return {'left': Button.left, 'right': Button.right, 'middle': Button.middle}
+
+
+class ActionExecutor:
+    def __init__(self, keyboard, mouse, button_map=None, coalesce_moves=True, history=1000):
+        """
+        keyboard: controller with press(key)/release(key) (e.g., pynput.keyboard.Controller)
+        mouse: controller with move(dx, dy)/press(button)/release(button)/click(button) (e.g., pynput.mouse.Controller)
+        button_map: button name -> button object (default: pynput buttons, see default_button_map)
+        coalesce_moves: merge consecutive mouse moves that are due together into one move
+        history: number of recent latencies kept for stats
+        """
+        self.keyboard = keyboard
+        self.mouse = mouse
+        self.buttons = default_button_map() if button_map is None else button_map
+        self.coalesce_moves = coalesce_moves
+        self._queue = queue.Queue()
+        self._schedule = []  # Heap of (due_time, seq, op, target, submit_time)
+        self._seq = itertools.count()
+        self._held = set()  # ('key', key) / ('button', button) currently pressed
+        self._lock = threading.Lock()  # Guards controller calls and _held (dispatch vs. release_all)
+        self._idle = threading.Event()
+        self._idle.set()
+        self._idle_lock = threading.Lock()  # Orders submit() against the executor's idle check
+        self._stop = object()
+        self._thread = None
+        self.latencies = collections.deque(maxlen=history)  # Seconds dispatched after scheduled time
+        self.submit_to_dispatch = collections.deque(maxlen=history)
+        self.dispatched = 0
+        self.coalesced_moves = 0
+        self.errors = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="ActionExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Stop the executor thread, dropping operations not yet due, and release anything still held.
+        The release runs on the executor thread, ahead of the stop; if the thread does not exit within timeout
+        it is kept (still running) and finishes both on its own.
+        """
+        if self._thread is None:
+            self._release_all()
+            return
+        self.release_all()
+        self._queue.put(self._stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._thread = None
+            self._idle.set()  # Stopped: nothing more will be dispatched
+
+    def submit(self, actions, submit_time=None):
+        """Queue a batch of actions (non-blocking). submit_time (time.monotonic()) defaults to now."""
+        with self._idle_lock:
+            self._idle.clear()
+            self._queue.put((list(actions), time.monotonic() if submit_time is None else submit_time))
+
+    def wait_idle(self, timeout=None):
+        """Block until every submitted operation (including timed releases) has been dispatched."""
+        return self._idle.wait(timeout)
+
+    def release_all(self):
+        """
+        Release every held key/button (e.g., when the game loses focus) and cancel every pending operation:
+        a delayed press cannot fire after its release was dropped, and no move or click lands in whatever
+        window has focus now.
+        Runs on the executor thread (atomically with dispatch) when it is running, else on the caller's thread.
+        """
+        if self._thread is not None:
+            with self._idle_lock:
+                self._idle.clear()
+                self._queue.put(('release_all', None))
+        else:
+            self._release_all()
+
+    def _release_all(self):
+        with self._lock:
+            self._schedule = []
+            for kind, target in list(self._held):
+                try:
+                    (self.keyboard if kind == 'key' else self.mouse).release(target)
+                except Exception as e:
+                    print(f"[WARN] ActionExecutor: could not release {target}: {e}")
+            self._held.clear()
+
+    def resolve_button(self, name):
+        if isinstance(name, str):
+            try:
+                return self.buttons[name]
+            except KeyError:
+                raise ValueError(f"Unknown mouse button: {name}")
+        return name  # Already a button object
+
+    def _schedule_op(self, due, op, target, submit_time):
+        heapq.heappush(self._schedule, (due, next(self._seq), op, target, submit_time))
+
+    def _expand(self, actions, submit_time):
+        for action in actions:
+            kind = action.get('type')
+            start = submit_time + action.get('delay', 0.0)
+            hold = action.get('hold')
+            if kind == 'keyboard':
+                key = action['key']
+                if hold is not None:
+                    self._schedule_op(start, 'key_press', key, submit_time)
+                    self._schedule_op(start + hold, 'key_release', key, submit_time)
+                else:
+                    self._schedule_op(start, 'key_press' if action.get('press', True) else 'key_release', key, submit_time)
+            elif kind == 'mouse':
+                if 'move' in action:
+                    self._schedule_op(start, 'move', tuple(action['move']), submit_time)
+                if 'click' in action:
+                    self._schedule_op(start, 'click', self.resolve_button(action['click']), submit_time)
+                if 'button' in action:
+                    button = self.resolve_button(action['button'])
+                    self._schedule_op(start, 'button_press', button, submit_time)
+                    if hold is not None:
+                        self._schedule_op(start + hold, 'button_release', button, submit_time)
+            elif kind != 'noop':
+                print(f"[WARN] ActionExecutor: unknown action type: {kind}")
+
+    def _dispatch(self, op, target):
+        if op == 'key_press':
+            self.keyboard.press(target)
+            self._held.add(('key', target))
+        elif op == 'key_release':
+            self.keyboard.release(target)
+            self._held.discard(('key', target))
+        elif op == 'move':
+            self.mouse.move(*target)
+        elif op == 'click':
+            self.mouse.click(target)
+        elif op == 'button_press':
+            self.mouse.press(target)
+            self._held.add(('button', target))
+        elif op == 'button_release':
+            self.mouse.release(target)
+            self._held.discard(('button', target))
+
+    def _run_due(self):
+        now = time.monotonic()
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due.append(heapq.heappop(self._schedule))
+        if self.coalesce_moves:
+            # Merge runs of consecutive moves (in (due, seq) order) into the run's first slot; a click or
+            # button op in between ends the run, so it still happens where the agent aimed it
+            merged = []
+            for item in due:
+                if item[2] == 'move' and merged and merged[-1][2] == 'move':
+                    previous = merged[-1]
+                    dx, dy = previous[3][0] + item[3][0], previous[3][1] + item[3][1]
+                    merged[-1] = (previous[0], previous[1], 'move', (dx, dy), previous[4])
+                    self.coalesced_moves += 1
+                else:
+                    merged.append(item)
+            due = merged
+        for scheduled, _, op, target, submit_time in due:
+            with self._lock:
+                try:
+                    self._dispatch(op, target)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[ERROR] ActionExecutor: {op} {target} failed: {e}")
+                    continue
+            dispatched = time.monotonic()
+            self.latencies.append(dispatched - scheduled)
+            self.submit_to_dispatch.append(dispatched - submit_time)
+            self.dispatched += 1
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._schedule:
+                timeout = max(0.0, self._schedule[0][0] - time.monotonic())
+            else:
+                with self._idle_lock:
+                    if self._queue.unfinished_tasks == 0:
+                        self._idle.set()
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is self._stop:
+                return
+            if item is not None:
+                if item[0] == 'release_all':
+                    self._release_all()
+                else:
+                    try:
+                        self._expand(*item)
+                    except Exception as e:
+                        self.errors += 1
+                        print(f"[ERROR] ActionExecutor: invalid action batch: {e}")
+                self._queue.task_done()
+                # Drain batches that arrived together before dispatching, so their moves coalesce
+                continue
+            self._run_due()
+
+    def stats(self):
+        """Dispatch latency (ms: p50/p95/max), submit-to-dispatch p95 (ms), and counters."""
+        latencies = list(self.latencies)
+        submitted = list(self.submit_to_dispatch)
+        return {
+            'dispatched': self.dispatched,
+            'coalesced_moves': self.coalesced_moves,
+            'pending': len(self._schedule),
+            'errors': self.errors,
+            'latency_p50_ms': 1000.0 * _percentile(latencies, 50) if latencies else None,
+            'latency_p95_ms': 1000.0 * _percentile(latencies, 95) if latencies else None,
+            'latency_max_ms': 1000.0 * max(latencies) if latencies else None,
+            'submit_to_dispatch_p95_ms': 1000.0 * _percentile(submitted, 95) if submitted else None,
+        }
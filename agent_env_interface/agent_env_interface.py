@@ -4,21 +4,40 @@ agent_env_interface.py
 Agent-Environment Interface for Eastshade Experiment
 --------------------------------------------------
 This module provides a standardized interface between the agent and the game environment.
-It manages orchestrator control, window focus, and action dispatch via keyboard/mouse (pynput).
+It manages orchestrator control, window focus, and action dispatch via keyboard/mouse (pynput, or injected
+controllers such as the simulated ones in sim/ for headless runs).
 Advanced features (state detection, reset/init, safety/intervention) are deferred for future development.
 """
 
 import time
-from pynput.keyboard import Controller as KeyboardController
-from pynput.mouse import Controller as MouseController
+
+try:
+    from agent_env_interface.action_executor import ActionExecutor
+except ImportError:  # Running as a script from inside agent_env_interface/
+    from action_executor import ActionExecutor
 
 class AgentEnvInterface:
-    def __init__(self, orchestrator, window_manager):
+    def __init__(self, orchestrator, window_manager, keyboard=None, mouse=None, button_map=None):
+        """
+        orchestrator: InputOrchestrator (or any object with get_observation/pause/resume)
+        window_manager: provides is_focused() for Eastshade (e.g., focus_tracker.FocusTracker)
+        keyboard, mouse: controllers to inject actions with (default: pynput controllers)
+        button_map: mouse button name -> button object (default: pynput buttons)
+        """
         self.orchestrator = orchestrator
-        self.window_manager = window_manager  # Should provide is_focused() for Eastshade
-        self.keyboard = KeyboardController()
-        self.mouse = MouseController()
+        self.window_manager = window_manager
+        if keyboard is None:
+            from pynput.keyboard import Controller as KeyboardController
+            keyboard = KeyboardController()
+        if mouse is None:
+            from pynput.mouse import Controller as MouseController
+            mouse = MouseController()
+        self.keyboard = keyboard
+        self.mouse = mouse
         self.paused = False
+        # Batched, timed dispatch (send_actions); buttons are resolved once here
+        self.executor = ActionExecutor(self.keyboard, self.mouse, button_map=button_map)
+        self.executor.start()
 
     def check_focus(self):
         """Check if Eastshade window is focused. Pause orchestrator if not."""
@@ -26,6 +45,7 @@ class AgentEnvInterface:
             if not self.paused:
                 self.orchestrator.pause()
                 self.paused = True
+                self.executor.release_all()  # Do not leave keys held while another window has focus
                 print("[INFO] Eastshade not focused. Orchestrator paused.")
         else:
             if self.paused:
@@ -34,33 +54,33 @@ class AgentEnvInterface:
                 print("[INFO] Eastshade focused. Orchestrator resumed.")
 
     def send_action(self, action):
-        """Send keyboard/mouse actions to the game via pynput."""
+        """
+        Send a single keyboard/mouse action to the game (e.g., {'type': 'keyboard', 'key': 'w', 'press': True}).
+        Dispatched by the executor thread like send_actions, so held keys are tracked and release_all covers them.
+        """
         self.check_focus()
         if self.paused:
             print("[WARN] Action not sent: Eastshade not focused.")
             return
-        # Example action format: {'type': 'keyboard', 'key': 'w', 'press': True}
-        if action['type'] == 'keyboard':
-            key = action['key']
-            if action.get('press', True):
-                self.keyboard.press(key)
-            else:
-                self.keyboard.release(key)
-        elif action['type'] == 'mouse':
-            # Example: {'type': 'mouse', 'move': (dx, dy), 'click': 'left'}
-            if 'move' in action:
-                dx, dy = action['move']
-                self.mouse.move(dx, dy)
-            if 'click' in action:
-                from pynput.mouse import Button
-                button_str = action['click']
-                if button_str == 'left':
-                    button = Button.left
-                elif button_str == 'right':
-                    button = Button.right
-                else:
-                    raise ValueError(f"Unknown mouse button: {button_str}")
-                self.mouse.click(button)
+        self.executor.submit([action])
+
+    def send_actions(self, actions):
+        """
+        Send a batch of actions (e.g., the list returned by agent.act) without blocking the agent thread.
+        Focus is checked once per batch; actions are dispatched by the executor thread, which also runs
+        timed releases ('hold') and coalesces mouse moves (see action_executor.py for the action format).
+        Returns True if the batch was queued, False if dropped because the game is not focused.
+        """
+        self.check_focus()
+        if self.paused:
+            print("[WARN] Actions not sent: Eastshade not focused.")
+            return False
+        self.executor.submit(actions)
+        return True
+
+    def close(self):
+        """Stop the action executor, releasing any held keys/buttons."""
+        self.executor.stop()
 
     def get_observation(self):
         """Retrieve the latest synchronized observation from the orchestrator."""
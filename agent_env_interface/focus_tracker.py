@@ -0,0 +1,207 @@
+"""
+focus_tracker.py
+
+Cached, event-driven window focus tracking for AgentEnvInterface.
+- One persistent X connection (python-xlib) subscribes to PropertyNotify on the root window's _NET_ACTIVE_WINDOW,
+  so focus changes are pushed to a background thread instead of polled with xprop/wmctrl subprocesses.
+- The focused window ID (and its title, looked up once per change) is cached; is_focused() answers from memory.
+- Backends are pluggable: XlibFocusBackend for a live X server, FakeFocusBackend for headless tests and simulation.
+"""
+
+import select
+import threading
+import time
+
+
+def normalize_window_id(window_id):
+    """Window IDs may be ints or hex strings ('0x3e00004', as printed by xprop/wmctrl); returns an int."""
+    if window_id is None:
+        return None
+    if isinstance(window_id, str):
+        return int(window_id, 16)
+    return int(window_id)
+
+
+class XlibFocusBackend:
+    def __init__(self, display=None):
+        """
+        display: X display name (defaults to $DISPLAY, or ':0' if unset)
+        """
+        import os
+        try:
+            from Xlib import X, display as xdisplay
+        except ImportError:
+            raise ImportError("python-xlib is required for XlibFocusBackend: pip install python-xlib")
+        self._X = X
+        self.display = xdisplay.Display(display or os.environ.get('DISPLAY', ':0'))
+        self.root = self.display.screen().root
+        self._net_active_window = self.display.intern_atom('_NET_ACTIVE_WINDOW')
+        self._net_wm_name = self.display.intern_atom('_NET_WM_NAME')
+        self._utf8_string = self.display.intern_atom('UTF8_STRING')
+        self._watched = None  # Active window whose title changes we also listen to
+        self.root.change_attributes(event_mask=X.PropertyChangeMask)
+        self.display.flush()
+
+    def active_window(self):
+        """Returns (window_id, title) of the active window, or (None, None)."""
+        prop = self.root.get_full_property(self._net_active_window, self._X.AnyPropertyType)
+        window_id = prop.value[0] if prop is not None and len(prop.value) else None
+        if not window_id:
+            return None, None
+        window = self.display.create_resource_object('window', window_id)
+        title = None
+        try:
+            name = window.get_full_property(self._net_wm_name, self._utf8_string)
+            title = name.value.decode('utf-8', 'replace') if name is not None else window.get_wm_name()
+            if self._watched != window_id:
+                window.change_attributes(event_mask=self._X.PropertyChangeMask)
+                self._watched = window_id
+            self.display.flush()
+        except Exception:
+            pass  # The window can disappear between the property read and the lookup
+        return window_id, title
+
+    def wait_for_change(self, timeout):
+        """Block until the active window (or its title) may have changed, or timeout seconds pass. Returns True on change."""
+        deadline = time.monotonic() + timeout
+        while True:
+            while self.display.pending_events():
+                event = self.display.next_event()
+                if event.type == self._X.PropertyNotify and event.atom in (
+                        self._net_active_window, self._net_wm_name, self._X.XA_WM_NAME):
+                    return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self.display.fileno()], [], [], remaining)
+            if not readable:
+                return False
+
+    def close(self):
+        self.display.close()
+
+
+class FakeFocusBackend:
+    """In-memory backend for headless tests and simulation: set_active() plays the window manager."""
+    def __init__(self, window_id=None, title=None):
+        self._cond = threading.Condition()
+        self._active = (normalize_window_id(window_id), title)
+        self._version = 0
+        self._seen = 0
+        self.queries = 0
+
+    def set_active(self, window_id, title=None):
+        with self._cond:
+            self._active = (normalize_window_id(window_id), title)
+            self._version += 1
+            self._cond.notify_all()
+
+    def active_window(self):
+        with self._cond:
+            self.queries += 1
+            self._seen = self._version
+            return self._active
+
+    def wait_for_change(self, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: self._version != self._seen, timeout)
+
+    def close(self):
+        with self._cond:
+            self._version += 1  # Wake a waiting tracker thread
+            self._cond.notify_all()
+
+
+class FocusTracker:
+    def __init__(self, backend, target_id=None, target_name=None, poll_interval=1.0):
+        """
+        backend: XlibFocusBackend, FakeFocusBackend, or any object with active_window(), wait_for_change(timeout), close()
+        target_id: window ID of the game window (int or hex string such as '0x3e00004')
+        target_name: substring of the game window title (e.g., 'Eastshade'); used if target_id is None
+        poll_interval: longest wait between refreshes if no change event arrives (safety net for missed events)
+        """
+        self.backend = backend
+        self.target_id = normalize_window_id(target_id)
+        self.target_name = target_name
+        self.poll_interval = poll_interval
+        self.active_id = None
+        self.active_title = None
+        self._focused = False
+        self.changes = 0
+        self.last_change_time = None
+        self._running = False
+        self._thread = None
+        self._started = False
+        self._stopped = False
+
+    def start(self):
+        """Read the current focus and start listening for changes on a background thread."""
+        if self._stopped:
+            raise RuntimeError("FocusTracker was stopped and its backend closed; create a new tracker to restart")
+        if self._running:
+            return
+        self.refresh()
+        self._running = True
+        self._started = True
+        self._thread = threading.Thread(target=self._run, name="FocusTracker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the tracker and close its backend (terminal: a stopped tracker cannot be started again)."""
+        self._stopped = True
+        self._running = False
+        self.backend.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _matches(self, window_id, title):
+        if window_id is None:
+            return False
+        if self.target_id is not None:
+            return window_id == self.target_id
+        if self.target_name is not None:
+            return title is not None and self.target_name in title
+        return False
+
+    def refresh(self):
+        """Query the backend once and update the cached state. Returns is_focused()."""
+        window_id, title = self.backend.active_window()
+        if (window_id, title) != (self.active_id, self.active_title):
+            self.active_id, self.active_title = window_id, title
+            self.changes += 1
+            self.last_change_time = time.time()
+        self._focused = self._matches(window_id, title)
+        return self._focused
+
+    def _run(self):
+        while self._running:
+            try:
+                self.backend.wait_for_change(self.poll_interval)
+                if self._running:
+                    self.refresh()
+            except Exception as e:
+                print(f"[WARN] FocusTracker: {e}")
+                time.sleep(self.poll_interval)
+
+    def is_focused(self):
+        """Cached focus state; starts the tracker on first use."""
+        if not self._started:
+            self.start()
+        return self._focused
+
+    def stats(self):
+        return {
+            'active_id': hex(self.active_id) if self.active_id is not None else None,
+            'active_title': self.active_title,
+            'focused': self._focused,
+            'changes': self.changes,
+            'last_change_time': self.last_change_time,
+        }
@@ -15,13 +15,25 @@ import time
 from scipy.io.wavfile import write
 from datetime import datetime
 
+try:
+    from audio.audio_ring import AudioRingBuffer
+except ImportError:  # Running as a script from inside audio/
+    from audio_ring import AudioRingBuffer
+try:
+    from tracing.tracer import tracer, DEBUG
+except ImportError:  # Running as a script from inside audio/
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from tracing.tracer import tracer, DEBUG
+
 class AudioInputCapture:
-    def __init__(self, output_dir, samplerate=44100, channels=2, segment_duration=0.02):
+    def __init__(self, output_dir, samplerate=44100, channels=2, segment_duration=0.02, buffer_seconds=10.0):
         """
         output_dir: directory to save audio segments
         samplerate: audio sample rate (Hz)
         channels: number of audio channels (2 for stereo)
         segment_duration: duration of each audio segment (seconds)
+        buffer_seconds: audio history retained by the continuous stream's ring buffer
         """
         self.output_dir = output_dir
         self.samplerate = samplerate
@@ -29,14 +41,75 @@ class AudioInputCapture:
         self.segment_duration = segment_duration
         os.makedirs(self.output_dir, exist_ok=True)
         self.paused = False
+        self.ring = AudioRingBuffer(int(buffer_seconds * samplerate), channels=channels, samplerate=samplerate)
+        self._stream = None
+        self._stream_failed = False  # Opening the continuous stream failed: get_chunk records instead
+        self.overflows = 0
+
+    @property
+    def streaming(self):
+        return self._stream is not None
+
+    def start_stream(self):
+        """
+        Start continuous capture: a callback-driven sd.InputStream writes every block into the ring buffer,
+        so reads (get_chunk, get_latest, get_range) return instantly and without gaps between them.
+        """
+        if self._stream is not None:
+            return
+        self._stream = sd.InputStream(
+            samplerate=self.samplerate, channels=self.channels, dtype='int16', callback=self._on_audio
+        )
+        self._stream.start()
+
+    def stop_stream(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _on_audio(self, indata, frames, time_info, status):
+        # PortAudio callback thread: copy the block into the ring, nothing else
+        if status and status.input_overflow:
+            self.overflows += 1
+        self.ring.write(indata, time.monotonic())
+
+    def get_latest(self, n_samples):
+        """
+        Newest n_samples from the continuous stream, instantly (zero-padded at the front if fewer
+        have been captured). Returns zeros if paused.
+        """
+        if self.paused:
+            return np.zeros((n_samples, self.channels), dtype='int16')
+        chunk = self.ring.get_latest(n_samples)
+        if len(chunk) < n_samples:
+            chunk = np.concatenate([np.zeros((n_samples - len(chunk), self.channels), dtype=chunk.dtype), chunk])
+        return chunk
+
+    def get_range(self, t0, t1):
+        """
+        Samples captured between time.monotonic() timestamps t0 and t1 from the continuous stream
+        (sample-accurate, clipped to what has been captured and retained).
+        """
+        return self.ring.get_range(t0, t1)[0]
 
     def get_chunk(self, num_samples):
         """
-        Capture and return a chunk of audio samples of length num_samples.
+        Return the newest num_samples of audio from the continuous stream, instantly.
+        The stream is started on first use (the first chunks are zero-padded at the front until enough audio
+        has been captured); only if it cannot be opened does this record (and block for) num_samples.
         Returns zeros if paused.
         """
         if self.paused:
             return np.zeros((num_samples, self.channels), dtype='int16')
+        if self._stream is None and not self._stream_failed:
+            try:
+                self.start_stream()
+            except Exception as e:
+                print(f"[WARN] AudioInputCapture: could not open the continuous stream ({e}); recording per chunk.")
+                self._stream_failed = True
+        if self._stream is not None:
+            return self.get_latest(num_samples)
         audio = sd.rec(num_samples, samplerate=self.samplerate, channels=self.channels, dtype='int16')
         sd.wait()
         return audio
@@ -53,7 +126,30 @@ class AudioInputCapture:
     def resume(self):
         self.paused = False
 
-    def stream_audio(self, callback, segment_duration=None, parallel=False, max_workers=4):
+    def _wait_for_samples(self, end, poll, timeout):
+        """
+        Wait until the continuous stream has written up to sample index end.
+        Returns 'ready', 'paused' (paused while waiting), 'stopped' (stream closed) or 'timeout'
+        (no samples arrived for timeout seconds, e.g., the device stalled).
+        """
+        deadline = time.monotonic() + timeout
+        written = self.ring.total_written
+        while written < end:
+            if self.paused:
+                return 'paused'
+            if self._stream is None:
+                return 'stopped'
+            now = time.monotonic()
+            if now >= deadline:
+                return 'timeout'
+            time.sleep(min(poll, deadline - now))
+            if self.ring.total_written != written:
+                written = self.ring.total_written
+                deadline = time.monotonic() + timeout  # Still flowing: only a stall times out
+        return 'ready'
+
+    def stream_audio(self, callback, segment_duration=None, parallel=False, max_workers=4, deliver=None,
+                     stall_timeout=None):
         """
         Continuously stream audio segments and process them with a callback.
         Args:
@@ -61,7 +157,12 @@ class AudioInputCapture:
             segment_duration: duration of each audio segment (seconds), defaults to self.segment_duration
             parallel: if True, use ThreadPoolExecutor for parallel processing
             max_workers: number of parallel workers if parallel=True
+            deliver: optional function called with (callback result, timestamp) strictly in segment order, even
+                when parallel callbacks finish out of order (e.g., to hand observations to an agent)
+            stall_timeout: with the continuous stream, stop streaming if no samples arrive for this many seconds
+                (default: max(1 s, 4 segments)); streaming also stops when stop_stream() is called
         """
+        import collections
         import concurrent.futures
         if segment_duration is None:
             segment_duration = self.segment_duration
@@ -69,33 +170,73 @@ class AudioInputCapture:
         executor = None
         if parallel:
             executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        segment_samples = int(segment_duration * self.samplerate)
+        if stall_timeout is None:
+            stall_timeout = max(1.0, 4 * segment_duration)
+        in_flight = collections.deque()  # (future, timestamp) in segment order
+
+        def deliver_ready(block=False):
+            # Deliver completed results from the head only, so delivery order is segment order
+            while in_flight and (block or in_flight[0][0].done()):
+                future, ts = in_flight.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Audio perception callback failed: {e}")
+                    continue
+                if deliver is not None:
+                    deliver(result, ts)
+        # With the continuous stream, read consecutive segments by sample index: no gaps between segments
+        cursor = self.ring.total_written if self._stream is not None else None
         try:
             while True:
                 if self.paused:
                     time.sleep(0.1)
+                    if cursor is not None:
+                        cursor = self.ring.total_written  # Do not deliver audio captured while paused
                     continue
                 t_capture_start = time.time()
-                print(f"[AudioInputCapture] Recording {segment_duration}s segment...")
-                audio = sd.rec(int(segment_duration * self.samplerate), samplerate=self.samplerate, channels=self.channels, dtype='int16')
-                sd.wait()
+                if cursor is not None:
+                    status = self._wait_for_samples(cursor + segment_samples, segment_duration / 4, stall_timeout)
+                    if status == 'paused':
+                        continue
+                    if status == 'stopped':
+                        print("[AudioInputCapture] Audio stream stopped; ending stream_audio.")
+                        break
+                    if status == 'timeout':
+                        print(f"[WARN] AudioInputCapture: no audio for {stall_timeout:g}s; ending stream_audio.")
+                        break
+                    audio, first = self.ring.read(cursor, segment_samples)
+                    if first != cursor:
+                        print(f"[WARN] Audio consumer fell behind; skipped {first - cursor} samples.")
+                    cursor = first + len(audio)
+                else:
+                    audio = sd.rec(segment_samples, samplerate=self.samplerate, channels=self.channels, dtype='int16')
+                    sd.wait()
                 timestamp = datetime.now().timestamp()
-                t_capture_end = time.time()
-                capture_lag = t_capture_end - t_capture_start
-                print(f"[DEBUG] Audio segment captured in {capture_lag:.4f}s at timestamp {timestamp}")
+                if tracer.enabled(DEBUG):
+                    tracer.debug('audio.capture_segment', seconds=time.time() - t_capture_start,
+                                 timestamp=timestamp, samples=len(audio))
                 def process_and_log(audio, timestamp):
-                    t_proc_start = time.time()
-                    callback(audio, timestamp)
-                    t_proc_end = time.time()
-                    proc_lag = t_proc_end - t_proc_start
-                    print(f"[DEBUG] Perception processing time: {proc_lag:.4f}s (segment timestamp: {timestamp})")
+                    with tracer.span('audio.segment_callback', timestamp=timestamp):
+                        return callback(audio, timestamp)
                 if parallel:
-                    executor.submit(process_and_log, audio, timestamp)
+                    # Bound the work in flight so a slow callback applies back-pressure instead of queueing forever
+                    # (wait() does not raise: a failed callback is logged by deliver_ready and capture continues)
+                    while len(in_flight) >= 2 * max_workers:
+                        concurrent.futures.wait([in_flight[0][0]])
+                        deliver_ready()
+                    in_flight.append((executor.submit(process_and_log, audio, timestamp), timestamp))
+                    deliver_ready()
                 else:
-                    process_and_log(audio, timestamp)
+                    result = process_and_log(audio, timestamp)
+                    if deliver is not None:
+                        deliver(result, timestamp)
         except KeyboardInterrupt:
             print("[AudioInputCapture] Audio streaming stopped by user.")
         finally:
             if executor:
+                deliver_ready(block=True)
                 executor.shutdown(wait=True)
 
 if __name__ == "__main__":
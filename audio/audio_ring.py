@@ -0,0 +1,119 @@
+"""
+audio_ring.py
+
+Lock-free single-producer ring buffer for continuously captured audio.
+- The audio callback (producer) writes blocks; any number of readers copy out samples without locks.
+- A running sample clock (total samples written) plus a monotonic-time anchor give sample-accurate,
+  gap-free reads by sample index or by time.
+- Seqlock: the producer bumps a sequence counter before (odd: write in progress) and after (even) every write.
+  Readers retry a copy that overlapped a write; if writes keep overlapping, they trim every sample a write in
+  flight may have touched instead of returning torn data.
+"""
+
+import time
+import numpy as np
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity, channels=2, samplerate=44100, dtype=np.int16):
+        """
+        capacity: number of samples (per channel) retained
+        channels: number of audio channels
+        samplerate: sample rate (Hz), used to map times to sample indices
+        dtype: sample dtype
+        """
+        self.capacity = int(capacity)
+        self.channels = channels
+        self.samplerate = samplerate
+        self._buf = np.zeros((self.capacity, channels), dtype=dtype)
+        # Sample clock: total samples ever written. Published only after the samples are in the buffer.
+        self.total_written = 0
+        # Seqlock counter (odd while a write is in progress) and the end index of the latest write started
+        self._seq = 0
+        self._writing_end = 0
+        # (sample index, time.monotonic()) at the end of the last written block
+        self._anchor = None
+
+    def write(self, block, timestamp=None):
+        """
+        Append a block of samples (n, channels). Called from the producer (audio callback) only.
+        Args:
+            block: numpy array (n, channels)
+            timestamp: time.monotonic() at which the last sample of block was captured (defaults to now)
+        """
+        n = len(block)
+        if n == 0:
+            return
+        end = self.total_written + n
+        if n > self.capacity:
+            block = block[-self.capacity:]
+        start = (end - len(block)) % self.capacity
+        first = min(len(block), self.capacity - start)
+        self._seq += 1  # Odd: readers copying now may see a mix of old and new samples
+        self._writing_end = end
+        self._buf[start:start + first] = block[:first]
+        self._buf[:len(block) - first] = block[first:]
+        # Single assignments: readers see either the old or the new state, never a partial one
+        self.total_written = end
+        self._anchor = (end, time.monotonic() if timestamp is None else timestamp)
+        self._seq += 1
+
+    @property
+    def oldest_sample(self):
+        """Index of the oldest sample still retained."""
+        return max(0, self.total_written - self.capacity)
+
+    def read(self, start, n, retries=4):
+        """
+        Copy samples [start, start + n) by sample index.
+        Samples not yet written are not returned, and samples already overwritten are trimmed from the front.
+        retries: copies retried when a write overlaps them, before falling back to trimming
+        Returns:
+            (chunk, first_index): numpy array (m, channels) with m <= n, and the index of its first sample
+        """
+        for _ in range(retries):
+            seq = self._seq
+            if seq & 1:
+                time.sleep(0)  # Let the producer finish its write
+                continue
+            chunk, first = self._copy(start, n)
+            if self._seq == seq:
+                return chunk, first
+        chunk, first = self._copy(start, n)
+        # Writes kept overlapping: drop the samples any write started before now may have overwritten
+        overwritten = self._writing_end - self.capacity - first
+        if overwritten > 0:
+            chunk = chunk[overwritten:]
+            first += overwritten
+        return chunk, first
+
+    def _copy(self, start, n):
+        end = min(start + n, self.total_written)
+        start = max(start, self.oldest_sample)
+        if end <= start:
+            return np.zeros((0, self.channels), dtype=self._buf.dtype), start
+        idx = np.arange(start, end) % self.capacity
+        return self._buf[idx], start
+
+    def get_latest(self, n_samples):
+        """Returns the newest n_samples (fewer if not yet captured) as a numpy array (m, channels)."""
+        chunk, _ = self.read(self.total_written - n_samples, n_samples)
+        return chunk
+
+    def sample_index(self, t):
+        """Maps a time.monotonic() timestamp to a sample index using the latest write anchor."""
+        anchor = self._anchor
+        if anchor is None:
+            return 0
+        anchor_index, anchor_time = anchor
+        return anchor_index - int(round((anchor_time - t) * self.samplerate))
+
+    def get_range(self, t0, t1):
+        """
+        Returns the samples captured between monotonic times t0 and t1 (sample-accurate, no gaps).
+        Returns:
+            (chunk, first_index): as read(); chunk is clipped to what has been captured and retained
+        """
+        start = self.sample_index(t0)
+        end = self.sample_index(t1)
+        return self.read(start, max(0, end - start))
@@ -4,7 +4,8 @@ import numpy as np
 def decode_audio_chunk_bytes(audio_chunk_bytes, shape=None, dtype=np.int16):
     """
     Decodes audio_chunk bytes to a numpy array.
-    If shape is provided, assumes raw array; otherwise, returns None.
+    Bytes produced by encoding.audio_codecs (raw, delta, flac) are detected and decoded by codec.
+    Otherwise, if shape is provided, assumes raw array; if not, returns None.
     Args:
         audio_chunk_bytes: bytes or memoryview containing audio data.
         shape: tuple, if known (e.g., (n_samples, 2)) for raw arrays.
@@ -12,14 +13,23 @@ def decode_audio_chunk_bytes(audio_chunk_bytes, shape=None, dtype=np.int16):
     Returns:
         chunk: numpy array or None if decoding fails.
     """
-    if isinstance(audio_chunk_bytes, memoryview):
-        print(f"[DEBUG] Converting memoryview to bytes (length: {len(audio_chunk_bytes)})")
-        audio_chunk_bytes = audio_chunk_bytes.tobytes()
+    try:
+        from encoding.audio_codecs import decode_audio, is_encoded_audio
+    except ImportError:  # encoding package not on sys.path (e.g., run as a script from inside this folder)
+        is_encoded_audio = None
+    if is_encoded_audio is not None and audio_chunk_bytes is not None and is_encoded_audio(audio_chunk_bytes):
+        try:
+            return decode_audio(audio_chunk_bytes)
+        except Exception as e:
+            print(f"[ERROR] Could not decode encoded audio_chunk: {e}")
+            return None
+    # np.frombuffer reads bytes and memoryviews (e.g., psycopg2 bytea) directly: no .tobytes() copy
     if shape is not None:
         try:
-            print(f"[DEBUG] Attempting to reshape buffer to shape {shape} and dtype {dtype} (buffer length: {len(audio_chunk_bytes)})")
             chunk = np.frombuffer(audio_chunk_bytes, dtype=dtype).reshape(shape)
-            print(f"[DEBUG] Successfully reshaped raw audio_chunk: {chunk.shape}, dtype: {chunk.dtype}")
+            if tracer.enabled(DEBUG):
+                tracer.debug('audio.decode_raw', 'reshaped {length} bytes to {shape} {dtype}',
+                             length=len(audio_chunk_bytes), shape=chunk.shape, dtype=chunk.dtype)
             return chunk
         except Exception as e:
             print(f"[ERROR] Could not reshape raw audio_chunk: {e}")
@@ -30,8 +40,60 @@ def decode_audio_chunk_bytes(audio_chunk_bytes, shape=None, dtype=np.int16):
 
 # AudioPerception class to wrap feature extraction
 class AudioPerception:
-    def __init__(self, sample_rate=44100):
+    def __init__(self, sample_rate=44100, energy_bands=((20, 250), (250, 2000), (2000, 8000)),
+                 parallel=False, max_workers=4, feature_deadline=None, feature_budget=None,
+                 subscriptions=None, feature_rates=None):
+        """
+        sample_rate: sampling rate in Hz
+        energy_bands: (low_freq, high_freq) bands for the 'band_energies' feature (low/mid/high by default)
+        parallel: run independent feature extractors concurrently on a thread pool (NumPy/SciPy release the GIL)
+        max_workers: thread pool size if parallel
+        feature_deadline: seconds after process_chunk starts after which a feature still running is dropped
+            for that chunk ({'value': None, 'lag': None, 'dropped': True}) instead of delaying the observation
+        feature_budget: per-chunk latency budget in seconds; features that do not fit are deferred
+            (reported with their last value and 'stale': True)
+        subscriptions: feature names to compute (None: all); e.g., the features an agent actually uses
+        feature_rates: optional {feature name: rate or (rate, trigger)} overrides (N = every N chunks, or
+            'on_change' with trigger features; see FeatureRegistry.set_rate)
+        """
         self.sample_rate = sample_rate
+        self.energy_bands = [tuple(band) for band in energy_bands]
+        # One STFT per chunk, shared by the spectral features
+        self.stft = stft_engine(sample_rate)
+        self._executor = None
+        if parallel:
+            import concurrent.futures
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AudioFeature")
+        self.registry = self._build_registry(FeatureRegistry())
+        self.registry.set_rates(feature_rates)
+        self.scheduler = FeatureScheduler(self.registry, budget=feature_budget, subscriptions=subscriptions,
+                                          executor=self._executor, deadline=feature_deadline)
+
+    def _build_registry(self, registry):
+        sr = self.sample_rate
+
+        def onsets(spectrogram):
+            flux = spectrogram.flux()
+            return {'flux': flux, 'onset_times': pick_onsets(flux, spectrogram.times)}
+
+        registry.register('bandpass_300_3400Hz', lambda chunk: bandpass_filter(chunk, 300, 3400, sr), inputs=('chunk',), cost='medium')
+        registry.register('envelope', envelope_detection, inputs=('chunk',), cost='cheap')
+        registry.register('pitch', lambda chunk: pitch_detection(chunk, sr), inputs=('chunk',), cost='medium')
+        registry.register('pitch_track', lambda chunk: pitch_track(chunk, sr), inputs=('chunk',), cost='medium')
+        # Spectral features: frame-rate arrays (n_frames, ...) from one shared STFT of the chunk
+        registry.register('stft', self.stft.compute, inputs=('chunk',), cost='medium', output=False)
+        registry.register('onset', onsets, inputs=('stft',), cost='cheap')
+        registry.register('spectral_centroid', lambda spectrogram: spectrogram.centroid(), inputs=('stft',), cost='cheap')
+        registry.register('band_energies', lambda spectrogram: spectrogram.band_energies(self.energy_bands), inputs=('stft',), cost='cheap')
+        registry.register('spatial_localization', lambda spectrogram: spectrogram.interaural(), inputs=('stft',), cost='cheap')
+        registry.register('spectral_frame_times', lambda spectrogram: spectrogram.times, inputs=('stft',), cost='cheap')
+        return registry
+
+    def close(self):
+        """Shut down the feature thread pool (if parallel)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def process_chunk(self, chunk, chunk_timestamp=None):
         """
@@ -40,28 +102,115 @@ class AudioPerception:
             chunk: numpy array (n_samples, 2)
             chunk_timestamp: float or datetime, time when chunk was captured (for lag calculation)
         Returns:
-            observation: dict with high-level features and per-feature lag (in seconds)
+            observation: dict with high-level features and per-feature lag (in seconds); a feature that raised
+            has value "Error: ...", a feature that missed feature_deadline has 'dropped': True, and a feature
+            not recomputed for this chunk (rate or budget) has its last value with 'stale': True
         """
         import time
         if chunk_timestamp is None:
             chunk_timestamp = time.time()
+        capture_time = chunk_timestamp if isinstance(chunk_timestamp, (int, float)) else chunk_timestamp.timestamp()
+        observation = self.scheduler.run({'chunk': chunk}, capture_time=capture_time)
+        observation['chunk_timestamp'] = chunk_timestamp
+        return observation
+
+class StreamingAudioPerception:
+    """
+    Stateful audio perception for continuous streams of short chunks (e.g., 20 ms from stream_audio).
+    - Bandpass filters use cached SOS coefficients and carry their zi state across chunks, so consecutive
+      chunks filter exactly like one long signal (no edge transient at every chunk boundary).
+    - Both channels are filtered in one sosfilt call along axis 0.
+    - Spectral features (spectral flux onsets, centroid, interaural localization) use the shared STFT over a
+      rolling buffer: samples that do not fill a frame yet are carried into the next chunk, so 20 ms chunks
+      still produce full-length STFT frames and flux compares against the previous chunk's last frame.
+    - Each feature is a small per-chunk summary (per-channel RMS/peak/onset strength) instead of a
+      full-length array.
+    """
+    def __init__(self, sample_rate=44100, bands=((300, 3400),), channels=2):
+        """
+        sample_rate: sampling rate in Hz
+        bands: (low_freq, high_freq) bandpass bands summarized per chunk
+        channels: number of channels in each chunk
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bands = []
+        for band in bands:
+            if not 0 < band[0] < band[1] < 0.5 * sample_rate:
+                print(f"[WARN] Skipping bandpass band {band}: must lie within (0, {0.5 * sample_rate}) Hz")
+                continue
+            self.bands.append(tuple(band))
+        self._sos = {band: butter_bandpass_sos(band[0], band[1], sample_rate) for band in self.bands}
+        self.stft = stft_engine(sample_rate)
+        self.reset()
+
+    def reset(self):
+        """Forget filter/STFT state, e.g., after a gap in the stream or between replay shards."""
+        self._zi = {band: None for band in self.bands}
+        self._stft_tail = np.zeros((0, self.channels), dtype=np.float32)  # Samples not yet covered by a frame
+        self._last_magnitude = None  # Last STFT frame's magnitude, so flux spans chunk boundaries
+
+    def _spectrogram(self, chunk):
+        # STFT over the carried-over tail plus this chunk; keep the samples the next frame still needs.
+        # The buffer holds float32 with int16 scaled to [-1, 1), as STFTEngine.compute does for int16 input.
+        signal = chunk.astype(np.float32) / 32768.0 if chunk.dtype == np.int16 else chunk.astype(np.float32)
+        buffered = np.concatenate([self._stft_tail, signal])
+        spectrogram = self.stft.compute(buffered)
+        self._stft_tail = buffered[len(spectrogram) * self.stft.hop:]
+        return spectrogram
+
+    def _filter(self, band, signal):
+        sos = self._sos[band]
+        zi = self._zi[band]
+        if zi is None:
+            # Start from the steady state for the first sample instead of zero (no startup transient)
+            zi = sosfilt_zi(sos)[:, :, None] * signal[0][None, None, :]
+        filtered, self._zi[band] = sosfilt(sos, signal, axis=0, zi=zi)
+        return filtered
+
+    def process_chunk(self, chunk, chunk_timestamp=None):
+        """
+        Process the next chunk of the stream.
+        Args:
+            chunk: numpy array (n_samples, channels), consecutive with the previous chunk
+            chunk_timestamp: float or datetime, time when chunk was captured (for lag calculation)
+        Returns:
+            observation: dict of {'value', 'lag'} per feature; values are per-channel lists in input units
+            (e.g., int16 amplitude), with None for features that need more samples than the chunk has
+        """
+        import time
+        if chunk_timestamp is None:
+            chunk_timestamp = time.time()
+        capture_time = chunk_timestamp if isinstance(chunk_timestamp, (int, float)) else chunk_timestamp.timestamp()
         observation = {}
-        def timed_feature(fn, *args, **kwargs):
-            t0 = time.time()
-            try:
-                result = fn(*args, **kwargs)
-            except Exception as e:
-                result = f"Error: {e}"
-            t1 = time.time()
-            lag = t1 - chunk_timestamp if isinstance(chunk_timestamp, (int, float)) else (t1 - chunk_timestamp.timestamp())
-            return {'value': result, 'lag': lag}
-
-        observation['bandpass_300_3400Hz'] = timed_feature(bandpass_filter, chunk, 300, 3400, self.sample_rate)
-        observation['envelope'] = timed_feature(envelope_detection, chunk)
-        observation['onset'] = timed_feature(onset_detection, chunk, self.sample_rate)
-        observation['pitch'] = timed_feature(pitch_detection, chunk, self.sample_rate)
-        observation['spatial_localization'] = timed_feature(spatial_localization, chunk, self.sample_rate)
-        observation['spectral_centroid'] = timed_feature(spectral_centroid, chunk, self.sample_rate)
+
+        def record(name, value):
+            observation[name] = {'value': value, 'lag': time.time() - capture_time}
+
+        if chunk.ndim != 2 or chunk.shape[1] != self.channels or len(chunk) == 0:
+            raise ValueError(f"chunk must be 2D with shape (n_samples, {self.channels}) and at least one sample.")
+        signal = chunk.astype(np.float64)
+        for band in self.bands:
+            filtered = self._filter(band, signal)
+            record(f'bandpass_{band[0]}_{band[1]}Hz', np.sqrt(np.mean(filtered ** 2, axis=0)).tolist())
+        record('envelope', {'rms': np.sqrt(np.mean(signal ** 2, axis=0)).tolist(), 'peak': np.abs(signal).max(axis=0).tolist()})
+        try:
+            value = pitch_detection(chunk, self.sample_rate)
+        except Exception as e:
+            value = f"Error: {e}"
+        record('pitch', value)
+        # Spectral summaries over the STFT frames completed by this chunk (None if none completed yet)
+        spectrogram = self._spectrogram(chunk)
+        if len(spectrogram):
+            flux = spectrogram.flux(self._last_magnitude)
+            self._last_magnitude = spectrogram.magnitude[-1]
+            record('onset', flux.max(axis=0).tolist())
+            record('spectral_centroid', np.nanmean(spectrogram.centroid(), axis=0).tolist()
+                   if np.any(spectrogram.magnitude) else [None] * self.channels)
+            record('spatial_localization', spectrogram.interaural()['lateralization'] if self.channels == 2 else None)
+        else:
+            for name in ('onset', 'spectral_centroid', 'spatial_localization'):
+                record(name, None)
         observation['chunk_timestamp'] = chunk_timestamp
         return observation
 """
@@ -69,12 +218,44 @@ perception.py
 
 Audio perception pre-processing for embodied agent.
 Defines baseline functions for auditory pre-filters inspired by human hearing.
-These functions are currently stubs and can be implemented incrementally.
+Spectral features (onsets, centroid, band energies, localization) share one STFT per chunk (see audio/stft.py).
 """
 
 
+import functools
 import numpy as np
-from scipy.signal import butter, lfilter
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+try:
+    from audio.stft import STFTEngine, pick_onsets
+except ImportError:  # Running as a script from inside audio/
+    from stft import STFTEngine, pick_onsets
+try:
+    from features.registry import FeatureRegistry, FeatureScheduler
+    from tracing.tracer import tracer, DEBUG
+except ImportError:  # Running as a script from inside audio/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from features.registry import FeatureRegistry, FeatureScheduler
+    from tracing.tracer import tracer, DEBUG
+
+@functools.lru_cache(maxsize=8)
+def stft_engine(sample_rate, frame_size=1024, hop=512):
+    """Shared STFTEngine per (sample_rate, frame_size, hop), so windows and bin frequencies are built once."""
+    return STFTEngine(sample_rate, frame_size=frame_size, hop=hop)
+
+@functools.lru_cache(maxsize=64)
+def butter_bandpass_sos(low_freq, high_freq, sample_rate, order=4):
+    """
+    Butterworth bandpass design in second-order sections, cached per (band, sample_rate, order).
+    SOS form is numerically stable for narrow low-frequency bands where (b, a) coefficients lose precision.
+    """
+    # The Nyquist frequency is half the sample rate. It's the highest frequency that can be represented.
+    # Cutoffs are normalized to it (e.g., 300 Hz at 44100 Hz -> 300/22050 ≈ 0.0136)
+    nyquist = 0.5 * sample_rate
+    # Shared between callers through the cache: do not modify the returned array
+    return butter(N=order, Wn=[low_freq / nyquist, high_freq / nyquist], btype='band', output='sos')
 
 def bandpass_filter(audio_signal, low_freq, high_freq, sample_rate):
     """
@@ -91,145 +272,174 @@ def bandpass_filter(audio_signal, low_freq, high_freq, sample_rate):
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
-    # The Nyquist frequency is half the sample rate. It's the highest frequency that can be represented.
-    nyquist = 0.5 * sample_rate
-    # Normalize the cutoff frequencies to be a ratio of the Nyquist frequency (required by scipy)
-    # For example, if low_freq=300Hz, sample_rate=44100Hz, then low=300/22050 ≈ 0.0136
-    low = low_freq / nyquist
-    high = high_freq / nyquist
-    # Design a 4th-order Butterworth bandpass filter
-    # 'b' and 'a' are the filter coefficients for the numerator and denominator of the filter's transfer function
-    b, a = butter(N=4, Wn=[low, high], btype='band')
-    # Apply the filter to each channel independently (left and right)
-    left = lfilter(b, a, audio_signal[:, 0])
-    right = lfilter(b, a, audio_signal[:, 1])
-    # Stack the filtered channels back together into a stereo signal
-    return np.stack([left, right], axis=1)
-
-def envelope_detection(audio_signal):
-    """
-    Detect amplitude envelope (loudness over time).
+    # 4th-order Butterworth bandpass (designed once per band/sample rate), both channels in one call along axis 0
+    sos = butter_bandpass_sos(low_freq, high_freq, sample_rate)
+    return sosfilt(sos, audio_signal, axis=0)
+
+def envelope_detection(audio_signal, frame_size=1024, hop=512):
+    """
+    Detect amplitude envelope (loudness over time) as frame-rate RMS.
     Args:
         audio_signal (np.ndarray): 2D numpy array of audio samples, shape (n_samples, 2) for stereo.
+        frame_size (int): Samples per envelope frame.
+        hop (int): Samples between frame starts.
     Returns:
-        np.ndarray: Envelope of the audio signal (same shape as input).
+        np.ndarray: RMS per frame and channel, shape (n_frames, 2) (one frame if the signal is shorter than frame_size).
     Raises:
         ValueError: If audio_signal is not stereo (2 channels).
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
-    left = np.abs(audio_signal[:, 0])
-    right = np.abs(audio_signal[:, 1])
-    return np.stack([left, right], axis=1)
+    signal = audio_signal.astype(np.float32)
+    if len(signal) < frame_size:
+        return np.sqrt(np.mean(signal ** 2, axis=0, keepdims=True))
+    frames = np.lib.stride_tricks.sliding_window_view(signal, frame_size, axis=0)[::hop]
+    return np.sqrt(np.mean(frames ** 2, axis=-1))
 
 def onset_detection(audio_signal, sample_rate):
     """
-    Detect sudden changes (onsets) in the audio signal.
+    Detect sudden changes (onsets) in the audio signal via spectral flux on the shared STFT.
     Args:
         audio_signal (np.ndarray): 2D numpy array of audio samples, shape (n_samples, 2) for stereo.
         sample_rate (int): Sampling rate in Hz.
     Returns:
-        np.ndarray: Onset strength (same shape as input).
+        np.ndarray: Onset strength (spectral flux) per STFT frame and channel, shape (n_frames, 2).
     Raises:
         ValueError: If audio_signal is not stereo (2 channels).
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
-    def simple_onset(sig):
-        return np.diff(np.abs(sig), prepend=0)
-    left = simple_onset(audio_signal[:, 0])
-    right = simple_onset(audio_signal[:, 1])
-    return np.stack([left, right], axis=1)
+    return stft_engine(sample_rate).compute(audio_signal).flux()
+
+PITCH_MIN_FREQ = 50
+PITCH_MAX_FREQ = 2000
+
+def _normalized_channels(audio_signal):
+    # float32, int16 scaled to [-1, 1), DC removed per channel (axis 0 is time)
+    if audio_signal.dtype == np.int16:
+        sig = audio_signal.astype(np.float32) / 32768.0
+    else:
+        sig = audio_signal.astype(np.float32)
+    return sig - sig.mean(axis=-2, keepdims=True)
+
+def _autocorrelation(frames, max_lag):
+    """
+    Autocorrelation for lags 0..max_lag of every channel at once via FFT (Wiener-Khinchin), O(n log n).
+    frames: array (..., n_samples, channels); returns (..., max_lag + 1, channels).
+    Zero-padding to n + max_lag keeps lags up to max_lag free of circular wrap-around.
+    """
+    from scipy.fft import irfft, next_fast_len, rfft
+    n = frames.shape[-2]
+    size = next_fast_len(n + max_lag + 1, real=True)
+    spectrum = rfft(frames, n=size, axis=-2)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return irfft(power, n=size, axis=-2)[..., :max_lag + 1, :]
+
+def _pick_pitch(corr, sample_rate, min_lag, max_lag):
+    """
+    Strongest autocorrelation peak in lags [min_lag, max_lag) for each channel.
+    corr: (..., max_lag + 1, channels). Returns pitches (..., channels) in Hz, NaN where the peak is below
+    10% of the zero-lag value (unvoiced/noise) or the pitch falls outside (PITCH_MIN_FREQ, PITCH_MAX_FREQ).
+    """
+    search = corr[..., min_lag:max_lag, :]
+    peak = np.argmax(search, axis=-2) + min_lag
+    peak_value = np.take_along_axis(corr, peak[..., None, :], axis=-2)[..., 0, :]
+    zero_lag = corr[..., 0, :]
+    voiced = (zero_lag > 0) & (peak_value >= 0.1 * zero_lag)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pitch = sample_rate / peak.astype(np.float64)
+    voiced &= (pitch > PITCH_MIN_FREQ) & (pitch < PITCH_MAX_FREQ)
+    return np.where(voiced, pitch, np.nan)
 
 def pitch_detection(audio_signal, sample_rate):
     """
-    Estimate the fundamental frequency (pitch).
+    Estimate the fundamental frequency (pitch) from the autocorrelation peak in the 50-2000 Hz lag window.
+    The autocorrelation of both channels is computed in one batched FFT (O(n log n)) and only lags in the
+    pitch window are searched.
     Args:
         audio_signal (np.ndarray): 2D numpy array of audio samples, shape (n_samples, 2) for stereo.
         sample_rate (int): Sampling rate in Hz.
     Returns:
-        list or np.ndarray: Estimated pitch for each channel (None if not implemented).
+        list: Estimated pitch in Hz for each channel (None if silent, unvoiced or the chunk is too short).
     Raises:
         ValueError: If audio_signal is not stereo (2 channels).
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
-    pitches = []
-    min_freq = 50
-    max_freq = 2000
-    min_lag = int(sample_rate / max_freq)
-    max_lag = int(sample_rate / min_freq)
-    for ch in range(2):
-        sig = audio_signal[:, ch]
-        # Normalize if int16
-        if sig.dtype == np.int16:
-            sig = sig.astype(np.float32) / 32768.0
-        else:
-            sig = sig.astype(np.float32)
-        print(f"[DEBUG] Channel {ch}: min={sig.min()}, max={sig.max()}, mean={sig.mean()}, std={sig.std()}")
-        sig = sig - np.mean(sig)  # Remove DC
-        if np.all(sig == 0):
-            print(f"[DEBUG] Channel {ch}: signal is all zeros after DC removal.")
-            pitches.append(None)
-            continue
-        if len(sig) < max_lag:
-            print(f"[DEBUG] Channel {ch}: signal too short for pitch detection (len={len(sig)}, need >{max_lag}).")
-            pitches.append(None)
-            continue
-        # Autocorrelation
-        corr = np.correlate(sig, sig, mode='full')
-        corr = corr[len(corr)//2:]
-        # Only search for peaks in valid lag range
-        search_corr = corr[min_lag:max_lag]
-        if len(search_corr) == 0:
-            print(f"[DEBUG] Channel {ch}: no valid lag range for pitch.")
-            pitches.append(None)
-            continue
-        peak = np.argmax(search_corr) + min_lag
-        peak_value = corr[peak]
-        zero_lag = corr[0]
-        print(f"[DEBUG] Channel {ch}: peak lag={peak}, value={peak_value}, zero_lag={zero_lag}")
-        # Require peak to be at least 10% of zero-lag value
-        if peak == 0 or zero_lag == 0 or peak_value < 0.1 * zero_lag:
-            print(f"[DEBUG] Channel {ch}: peak not significant (peak_value={peak_value}, zero_lag={zero_lag})")
-            pitches.append(None)
-            continue
-        pitch = sample_rate / peak
-        print(f"[DEBUG] Channel {ch}: estimated pitch={pitch} Hz")
-        if min_freq < pitch < max_freq:
-            pitches.append(pitch)
-        else:
-            pitches.append(None)
-    return pitches
+    min_lag = int(sample_rate / PITCH_MAX_FREQ)
+    max_lag = int(sample_rate / PITCH_MIN_FREQ)
+    if len(audio_signal) < max_lag:
+        return [None, None]
+    sig = _normalized_channels(audio_signal)
+    pitches = _pick_pitch(_autocorrelation(sig, max_lag), sample_rate, min_lag, max_lag)
+    return [None if np.isnan(p) else float(p) for p in pitches]
+
+def pitch_track(audio_signal, sample_rate, frame_duration=0.04, hop_duration=0.02):
+    """
+    Pitch track over overlapping sub-frames of the chunk (all frames and channels in one batched FFT).
+    Args:
+        audio_signal (np.ndarray): 2D numpy array of audio samples, shape (n_samples, 2) for stereo.
+        sample_rate (int): Sampling rate in Hz.
+        frame_duration (float): Analysis frame length in seconds (at least 1/50 s to cover the lag window).
+        hop_duration (float): Seconds between frame starts.
+    Returns:
+        (times, pitches): frame center times in seconds from the chunk start, shape (n_frames,), and
+        pitch in Hz per frame and channel, shape (n_frames, 2), NaN where unvoiced.
+    Raises:
+        ValueError: If audio_signal is not stereo (2 channels).
+    """
+    if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
+        raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
+    min_lag = int(sample_rate / PITCH_MAX_FREQ)
+    max_lag = int(sample_rate / PITCH_MIN_FREQ)
+    frame_len = max(int(frame_duration * sample_rate), max_lag)
+    hop = max(1, int(hop_duration * sample_rate))
+    if len(audio_signal) < frame_len:
+        return np.zeros(0), np.zeros((0, 2))
+    # (n_frames, 2, frame_len) strided view -> (n_frames, frame_len, 2)
+    frames = np.lib.stride_tricks.sliding_window_view(audio_signal, frame_len, axis=0)[::hop].swapaxes(1, 2)
+    frames = _normalized_channels(frames)
+    pitches = _pick_pitch(_autocorrelation(frames, max_lag), sample_rate, min_lag, max_lag)
+    times = (np.arange(len(frames)) * hop + frame_len / 2) / sample_rate
+    return times, pitches
 
 def spatial_localization(audio_signal, sample_rate):
     """
-    Estimate direction of arrival (left/right cues).
+    Estimate direction of arrival (left/right cues) from the interaural level difference.
     Args:
         audio_signal (np.ndarray): 2D numpy array of audio samples (n_samples, 2) for stereo.
         sample_rate (int): Sampling rate in Hz.
     Returns:
-        float: Placeholder for direction estimate (None if not implemented).
+        float: Lateralization in [-1, 1] (-1 = fully left, +1 = fully right, 0 = center or silent);
+        None if the chunk is shorter than one STFT frame.
     Raises:
         ValueError: If audio_signal is not stereo (2 channels).
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("spatial_localization requires stereo input (n_samples, 2)")
-    return None  # To be implemented
+    spectrogram = stft_engine(sample_rate).compute(audio_signal)
+    if len(spectrogram) == 0:
+        return None
+    return spectrogram.interaural()['lateralization']
 
 def spectral_centroid(audio_signal, sample_rate):
     """
-    Compute spectral centroid (brightness of sound).
+    Compute spectral centroid (brightness of sound) of the chunk's average magnitude spectrum.
     Args:
         audio_signal (np.ndarray): 2D numpy array of audio samples, shape (n_samples, 2) for stereo.
         sample_rate (int): Sampling rate in Hz.
     Returns:
-        list: Spectral centroid for each channel (None if not implemented).
+        list: Spectral centroid in Hz for each channel (None if silent or shorter than one STFT frame).
     Raises:
         ValueError: If audio_signal is not stereo (2 channels).
     """
     if audio_signal.ndim != 2 or audio_signal.shape[1] != 2:
         raise ValueError("audio_signal must be 2D with shape (n_samples, 2) for stereo.")
-    return [None, None]  # To be implemented per channel
+    spectrogram = stft_engine(sample_rate).compute(audio_signal)
+    if len(spectrogram) == 0:
+        return [None, None]
+    magnitude = spectrogram.magnitude.mean(axis=0)
+    total = magnitude.sum(axis=0)
+    return [float(spectrogram.freqs @ magnitude[:, ch] / total[ch]) if total[ch] > 0 else None for ch in range(2)]
 
 # Add more auditory pre-processing stubs as needed
\ No newline at end of file
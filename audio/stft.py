@@ -0,0 +1,157 @@
+"""
+stft.py
+
+Shared short-time Fourier transform stage for audio perception.
+- STFTEngine frames a chunk, applies a cached window and runs one batched rfft over all frames and channels
+  (scipy.fft reuses its cached transform plan for the fixed frame size).
+- Spectrogram holds the result and lazily derives magnitude/power once, shared by every spectral feature:
+  spectral centroid, spectral flux (onsets), band energies and interaural level/phase differences.
+- Features are compact frame-rate arrays (n_frames, ...) instead of per-sample arrays.
+"""
+
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import get_window
+
+
+class Spectrogram:
+    def __init__(self, spectrum, times, freqs, sample_rate):
+        """
+        spectrum: complex array (n_frames, n_bins, channels)
+        times: frame center times in seconds from the chunk start, shape (n_frames,)
+        freqs: bin frequencies in Hz, shape (n_bins,)
+        """
+        self.spectrum = spectrum
+        self.times = times
+        self.freqs = freqs
+        self.sample_rate = sample_rate
+        self._magnitude = None
+        self._power = None
+
+    def __len__(self):
+        return len(self.spectrum)
+
+    @property
+    def magnitude(self):
+        if self._magnitude is None:
+            self._magnitude = np.sqrt(self.power)
+        return self._magnitude
+
+    @property
+    def power(self):
+        if self._power is None:
+            self._power = self.spectrum.real ** 2 + self.spectrum.imag ** 2
+        return self._power
+
+    def centroid(self):
+        """Spectral centroid (brightness) in Hz per frame and channel, shape (n_frames, channels); NaN if silent."""
+        magnitude = self.magnitude
+        total = magnitude.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.einsum('fbc,b->fc', magnitude, self.freqs) / total
+
+    def flux(self, previous_magnitude=None):
+        """
+        Spectral flux onset strength per frame and channel, shape (n_frames, channels): the summed positive
+        magnitude change from the previous frame. previous_magnitude (n_bins, channels) is the last frame of
+        the previous chunk when streaming; without it the first frame's flux is 0.
+        """
+        magnitude = self.magnitude
+        if len(magnitude) == 0:
+            return np.zeros((0, magnitude.shape[-1]))
+        first = magnitude[:1] if previous_magnitude is None else previous_magnitude[None]
+        diff = np.diff(magnitude, axis=0, prepend=first)
+        return np.maximum(diff, 0).sum(axis=1)
+
+    def band_energies(self, bands):
+        """
+        Power summed within each (low_freq, high_freq) band, shape (n_frames, n_bands, channels).
+        """
+        power = self.power
+        energies = np.zeros((len(power), len(bands), power.shape[-1]))
+        for i, (low, high) in enumerate(bands):
+            lo, hi = np.searchsorted(self.freqs, [low, high])
+            energies[:, i] = power[:, lo:hi].sum(axis=1)
+        return energies
+
+    def interaural(self, max_ipd_freq=1500.0):
+        """
+        Left/right localization cues per frame (stereo only).
+        Returns dict:
+            'ild_db': interaural level difference, 10*log10(P_left / P_right), shape (n_frames,)
+            'ipd': power-weighted mean interaural phase difference (radians) below max_ipd_freq, where
+                   phase is unambiguous for head-sized delays, shape (n_frames,)
+            'lateralization': overall (P_right - P_left) / (P_right + P_left) in [-1, 1]
+                              (-1 = fully left, +1 = fully right, 0 = center or silent)
+        """
+        power = self.power
+        if power.shape[-1] != 2:
+            raise ValueError("interaural cues require stereo input")
+        left, right = power[..., 0].sum(axis=1), power[..., 1].sum(axis=1)
+        eps = np.finfo(np.float64).tiny
+        ild_db = 10 * np.log10((left + eps) / (right + eps))
+        low = self.freqs <= max_ipd_freq
+        cross = self.spectrum[:, low, 0] * np.conj(self.spectrum[:, low, 1])
+        # Angle of the summed cross-spectrum: a power-weighted circular mean of the per-bin phase differences
+        ipd = np.angle(cross.sum(axis=1))
+        total_left, total_right = left.sum(), right.sum()
+        total = total_left + total_right
+        lateralization = float((total_right - total_left) / total) if total > 0 else 0.0
+        return {'ild_db': ild_db, 'ipd': ipd, 'lateralization': lateralization}
+
+
+class STFTEngine:
+    def __init__(self, sample_rate=44100, frame_size=1024, hop=512, window='hann'):
+        """
+        sample_rate: sampling rate in Hz
+        frame_size: samples per STFT frame (1024 at 44.1 kHz is ~23 ms, ~43 Hz bins)
+        hop: samples between frame starts
+        window: scipy.signal.get_window window name
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = hop
+        # Computed once and reused for every chunk
+        self.window = get_window(window, frame_size, fftbins=True).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+
+    def n_frames(self, n_samples):
+        return 0 if n_samples < self.frame_size else 1 + (n_samples - self.frame_size) // self.hop
+
+    def compute(self, audio_signal):
+        """
+        STFT of a chunk (n_samples, channels): all frames and channels in one windowed, batched rfft.
+        Returns a Spectrogram; trailing samples that do not fill a frame are not analyzed (see n_frames).
+        """
+        if audio_signal.ndim != 2:
+            raise ValueError("audio_signal must be 2D with shape (n_samples, channels).")
+        n = self.n_frames(len(audio_signal))
+        channels = audio_signal.shape[1]
+        if n == 0:
+            return Spectrogram(np.zeros((0, len(self.freqs), channels), dtype=np.complex64),
+                               np.zeros(0), self.freqs, self.sample_rate)
+        if audio_signal.dtype == np.int16:
+            signal = audio_signal.astype(np.float32) / 32768.0
+        else:
+            signal = audio_signal.astype(np.float32, copy=False)
+        # (n_frames, channels, frame_size) strided view -> (n_frames, frame_size, channels)
+        frames = np.lib.stride_tricks.sliding_window_view(signal, self.frame_size, axis=0)[::self.hop][:n]
+        frames = frames.swapaxes(1, 2) * self.window[None, :, None]
+        spectrum = rfft(frames, axis=1)
+        times = (np.arange(n) * self.hop + self.frame_size / 2) / self.sample_rate
+        return Spectrogram(spectrum, times, self.freqs, self.sample_rate)
+
+
+def pick_onsets(flux, times, sensitivity=3.0, min_relative=0.1):
+    """
+    Onset times (seconds) where the channel-summed spectral flux is a local peak above both
+    median + sensitivity * median absolute deviation and min_relative * the chunk's peak flux
+    (the second bound ignores tiny fluctuations of steady sounds after silence, where the MAD is ~0).
+    """
+    strength = flux.sum(axis=1) if flux.ndim == 2 else flux
+    if len(strength) < 3:
+        return []
+    median = np.median(strength)
+    threshold = max(median + sensitivity * np.median(np.abs(strength - median)), min_relative * strength.max())
+    peaks = (strength[1:-1] > threshold) & (strength[1:-1] >= strength[:-2]) & (strength[1:-1] > strength[2:])
+    return times[1:-1][peaks].tolist()
@@ -7,7 +7,10 @@ Test script to stream live audio segments through the audio perception pipeline
 
 import time
 from audio_capture import AudioInputCapture
-from perception import AudioPerception
+from perception import StreamingAudioPerception
+
+# One stateful instance for the whole stream: filter state carries across the 20 ms chunks
+ap = StreamingAudioPerception(sample_rate=44100)
 
 def perception_callback(audio_chunk, timestamp):
 
@@ -19,7 +22,6 @@ def perception_callback(audio_chunk, timestamp):
         GPUtil = None
         gpus = []
 
-    ap = AudioPerception()
     obs = ap.process_chunk(audio_chunk, chunk_timestamp=timestamp)
     print("\n[RESULT] Audio perception output:")
     for k, v in obs.items():
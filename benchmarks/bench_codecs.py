@@ -0,0 +1,108 @@
+"""
+bench_codecs.py
+
+Benchmark: frame and audio codecs for recorded observations.
+Reports bytes per frame/chunk, encode ms and decode ms for every codec, plus EncodingStage throughput.
+- Frames: a procedural 1280x720 scene (gradient sky, moving object, textured ground), or images from --frames.
+- Audio: one-second stereo int16 chunks (tones + low noise).
+
+Usage:
+    python -m benchmarks.bench_codecs [--frames dir_with_images] [--count 30] [--width 1280 --height 720]
+"""
+
+import argparse
+import glob
+import os
+import time
+import cv2
+import numpy as np
+from encoding.frame_codecs import FRAME_CODECS, FrameDecoder, get_frame_codec
+from encoding.audio_codecs import AUDIO_CODECS, decode_audio, get_audio_codec
+from encoding.encoding_stage import EncodingStage
+
+def synthetic_frames(count, width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    base[:, :, 0] = np.linspace(255, 120, height, dtype=np.uint8)[:, None]  # Sky gradient
+    base[:, :, 1] = 180
+    base[height * 2 // 3:] = rng.integers(40, 90, (height - height * 2 // 3, width, 3), dtype=np.uint8)  # Ground
+    for i in range(count):
+        frame = base.copy()
+        x = (i * 12) % (width - 100)
+        cv2.rectangle(frame, (x, height // 3), (x + 100, height // 3 + 80), (40, 60, 200), -1)
+        yield frame
+
+def load_frames(pattern_dir, count):
+    paths = sorted(glob.glob(os.path.join(pattern_dir, '*')))[:count]
+    return [f for f in (cv2.imread(p) for p in paths) if f is not None]
+
+def synthetic_audio(count, samplerate=44100, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samplerate) / samplerate
+    for i in range(count):
+        tone = 0.3 * np.sin(2 * np.pi * (220 + 20 * i) * t)
+        noise = 0.01 * rng.standard_normal(samplerate)
+        left = (tone + noise) * 32767
+        right = (0.5 * tone + noise) * 32767
+        yield np.stack([left, right], axis=1).astype(np.int16)
+
+def bench_frames(frames):
+    print(f"[RESULT] Frame codecs ({frames[0].shape[1]}x{frames[0].shape[0]}, {len(frames)} frames, raw {frames[0].nbytes} bytes/frame)")
+    for name in FRAME_CODECS:
+        codec = get_frame_codec(name)
+        t0 = time.perf_counter()
+        encoded = [codec.encode(f) for f in frames]
+        encode_ms = (time.perf_counter() - t0) * 1000 / len(frames)
+        decoder = FrameDecoder()
+        t0 = time.perf_counter()
+        decoded = [decoder.decode(e) for e in encoded]
+        decode_ms = (time.perf_counter() - t0) * 1000 / len(frames)
+        lossless = all(np.array_equal(a, b) for a, b in zip(frames, decoded))
+        size = sum(len(e) for e in encoded) / len(frames)
+        print(f"  {name:6s} {size:12.0f} bytes/frame  encode {encode_ms:7.2f} ms  decode {decode_ms:7.2f} ms  {'lossless' if lossless else 'lossy'}")
+
+def bench_audio(chunks):
+    print(f"[RESULT] Audio codecs ({chunks[0].shape}, raw {chunks[0].nbytes} bytes/chunk)")
+    for name in AUDIO_CODECS:
+        try:
+            codec = get_audio_codec(name)
+        except ImportError as e:
+            print(f"  {name:6s} skipped ({e})")
+            continue
+        t0 = time.perf_counter()
+        encoded = [codec.encode(c) for c in chunks]
+        encode_ms = (time.perf_counter() - t0) * 1000 / len(chunks)
+        t0 = time.perf_counter()
+        decoded = [decode_audio(e) for e in encoded]
+        decode_ms = (time.perf_counter() - t0) * 1000 / len(chunks)
+        assert all(np.array_equal(a, b) for a, b in zip(chunks, decoded)), f"{name} is not lossless"
+        size = sum(len(e) for e in encoded) / len(chunks)
+        print(f"  {name:6s} {size:12.0f} bytes/chunk  encode {encode_ms:7.2f} ms  decode {decode_ms:7.2f} ms")
+
+def bench_stage(frames, chunks, codec='png', workers=4):
+    stage = EncodingStage(video_codec=codec, audio_codec='delta', max_workers=workers)
+    observations = [{'video_frame': f, 'audio_chunk': c} for f, c in zip(frames, chunks * (len(frames) // len(chunks) + 1))]
+    t0 = time.perf_counter()
+    futures = [stage.submit(o) for o in observations]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - t0
+    stage.close()
+    print(f"[RESULT] EncodingStage({codec}, {workers} workers): {len(observations) / elapsed:.1f} observations/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', help='directory of recorded frame images')
+    parser.add_argument('--count', type=int, default=30)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+    frames = load_frames(args.frames, args.count) if args.frames else list(synthetic_frames(args.count, args.width, args.height))
+    chunks = list(synthetic_audio(min(args.count, 5)))
+    bench_frames(frames)
+    bench_audio(chunks)
+    for workers in (1, 4):
+        bench_stage(frames, chunks, workers=workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+bench_parallel_replay.py
+
+Benchmark: sharded multi-process session replay (replay.parallel_replay) vs worker count.
+Records a synthetic session (moving object over a textured scene), replays it with 1, 2, 4, ... workers
+and reports frames/s and speedup over one worker.
+
+Usage:
+    python -m benchmarks.bench_parallel_replay [--session dir] [--frames 400] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from replay.session_writer import SessionWriter
+from replay.parallel_replay import ParallelReplay
+
+def record_synthetic_session(path, n_frames, width=640, height=360, fps=10.0, seed=0):
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    t0 = time.time()
+    with SessionWriter(path) as writer:
+        for i in range(n_frames):
+            frame = background.copy()
+            x = (i * 8) % (width - 60)
+            cv2.rectangle(frame, (x, height // 3), (x + 60, height // 3 + 60), (255, 255, 255), -1)
+            writer.write_frame(frame, t0 + i / fps)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--session', help='existing session directory (default: record a synthetic one)')
+    parser.add_argument('--frames', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = args.session
+        if path is None:
+            path = os.path.join(tmpdir, 'session')
+            record_synthetic_session(path, args.frames)
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            replay = ParallelReplay(path, workers=workers, read_text=False)
+            t0 = time.perf_counter()
+            count = sum(1 for _, _, modality, _ in replay.run() if modality == 'visual')
+            rate = count / (time.perf_counter() - t0)
+            baseline = baseline or rate
+            print(f"[RESULT] {workers:2d} workers ({len(replay.shards):3d} shards): {rate:8.1f} frames/s  speedup {rate / baseline:4.2f}x")
+
+if __name__ == "__main__":
+    main()
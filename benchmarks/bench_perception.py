@@ -0,0 +1,308 @@
+"""
+bench_perception.py
+
+Benchmark suite: every registered extractor in visual/perception.py and audio/perception.py, plus the full
+process_frame/process_chunk pipelines, over fixed fixtures.
+- Visual fixtures: the procedural scene from bench_codecs (always), images from --images and frames of a
+  recorded session from --session (resized to each benchmark resolution).
+- Audio fixtures: synthetic tones + noise (always), a recording from --wav and the audio of --session,
+  cut into chunks of each benchmark chunk size.
+- Each extractor is timed on its own, fed the outputs of the features it depends on (registry order).
+- Reports p50/p95/p99 latency, throughput (calls/s) and peak traced memory (tracemalloc, separate pass),
+  and saves everything as JSON.
+- With --baseline, results are compared against an earlier JSON using --thresholds (relative regression and
+  absolute limits); the process exits with status 1 if any threshold is exceeded.
+
+Usage:
+    python -m benchmarks.bench_perception [--sizes 320x180 640x360 1280x720] [--chunk-sizes 1024 4096 44100]
+        [--frames 20] [--repeat 3] [--images dir] [--session dir] [--wav file]
+        [--output perception_bench.json] [--baseline previous.json] [--thresholds benchmarks/perception_thresholds.json]
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from benchmarks.bench_codecs import synthetic_frames, synthetic_audio
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perception_thresholds.json')
+
+
+def summarize(latencies, total_seconds=None):
+    """Latency percentiles (ms) and throughput (calls/s) for a list of per-call durations in seconds."""
+    values = np.asarray(latencies, dtype=np.float64)
+    total = float(values.sum()) if total_seconds is None else total_seconds
+    return {
+        'n': int(len(values)),
+        'mean_ms': 1000.0 * float(values.mean()),
+        'p50_ms': 1000.0 * float(np.percentile(values, 50)),
+        'p95_ms': 1000.0 * float(np.percentile(values, 95)),
+        'p99_ms': 1000.0 * float(np.percentile(values, 99)),
+        'throughput_per_s': len(values) / total if total > 0 else None,
+    }
+
+
+def peak_memory_kb(fn, *args):
+    """Peak memory traced by tracemalloc while calling fn(*args) once (KB)."""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+# Fixtures
+
+def visual_fixtures(size, count, images=None, session=None):
+    """{fixture name: list of (H, W, 3) uint8 BGR frames at size (width, height)}"""
+    width, height = size
+    fixtures = {'synthetic': list(synthetic_frames(count, width, height))}
+    if images:
+        paths = sorted(glob.glob(os.path.join(images, '*')))
+        frames = [cv2.imread(p) for p in paths]
+        frames = [cv2.resize(f, size) for f in frames if f is not None][:count]
+        if frames:
+            fixtures['images'] = frames
+    if session:
+        from replay.session_reader import SessionReader
+        with SessionReader(session) as reader:
+            step = max(1, len(reader) // count)
+            fixtures['session'] = [cv2.resize(np.asarray(frame)[:, :, :3], size)
+                                   for _, _, frame in reader.iter_frames(0, count * step, step, prefetch=False)]
+    return fixtures
+
+
+def audio_fixtures(chunk_size, count, samplerate, wav=None, session=None):
+    """{fixture name: (list of (chunk_size, channels) int16 chunks, samplerate)}"""
+    signal = np.concatenate(list(synthetic_audio(max(1, -(-chunk_size * count // samplerate)), samplerate)))
+    fixtures = {'synthetic': (signal, samplerate)}
+    if wav:
+        import soundfile as sf
+        data, rate = sf.read(wav, dtype='int16', always_2d=True)
+        fixtures['wav'] = (data, rate)
+    if session:
+        from replay.session_reader import SessionReader
+        with SessionReader(session) as reader:
+            if len(reader.audio):
+                fixtures['session'] = (np.array(reader.audio), reader.samplerate)
+    return {name: ([data[i:i + chunk_size] for i in range(0, len(data) - chunk_size + 1, chunk_size)][:count], rate)
+            for name, (data, rate) in fixtures.items() if len(data) >= chunk_size}
+
+
+# Runs
+
+def bench_registry(registry, raw_inputs_seq, repeat, pipeline=None, warmup=2):
+    """
+    Time each registered extractor (fed its dependencies' outputs) and optionally the full pipeline.
+    Args:
+        registry: FeatureRegistry
+        raw_inputs_seq: list of raw input dicts (one per frame/chunk)
+        repeat: passes over raw_inputs_seq
+        pipeline: optional (name, fn(raw_inputs)) for the end-to-end call
+        warmup: untimed calls first (filter design caches, FFT plans, lazy imports)
+    Returns:
+        {extractor name: summary dict with peak_kb and errors}
+    """
+    order = registry.order()
+    latencies = {spec.name: [] for spec in order}
+    errors = {spec.name: 0 for spec in order}
+    last_args = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for raw in raw_inputs_seq[:warmup]:
+            values = dict(raw)
+            for spec in order:
+                try:
+                    values[spec.name] = spec.fn(*[values.get(name) for name in spec.inputs])
+                except Exception:
+                    values[spec.name] = None
+            if pipeline is not None:
+                pipeline[1](raw)
+        for _ in range(repeat):
+            for raw in raw_inputs_seq:
+                values = dict(raw)
+                for spec in order:
+                    args = [values.get(name) for name in spec.inputs]
+                    t0 = time.perf_counter()
+                    try:
+                        values[spec.name] = spec.fn(*args)
+                    except Exception:
+                        errors[spec.name] += 1
+                        values[spec.name] = None
+                        continue
+                    latencies[spec.name].append(time.perf_counter() - t0)
+                    last_args[spec.name] = args
+        results = {}
+        for spec in order:
+            if not latencies[spec.name]:
+                results[spec.name] = {'n': 0, 'errors': errors[spec.name]}
+                continue
+            results[spec.name] = summarize(latencies[spec.name])
+            results[spec.name]['peak_kb'] = peak_memory_kb(spec.fn, *last_args[spec.name])
+            results[spec.name]['errors'] = errors[spec.name]
+        if pipeline is not None:
+            name, fn = pipeline
+            durations = []
+            t_start = time.perf_counter()
+            for _ in range(repeat):
+                for raw in raw_inputs_seq:
+                    t0 = time.perf_counter()
+                    fn(raw)
+                    durations.append(time.perf_counter() - t0)
+            results[name] = summarize(durations, time.perf_counter() - t_start)
+            results[name]['peak_kb'] = peak_memory_kb(fn, raw_inputs_seq[-1])
+            results[name]['errors'] = 0
+    return results
+
+
+def bench_visual(sizes, count, repeat, images=None, session=None):
+    from visual.perception import VisualPerception
+    results = {}
+    for size in sizes:
+        label = f"{size[0]}x{size[1]}"
+        for fixture, frames in visual_fixtures(size, count, images, session).items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                vp = VisualPerception(async_detection=False, async_ocr=False)
+            t0 = time.time()
+            raw = [{'frame': f, 'frame_timestamp': t0 + i / 20.0} for i, f in enumerate(frames)]
+            pipeline = ('process_frame', lambda inputs: vp.process_frame(inputs['frame'], inputs['frame_timestamp']))
+            for name, summary in bench_registry(vp.registry, raw, repeat, pipeline).items():
+                results[f"visual/{name}/{label}/{fixture}"] = summary
+            vp.close()
+            print(f"[INFO] visual {label} {fixture}: {len(frames)} frames x {repeat}")
+    return results
+
+
+def bench_audio(chunk_sizes, count, repeat, samplerate, wav=None, session=None):
+    from audio.perception import AudioPerception
+    results = {}
+    for chunk_size in chunk_sizes:
+        for fixture, (chunks, rate) in audio_fixtures(chunk_size, count, samplerate, wav, session).items():
+            if not chunks:
+                continue
+            ap = AudioPerception(sample_rate=rate)
+            raw = [{'chunk': c} for c in chunks]
+            pipeline = ('process_chunk', lambda inputs: ap.process_chunk(inputs['chunk']))
+            for name, summary in bench_registry(ap.registry, raw, repeat, pipeline).items():
+                results[f"audio/{name}/{chunk_size}/{fixture}"] = summary
+            ap.close()
+            print(f"[INFO] audio chunk {chunk_size} {fixture}: {len(chunks)} chunks x {repeat}")
+    return results
+
+
+# Regression checks
+
+def compare(results, baseline=None, thresholds=None):
+    """
+    Returns a list of failure messages.
+    thresholds: {'relative': {'metric': 'p95_ms', 'max_regression': 0.25, 'min_delta_ms': 0.1},
+                 'absolute': {key pattern (fnmatch): {metric: limit, ...}}}
+    A result regresses if metric > baseline * (1 + max_regression) and the difference exceeds min_delta_ms
+    (timer noise floor); absolute limits apply to every result whose key matches the pattern.
+    A result that recorded errors or no successful calls fails, and so does a baseline key missing from results.
+    """
+    thresholds = thresholds or {}
+    failures = []
+    for key, summary in results.items():
+        if summary.get('errors', 0) > 0:
+            failures.append(f"{key}: {summary['errors']} errors in {summary.get('n', 0)} successful calls")
+        elif summary.get('n') == 0:
+            failures.append(f"{key}: no successful calls")
+    if baseline is not None:
+        for key in baseline:
+            if key not in results:
+                failures.append(f"{key}: in baseline but missing from results")
+    relative = thresholds.get('relative', {})
+    metric = relative.get('metric', 'p95_ms')
+    max_regression = relative.get('max_regression', 0.25)
+    min_delta = relative.get('min_delta_ms', 0.1)
+    if baseline is not None:
+        for key, summary in results.items():
+            old = baseline.get(key, {}).get(metric)
+            new = summary.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + max_regression) and new - old > min_delta:
+                failures.append(f"{key}: {metric} {new:.3f} vs baseline {old:.3f} (+{100 * (new / old - 1):.0f}%)")
+    for pattern, limits in thresholds.get('absolute', {}).items():
+        for key, summary in results.items():
+            if not fnmatch.fnmatch(key, pattern):
+                continue
+            for limit_metric, limit in limits.items():
+                value = summary.get(limit_metric)
+                if value is not None and value > limit:
+                    failures.append(f"{key}: {limit_metric} {value:.3f} exceeds limit {limit}")
+    return failures
+
+
+def environment():
+    return {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=['320x180', '640x360', '1280x720'])
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1024, 4096, 44100])
+    parser.add_argument('--samplerate', type=int, default=44100)
+    parser.add_argument('--frames', type=int, default=20, help='frames/chunks per fixture')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over each fixture')
+    parser.add_argument('--only', choices=['visual', 'audio'])
+    parser.add_argument('--images', help='directory of recorded frames (any format cv2 reads)')
+    parser.add_argument('--session', help='recorded session directory (replay.session_writer format)')
+    parser.add_argument('--wav', help='recorded audio file')
+    parser.add_argument('--output', default='perception_bench.json')
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS)
+    args = parser.parse_args(argv)
+    results = {}
+    if args.only != 'audio':
+        sizes = [tuple(int(v) for v in size.split('x')) for size in args.sizes]
+        results.update(bench_visual(sizes, args.frames, args.repeat, args.images, args.session))
+    if args.only != 'visual':
+        results.update(bench_audio(args.chunk_sizes, args.frames, args.repeat, args.samplerate, args.wav, args.session))
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\n{'benchmark':<58} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>9} {'peak KB':>9}")
+    for key, s in results.items():
+        if not s.get('n'):
+            print(f"{key:<58} {'(failed: ' + str(s.get('errors')) + ' errors)':>44}")
+            continue
+        print(f"{key:<58} {s['p50_ms']:>8.3f} {s['p95_ms']:>8.3f} {s['p99_ms']:>8.3f} "
+              f"{s['throughput_per_s']:>9.1f} {s['peak_kb']:>9.1f}")
+    print(f"[INFO] Results written to {args.output}")
+    thresholds = None
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        if args.only:
+            # Only one modality was run: the other's baseline entries are not missing results
+            baseline = {key: value for key, value in baseline.items() if key.startswith(args.only + '/')}
+    failures = compare(results, baseline, thresholds)
+    for failure in failures:
+        print(f"[ERROR] Regression: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+bench_sim_loop.py
+
+Benchmark: end-to-end loop throughput on the headless simulated environment (sim.simulated_env).
+Runs the InputOrchestrator -> perception -> agent -> AgentEnvInterface loop on synthetic frames/audio for
+several frame sizes, with all perception features and with only the agent's subscriptions, and reports
+ticks/s, the real-time factor and per-stage timing.
+
+Usage:
+    python -m benchmarks.bench_sim_loop [--steps 200] [--sizes 320x180 1280x720] [--samplerate 16000]
+"""
+
+import argparse
+from sim.simulated_env import SimulatedEnvironment
+
+def run(steps, width, height, samplerate, subscriptions):
+    env = SimulatedEnvironment(width=width, height=height, samplerate=samplerate, subscriptions=subscriptions)
+    try:
+        return env.run(steps)
+    finally:
+        env.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--sizes', nargs='+', default=['320x180', '1280x720'])
+    parser.add_argument('--samplerate', type=int, default=16000)
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split('x'))
+        for label, subscriptions in (('all features', None), ('agent subscriptions', 'agent')):
+            stats = run(args.steps, width, height, args.samplerate, subscriptions)
+            results.append((size, label, stats))
+    print(f"\n{'size':>10} {'features':>20} {'ticks/s':>9} {'x real time':>12}  stage means (ms)")
+    for size, label, stats in results:
+        stages = ', '.join(f"{name} {stage['mean_ms']:.2f}" for name, stage in stats['stages'].items())
+        print(f"{size:>10} {label:>20} {stats['ticks_per_s']:>9.1f} {stats['realtime_factor']:>12.1f}  {stages}")
+
+if __name__ == "__main__":
+    main()
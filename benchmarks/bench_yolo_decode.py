@@ -0,0 +1,103 @@
+"""
+bench_yolo_decode.py
+
+Benchmark: vectorized YOLO output decoding (decode_yolo_outputs) vs. the original per-row Python loop.
+- Uses recorded net.forward outputs saved with --record (np.savez of each output layer), or synthetic
+  yolov4-tiny-shaped outputs (13x13x3 and 26x26x3 rows of 85 values) when no recording is given.
+- Checks both implementations return identical boxes, then reports ms per call and speedup.
+
+Usage:
+    python -m benchmarks.bench_yolo_decode [--outputs outputs.npz] [--repeat 50]
+    python -m benchmarks.bench_yolo_decode --record frame.png --outputs outputs.npz
+"""
+
+import argparse
+import time
+import cv2
+import numpy as np
+from visual.perception import VisualPerception, decode_yolo_outputs
+
+def decode_yolo_outputs_loop(layer_outputs, frame_shape):
+    # Reference: the original per-detection loop from VisualPerception.recognize_objects
+    boxes = []
+    confidences = []
+    class_ids = []
+    h, w = frame_shape[:2]
+    for output in layer_outputs:
+        for detection in output:
+            scores = detection[5:]
+            class_id = np.argmax(scores)
+            confidence = scores[class_id]
+            if confidence > 0.5:
+                center_x = int(detection[0] * w)
+                center_y = int(detection[1] * h)
+                width = int(detection[2] * w)
+                height = int(detection[3] * h)
+                x = int(center_x - width / 2)
+                y = int(center_y - height / 2)
+                boxes.append([x, y, width, height])
+                confidences.append(float(confidence))
+                class_ids.append(class_id)
+    idxs = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
+    keep = np.asarray(idxs, dtype=int).reshape(-1)
+    return [boxes[i] for i in keep], [confidences[i] for i in keep], [class_ids[i] for i in keep]
+
+def synthetic_outputs(seed=0, n_classes=80, hit_rate=0.01):
+    """yolov4-tiny-shaped outputs at 416x416: mostly low scores, with a few confident detections."""
+    rng = np.random.default_rng(seed)
+    outputs = []
+    for rows in (13 * 13 * 3, 26 * 26 * 3):
+        out = np.zeros((rows, 5 + n_classes), dtype=np.float32)
+        out[:, :4] = rng.uniform(0.05, 0.95, (rows, 4))
+        out[:, 2:4] *= 0.3
+        out[:, 5:] = rng.uniform(0.0, 0.2, (rows, n_classes))
+        hits = rng.random(rows) < hit_rate
+        out[hits, 5 + rng.integers(0, n_classes, hits.sum())] = rng.uniform(0.5, 1.0, hits.sum())
+        outputs.append(out)
+    return outputs
+
+def record_outputs(image_path, outputs_path):
+    vp = VisualPerception(async_detection=False)
+    frame = cv2.imread(image_path)
+    if vp.net is None or frame is None:
+        raise SystemExit("[ERROR] Need YOLO weights and a readable image to record outputs.")
+    layer_outputs = vp._forward_yolo(frame)
+    np.savez(outputs_path, frame_shape=np.array(frame.shape), *layer_outputs)
+    print(f"[INFO] Recorded {len(layer_outputs)} output layers to {outputs_path}")
+
+def load_outputs(outputs_path):
+    data = np.load(outputs_path)
+    layers = [data[k] for k in sorted(data.files) if k.startswith('arr_')]
+    return layers, tuple(data['frame_shape'])
+
+def time_call(fn, repeat):
+    fn()  # Warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--outputs', help='npz file with recorded net.forward outputs')
+    parser.add_argument('--record', help='image to run through YOLO and record outputs from (requires --outputs)')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    if args.record:
+        record_outputs(args.record, args.outputs)
+    if args.outputs:
+        layer_outputs, frame_shape = load_outputs(args.outputs)
+    else:
+        layer_outputs, frame_shape = synthetic_outputs(), (720, 1280, 3)
+    loop_boxes, loop_conf, loop_ids = decode_yolo_outputs_loop(layer_outputs, frame_shape)
+    boxes, conf, ids = decode_yolo_outputs(layer_outputs, frame_shape)
+    assert boxes.tolist() == loop_boxes and ids.tolist() == [int(i) for i in loop_ids], "Decoders disagree"
+    rows = sum(len(o) for o in layer_outputs)
+    loop_ms = time_call(lambda: decode_yolo_outputs_loop(layer_outputs, frame_shape), args.repeat)
+    vec_ms = time_call(lambda: decode_yolo_outputs(layer_outputs, frame_shape), args.repeat)
+    print(f"[RESULT] {rows} rows, {len(boxes)} detections after NMS")
+    print(f"  loop:       {loop_ms:.3f} ms/call")
+    print(f"  vectorized: {vec_ms:.3f} ms/call ({loop_ms / vec_ms:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+blob_store.py
+
+Content-addressed, append-only blob store for raw frames and audio, kept out of the database rows.
+- Blobs are appended to segment files on local disk (segment_000000.bin, ...); a new segment starts once
+  the current one reaches segment_size bytes.
+- Each blob is addressed by its content hash: storing identical bytes twice returns the existing reference.
+- The database row keeps only a small reference (segment, offset, length, shape, dtype, digest), so metadata
+  queries stay fast; reads are zero-copy NumPy views over memory-mapped segments.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import numpy as np
+
+
+class BlobStore:
+    def __init__(self, root, segment_size=256 * 1024 * 1024, use_mmap=True):
+        """
+        root: directory holding segment files and the digest index
+        segment_size: bytes per segment before rolling over to a new one
+        use_mmap: read through memory maps (zero-copy); if False, reads copy from the file
+        """
+        self.root = root
+        self.segment_size = segment_size
+        self.use_mmap = use_mmap
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps = {}  # segment -> (mmap, mapped length)
+        self._index_path = os.path.join(root, 'index.jsonl')
+        self._index = {}  # digest -> reference dict
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        ref = json.loads(line)
+                        self._index[ref['digest']] = ref
+        segments = sorted(name for name in os.listdir(root) if name.startswith('segment_'))
+        self._segment = int(segments[-1][len('segment_'):-len('.bin')]) if segments else 0
+        self._file = open(self._segment_path(self._segment), 'ab')
+        self._index_file = open(self._index_path, 'a')
+
+    def _segment_path(self, segment):
+        return os.path.join(self.root, f'segment_{segment:06d}.bin')
+
+    def put(self, array):
+        """
+        Store a NumPy array (or bytes) and return its reference dict:
+        {'segment', 'offset', 'length', 'shape', 'dtype', 'digest'} (JSON-serializable, for a JSONB column).
+        Identical content is stored once.
+        """
+        if isinstance(array, np.ndarray):
+            shape, dtype = list(array.shape), str(array.dtype)
+            data = memoryview(np.ascontiguousarray(array)).cast('B')
+        else:
+            data = memoryview(array).cast('B')
+            shape, dtype = [len(data)], 'uint8'
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        with self._lock:
+            existing = self._index.get(digest)
+            if existing is not None:
+                return dict(existing, shape=shape, dtype=dtype)
+            if self._file.tell() > 0 and self._file.tell() + len(data) > self.segment_size:
+                self._file.close()
+                self._segment += 1
+                self._file = open(self._segment_path(self._segment), 'ab')
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            ref = {
+                'segment': self._segment, 'offset': offset, 'length': len(data),
+                'shape': shape, 'dtype': dtype, 'digest': digest,
+            }
+            self._index[digest] = ref
+            self._index_file.write(json.dumps(ref) + '\n')
+            self._index_file.flush()
+        return ref
+
+    def _map(self, segment, end):
+        # Map (or re-map, if the segment has grown past the mapped length) a segment read-only
+        mapped = self._maps.get(segment)
+        if mapped is None or mapped[1] < end:
+            # The old map (if any) is not closed: existing views keep it alive until they are released
+            with open(self._segment_path(segment), 'rb') as f:
+                length = os.fstat(f.fileno()).st_size
+                mapped = (mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ), length)
+            self._maps[segment] = mapped
+        return mapped[0]
+
+    def get(self, ref):
+        """
+        Returns the stored array for a reference (as returned by put, or loaded from the JSONB column).
+        With use_mmap the result is a read-only view over the memory-mapped segment (no copy).
+        """
+        if isinstance(ref, str):
+            ref = json.loads(ref)
+        segment, offset, length = ref['segment'], ref['offset'], ref['length']
+        dtype = np.dtype(ref.get('dtype', 'uint8'))
+        if self.use_mmap:
+            with self._lock:
+                buffer = self._map(segment, offset + length)
+            array = np.frombuffer(buffer, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+        else:
+            with open(self._segment_path(segment), 'rb') as f:
+                f.seek(offset)
+                array = np.frombuffer(f.read(length), dtype=dtype)
+        return array.reshape(ref['shape'])
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._index_file.close()
+            for mapped, _ in self._maps.values():
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass  # Views still reference the map; it is released when they are garbage collected
+            self._maps = {}
@@ -0,0 +1,218 @@
+"""
+bulk_writer.py
+
+Batched, background ingestion of observations into PostgreSQL/TimescaleDB.
+- Callers submit observations to a bounded queue (blocking when full: back-pressure instead of unbounded memory).
+- A writer thread flushes batches with one multi-row INSERT (psycopg2.extras.execute_values) and one commit,
+  when batch_size rows are buffered or flush_interval seconds have passed.
+- Sinks are pluggable: PostgresSink for a live database, MemorySink as a stand-in for tests/benchmarks.
+- Reports rows/s and MB/s; failed batches are counted in stats()['errors'] and traced (tracing.tracer, ERROR).
+"""
+
+import queue
+import threading
+import time
+
+try:
+    from db.db_insert import OBSERVATION_COLUMNS, observation_to_row
+except ImportError:  # Running as a script from inside db/
+    from db_insert import OBSERVATION_COLUMNS, observation_to_row
+try:
+    from tracing.tracer import tracer, ERROR
+except ImportError:  # Running as a script from inside db/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from tracing.tracer import tracer, ERROR
+
+
+def _row_nbytes(row):
+    # Approximate payload size: bytes/str fields (psycopg2.Binary keeps the raw buffer in .adapted)
+    total = 0
+    for field in row:
+        field = getattr(field, 'adapted', field)
+        if isinstance(field, (bytes, bytearray, memoryview, str)):
+            total += len(field)
+    return total
+
+
+class PostgresSink:
+    def __init__(self, conn, table='agent_observations', columns=OBSERVATION_COLUMNS, page_size=100):
+        """
+        conn: psycopg2 connection (used only from the writer thread)
+        page_size: rows per INSERT statement sent by execute_values
+        """
+        self.conn = conn
+        self.table = table
+        self.columns = columns
+        self.page_size = page_size
+
+    def write_rows(self, rows):
+        from psycopg2.extras import execute_values
+        try:
+            with self.conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES %s",
+                    rows,
+                    page_size=self.page_size,
+                )
+            self.conn.commit()
+        except Exception:
+            # Leave the connection usable: otherwise every later batch fails with "transaction is aborted"
+            self.conn.rollback()
+            raise
+
+
+class MemorySink:
+    """Stand-in sink that keeps rows in memory (for tests and throughput benchmarks without a database)."""
+    def __init__(self, keep_rows=True, write_delay=0.0):
+        """
+        keep_rows: store rows in self.rows (disable for long benchmarks)
+        write_delay: simulated per-batch round trip (seconds)
+        """
+        self.keep_rows = keep_rows
+        self.write_delay = write_delay
+        self.rows = []
+        self.batches = 0
+
+    def write_rows(self, rows):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        if self.keep_rows:
+            self.rows.extend(rows)
+        self.batches += 1
+
+
+class BulkObservationWriter:
+    def __init__(self, sink, batch_size=64, flush_interval=1.0, max_queue=256, row_fn=None, blob_store=None):
+        """
+        sink: object with write_rows(rows) (PostgresSink, MemorySink, ...)
+        batch_size: flush when this many rows are buffered
+        flush_interval: flush at least this often (seconds) when rows are pending
+        max_queue: bounded queue size; submit() blocks when full (back-pressure)
+        row_fn: converts an observation to a row tuple (default: observation_to_row)
+        blob_store: optional BlobStore; frames/audio are written to it and rows keep only references
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        if row_fn is None:
+            row_fn = lambda observation: observation_to_row(observation, blob_store=blob_store)
+        self.row_fn = row_fn
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stop = object()
+        self._flush_request = object()
+        self._flushed = threading.Event()
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.batches_written = 0
+        self.errors = 0
+        self.blocked_seconds = 0.0  # Time callers spent blocked on a full queue
+        self._started_at = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="BulkObservationWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, observation, timeout=None):
+        """
+        Queue an observation for writing. The row is built here, on the caller's thread, so frame/audio
+        buffers are copied while still valid. Blocks when the queue is full. Without a running writer thread,
+        pending rows are written here once batch_size are queued.
+        Raises queue.Full if timeout (seconds) expires.
+        """
+        row = self.row_fn(observation)
+        t0 = time.monotonic()
+        self._queue.put((row, _row_nbytes(row)), timeout=timeout)
+        self.blocked_seconds += time.monotonic() - t0
+        if self._thread is None and (self._queue.qsize() >= self.batch_size or self._queue.full()):
+            # No writer thread (start() not called): write on the caller's thread instead of filling up and blocking
+            self._flush_sync()
+
+    def flush(self, timeout=None):
+        """
+        Write everything submitted so far and wait until it has been written.
+        If the writer thread is not running (start() not called), rows are written on the caller's thread.
+        """
+        if self._thread is None:
+            self._flush_sync()
+            return
+        self._flushed.clear()
+        self._queue.put(self._flush_request)
+        self._flushed.wait(timeout)
+
+    def close(self, timeout=None):
+        """Flush remaining rows and stop the writer thread."""
+        if self._thread is None:
+            self._flush_sync()
+            return
+        self._queue.put(self._stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        return {
+            'rows': self.rows_written,
+            'batches': self.batches_written,
+            'megabytes': self.bytes_written / 1e6,
+            'rows_per_s': self.rows_written / elapsed if elapsed > 0 else 0.0,
+            'mb_per_s': self.bytes_written / 1e6 / elapsed if elapsed > 0 else 0.0,
+            'queue_depth': self._queue.qsize(),
+            'blocked_seconds': self.blocked_seconds,
+            'errors': self.errors,
+        }
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            self.sink.write_rows([row for row, _ in batch])
+            self.rows_written += len(batch)
+            self.bytes_written += sum(nbytes for _, nbytes in batch)
+            self.batches_written += 1
+        except Exception as e:
+            self.errors += 1
+            tracer.event(ERROR, 'db.bulk_write', 'failed to write {rows} rows: {error}', rows=len(batch), error=e)
+
+    def _flush_sync(self):
+        # Nothing drains the queue: write it out here, in batch_size batches
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is self._stop:
+                self._write(batch)
+                return
+            if item is self._flush_request:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                self._flushed.set()
+                continue
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
@@ -10,6 +10,14 @@ import numpy as np
 import datetime
 import os
 from dotenv import load_dotenv
+
+try:
+    from tracing.tracer import tracer, DEBUG
+except ImportError:  # Running as a script from inside db/
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from tracing.tracer import tracer, DEBUG
+
 def get_db_connection():
     load_dotenv()
     conn = psycopg2.connect(
@@ -21,51 +29,88 @@ def get_db_connection():
     )
     return conn
 
-def insert_observation(conn, observation):
+OBSERVATION_COLUMNS = (
+    'timestamp', 'video_frame', 'video_frame_shape', 'video_frame_dtype',
+    'audio_chunk', 'audio_shape', 'audio_dtype', 'keyboard_state', 'mouse_state', 'events',
+    'video_frame_ref', 'audio_chunk_ref',
+)
+
+def observation_to_row(observation, blob_store=None):
     """
-    Insert a single AgentObservation into the database.
-    observation: AgentObservation object
-    conn: psycopg2 connection
+    Convert an observation dict (from InputOrchestrator.get_observation) to a row tuple matching
+    OBSERVATION_COLUMNS. Frame/audio arrays are copied to bytes here, so the row stays valid after
+    capture buffers are reused.
+    If blob_store (db.blob_store.BlobStore) is given, frame/audio arrays are written to it and the row
+    keeps only their references (video_frame_ref/audio_chunk_ref) instead of inline BYTEA.
     """
     video_frame = observation.get('video_frame')
     audio_chunk = observation.get('audio_chunk')
+    video_frame_ref = None
+    audio_chunk_ref = None
+    if blob_store is not None:
+        if isinstance(video_frame, np.ndarray):
+            video_frame_ref = blob_store.put(video_frame)
+            video_frame = None
+        if isinstance(audio_chunk, np.ndarray):
+            audio_chunk_ref = blob_store.put(audio_chunk)
+            audio_chunk = None
     # Track shape and dtype for video_frame if it's a numpy array
-    video_frame_shape = None
-    video_frame_dtype = None
+    video_frame_shape = video_frame_ref['shape'] if video_frame_ref else None
+    video_frame_dtype = video_frame_ref['dtype'] if video_frame_ref else None
     if isinstance(video_frame, np.ndarray):
         video_frame_shape = video_frame.shape
         video_frame_dtype = str(video_frame.dtype)
         video_frame_bytes = video_frame.tobytes()
     else:
+        # Already bytes (e.g., encoded by encoding.EncodingStage, which keeps video_frame_shape/dtype)
         video_frame_bytes = video_frame
-    print(f"[DB DEBUG] Inserting observation:")
-    print(f"  timestamp: {observation['timestamp']}")
-    print(f"  video_frame type: {type(video_frame)}, length: {len(video_frame) if video_frame is not None else 'NULL'}")
-    print(f"  audio_chunk type: {type(audio_chunk)}, shape: {audio_chunk.shape if hasattr(audio_chunk, 'shape') else 'N/A'}")
-    print(f"  keyboard_state: {observation.get('keyboard_state')}")
-    print(f"  mouse_state: {observation.get('mouse_state')}")
-    print(f"  events: {observation.get('events')}")
+        if video_frame_ref is None and video_frame is not None:
+            video_frame_shape = observation.get('video_frame_shape')
+            video_frame_dtype = observation.get('video_frame_dtype')
     audio_shape = observation.get('audio_shape')
     audio_dtype = observation.get('audio_dtype')
+    return (
+        observation['timestamp'],
+        psycopg2.Binary(video_frame_bytes) if video_frame_bytes is not None else None,
+        json.dumps(video_frame_shape) if video_frame_shape is not None else None,
+        video_frame_dtype,
+        (audio_chunk.tobytes() if isinstance(audio_chunk, np.ndarray) else audio_chunk) if audio_chunk is not None else None,
+        json.dumps(audio_shape) if audio_shape is not None else None,
+        audio_dtype,
+        json.dumps(observation.get('keyboard_state')),
+        json.dumps(observation.get('mouse_state')),
+        json.dumps(observation.get('events')),
+        json.dumps(video_frame_ref) if video_frame_ref is not None else None,
+        json.dumps(audio_chunk_ref) if audio_chunk_ref is not None else None,
+    )
+
+def insert_observation(conn, observation, blob_store=None):
+    """
+    Insert a single AgentObservation into the database.
+    observation: AgentObservation object
+    conn: psycopg2 connection
+    blob_store: optional BlobStore; frames/audio are then stored out of row (see observation_to_row)
+    For sustained capture rates use db.bulk_writer.BulkObservationWriter instead (batched, one commit per batch).
+    """
+    video_frame = observation.get('video_frame')
+    audio_chunk = observation.get('audio_chunk')
+    if tracer.enabled(DEBUG):
+        tracer.debug(
+            'db.insert_observation',
+            timestamp=observation['timestamp'],
+            video_frame_type=type(video_frame).__name__,
+            video_frame_length=len(video_frame) if video_frame is not None else None,
+            audio_chunk_shape=getattr(audio_chunk, 'shape', None),
+            n_events=len(observation.get('events') or ()),
+        )
     with conn.cursor() as cur:
         cur.execute(
-            """
+            f"""
             INSERT INTO agent_observations (
-                timestamp, video_frame, video_frame_shape, video_frame_dtype, audio_chunk, audio_shape, audio_dtype, keyboard_state, mouse_state, events
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                {', '.join(OBSERVATION_COLUMNS)}
+            ) VALUES ({', '.join(['%s'] * len(OBSERVATION_COLUMNS))})
             """,
-            (
-                observation['timestamp'],
-                psycopg2.Binary(video_frame_bytes) if video_frame_bytes is not None else None,
-                json.dumps(video_frame_shape) if video_frame_shape is not None else None,
-                video_frame_dtype,
-                audio_chunk.tobytes() if audio_chunk is not None else None,
-                json.dumps(audio_shape) if audio_shape is not None else None,
-                audio_dtype,
-                json.dumps(observation.get('keyboard_state')),
-                json.dumps(observation.get('mouse_state')),
-                json.dumps(observation.get('events'))
-            )
+            observation_to_row(observation, blob_store=blob_store)
         )
     conn.commit()
 
@@ -0,0 +1,99 @@
+"""
+audio_codecs.py
+
+Pluggable audio chunk codecs for recorded observations.
+- raw: uncompressed sample bytes
+- delta: int16 first-difference + zlib (lossless; sample-to-sample differences are small and compress well)
+- flac: FLAC via soundfile (lossless; optional dependency)
+Encoded chunks are self-describing (see encoding/container.py).
+"""
+
+import io
+import zlib
+import numpy as np
+
+try:
+    from encoding.container import is_packed, pack, unpack
+except ImportError:  # Running as a script from inside encoding/
+    from container import is_packed, pack, unpack
+
+AUDIO_MAGIC = b'EAAC'
+
+
+class RawAudioCodec:
+    name = 'raw'
+    codec_id = 0
+    stateful = False
+
+    def encode(self, chunk):
+        chunk = np.ascontiguousarray(chunk)
+        return pack(AUDIO_MAGIC, self.codec_id, {'shape': chunk.shape, 'dtype': str(chunk.dtype)}, chunk.tobytes())
+
+
+class DeltaAudioCodec:
+    name = 'delta'
+    codec_id = 1
+    stateful = False
+
+    def __init__(self, level=1):
+        self.level = level
+
+    def encode(self, chunk):
+        if not np.issubdtype(chunk.dtype, np.integer):
+            raise ValueError("delta audio codec needs integer samples (e.g., int16)")
+        # Integer differences wrap around, and cumsum in the same dtype undoes them exactly
+        delta = np.diff(chunk, axis=0, prepend=np.zeros((1,) + chunk.shape[1:], dtype=chunk.dtype))
+        header = {'shape': chunk.shape, 'dtype': str(chunk.dtype)}
+        return pack(AUDIO_MAGIC, self.codec_id, header, zlib.compress(delta.tobytes(), self.level))
+
+
+class FlacAudioCodec:
+    name = 'flac'
+    codec_id = 2
+    stateful = False
+
+    def __init__(self, samplerate=44100):
+        import soundfile  # Optional dependency, only needed for FLAC
+        self._sf = soundfile
+        self.samplerate = samplerate
+
+    def encode(self, chunk):
+        buffer = io.BytesIO()
+        self._sf.write(buffer, chunk, self.samplerate, format='FLAC', subtype='PCM_16')
+        header = {'shape': chunk.shape, 'dtype': str(chunk.dtype), 'samplerate': self.samplerate}
+        return pack(AUDIO_MAGIC, self.codec_id, header, buffer.getvalue())
+
+
+AUDIO_CODECS = {
+    'raw': RawAudioCodec,
+    'delta': DeltaAudioCodec,
+    'flac': FlacAudioCodec,
+}
+
+def get_audio_codec(name, **kwargs):
+    """Returns a new codec instance by name ('raw', 'delta', 'flac')."""
+    if name not in AUDIO_CODECS:
+        raise ValueError(f"Unknown audio codec: {name}")
+    return AUDIO_CODECS[name](**kwargs)
+
+def is_encoded_audio(data):
+    return is_packed(data, AUDIO_MAGIC)
+
+def decode_audio(data):
+    """
+    Decode an audio chunk produced by any audio codec.
+    Returns numpy array with the original shape and dtype.
+    Raises ValueError if data is not an encoded chunk.
+    """
+    codec_id, _, header, payload = unpack(data, AUDIO_MAGIC)
+    shape, dtype = tuple(header['shape']), np.dtype(header['dtype'])
+    if codec_id == RawAudioCodec.codec_id:
+        return np.frombuffer(payload, dtype=dtype).reshape(shape)
+    if codec_id == DeltaAudioCodec.codec_id:
+        delta = np.frombuffer(zlib.decompress(payload), dtype=dtype).reshape(shape)
+        return np.cumsum(delta, axis=0, dtype=dtype)
+    if codec_id == FlacAudioCodec.codec_id:
+        import soundfile
+        chunk, _ = soundfile.read(io.BytesIO(payload), dtype=str(dtype), always_2d=len(shape) == 2)
+        return chunk.reshape(shape)
+    raise ValueError(f"Unknown audio codec id: {codec_id}")
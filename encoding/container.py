@@ -0,0 +1,37 @@
+"""
+container.py
+
+Self-describing byte container shared by the frame and audio codecs.
+Layout: MAGIC (4 bytes) | codec id (1 byte) | flags (1 byte) | header length (2 bytes, big-endian) | JSON header | payload
+The JSON header carries shape/dtype (and codec parameters), so decoders need nothing but the bytes.
+"""
+
+import json
+import struct
+
+_PREFIX = struct.Struct('>4sBBH')
+
+FLAG_KEYFRAME = 0x01
+
+
+def pack(magic, codec_id, header, payload, flags=0):
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('ascii')
+    return _PREFIX.pack(magic, codec_id, flags, len(header_bytes)) + header_bytes + payload
+
+
+def is_packed(data, magic):
+    return len(data) >= _PREFIX.size and bytes(data[:4]) == magic
+
+
+def unpack(data, magic):
+    """
+    Returns (codec_id, flags, header dict, payload memoryview).
+    Raises ValueError if data does not start with magic.
+    """
+    data = memoryview(data)
+    if not is_packed(data, magic):
+        raise ValueError(f"Not an encoded buffer (expected magic {magic!r})")
+    _, codec_id, flags, header_len = _PREFIX.unpack_from(data)
+    start = _PREFIX.size
+    header = json.loads(bytes(data[start:start + header_len]))
+    return codec_id, flags, header, data[start + header_len:]
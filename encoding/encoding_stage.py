@@ -0,0 +1,105 @@
+"""
+encoding_stage.py
+
+Worker-pool encoding stage for recorded observations.
+- Encodes each observation's video_frame and audio_chunk with the configured codecs on a thread pool
+  (cv2.imencode and zlib release the GIL, so encodes run in parallel).
+- Stateful codecs (e.g., keyframe+delta) run on a dedicated single worker so frames are encoded in order.
+- Encoded observations keep shape/dtype fields and gain 'video_codec'/'audio_codec'; the encoded bytes are
+  self-describing and decode with decode_video_frame_bytes / decode_audio_chunk_bytes.
+- Library stage: the recording paths do not use it yet; callers submit observations and hand the encoded
+  results (in submission order) to a writer, e.g., BulkObservationWriter.submit.
+"""
+
+import concurrent.futures
+import threading
+import numpy as np
+
+try:
+    from encoding.frame_codecs import get_frame_codec
+    from encoding.audio_codecs import get_audio_codec
+except ImportError:  # Running as a script from inside encoding/
+    from frame_codecs import get_frame_codec
+    from audio_codecs import get_audio_codec
+
+
+class EncodingStage:
+    def __init__(self, video_codec='png', audio_codec='delta', max_workers=4, video_options=None, audio_options=None):
+        """
+        video_codec: frame codec name ('raw', 'png', 'jpeg', 'webp', 'delta') or None to leave frames as-is
+        audio_codec: audio codec name ('raw', 'delta', 'flac') or None to leave audio as-is
+        max_workers: thread pool size for stateless codecs
+        video_options/audio_options: keyword arguments for the codec constructors (e.g., {'level': 80})
+        """
+        self.video_codec = get_frame_codec(video_codec, **(video_options or {})) if video_codec else None
+        self.audio_codec = get_audio_codec(audio_codec, **(audio_options or {})) if audio_codec else None
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Encoder")
+        # Ordered lane for stateful codecs: one worker, FIFO
+        self._ordered = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="OrderedEncoder")
+
+    def _encode_video(self, frame):
+        return self.video_codec.encode(frame)
+
+    def _encode_audio(self, chunk):
+        return self.audio_codec.encode(chunk)
+
+    def _submit(self, codec, fn, value):
+        executor = self._ordered if codec.stateful else self._pool
+        return executor.submit(fn, value)
+
+    def submit(self, observation):
+        """
+        Schedule encoding of one observation; returns a Future resolving to the encoded observation (a new dict).
+        Arrays are copied here, so capture ring buffers may be reused immediately after submit returns.
+        Futures may complete out of order; consume them in submission order to keep observations ordered.
+        """
+        video_future = audio_future = None
+        frame = observation.get('video_frame')
+        if self.video_codec is not None and isinstance(frame, np.ndarray):
+            video_future = self._submit(self.video_codec, self._encode_video, np.ascontiguousarray(frame).copy())
+        chunk = observation.get('audio_chunk')
+        if self.audio_codec is not None and isinstance(chunk, np.ndarray):
+            audio_future = self._submit(self.audio_codec, self._encode_audio, np.array(chunk, copy=True))
+
+        # Assembled by done-callbacks when the last part finishes: no pool worker ever blocks waiting on another
+        result = concurrent.futures.Future()
+        parts = [f for f in (video_future, audio_future) if f is not None]
+        if not parts:
+            result.set_result(dict(observation))
+            return result
+        pending = [len(parts)]
+        lock = threading.Lock()
+
+        def assemble(_):
+            with lock:
+                pending[0] -= 1
+                if pending[0]:
+                    return
+            try:
+                encoded = dict(observation)
+                if video_future is not None:
+                    encoded['video_frame'] = video_future.result()
+                    encoded['video_frame_shape'] = frame.shape
+                    encoded['video_frame_dtype'] = str(frame.dtype)
+                    encoded['video_codec'] = self.video_codec.name
+                if audio_future is not None:
+                    encoded['audio_chunk'] = audio_future.result()
+                    encoded['audio_shape'] = chunk.shape
+                    encoded['audio_dtype'] = str(chunk.dtype)
+                    encoded['audio_codec'] = self.audio_codec.name
+            except Exception as e:
+                result.set_exception(e)
+                return
+            result.set_result(encoded)
+
+        for part in parts:
+            part.add_done_callback(assemble)
+        return result
+
+    def encode(self, observation):
+        """Encode one observation synchronously (convenience wrapper around submit)."""
+        return self.submit(observation).result()
+
+    def close(self):
+        self._ordered.shutdown(wait=True)
+        self._pool.shutdown(wait=True)
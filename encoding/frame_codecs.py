@@ -0,0 +1,147 @@
+"""
+frame_codecs.py
+
+Pluggable video frame codecs for recorded observations.
+- raw: uncompressed array bytes
+- png / jpeg / webp: single-frame image codecs via cv2.imencode (png is lossless, jpeg/webp are lossy)
+- delta: keyframe + delta encoding (zlib of the difference from the previous frame; lossless, stateful)
+Every encoded frame is self-describing (see encoding/container.py), so decode_frame needs only the bytes
+(plus the previous decoded frame for delta frames).
+"""
+
+import zlib
+import cv2
+import numpy as np
+
+try:
+    from encoding.container import FLAG_KEYFRAME, is_packed, pack, unpack
+except ImportError:  # Running as a script from inside encoding/
+    from container import FLAG_KEYFRAME, is_packed, pack, unpack
+
+VIDEO_MAGIC = b'EAVF'
+
+
+class RawFrameCodec:
+    name = 'raw'
+    codec_id = 0
+    stateful = False
+
+    def encode(self, frame):
+        frame = np.ascontiguousarray(frame)
+        return pack(VIDEO_MAGIC, self.codec_id, {'shape': frame.shape, 'dtype': str(frame.dtype)}, frame.tobytes())
+
+
+class ImageFrameCodec:
+    """Single-frame image codec (png, jpeg or webp) using cv2.imencode."""
+    stateful = False
+    _formats = {
+        'png': (1, '.png', cv2.IMWRITE_PNG_COMPRESSION),
+        'jpeg': (2, '.jpg', cv2.IMWRITE_JPEG_QUALITY),
+        'webp': (3, '.webp', cv2.IMWRITE_WEBP_QUALITY),
+    }
+
+    def __init__(self, name='png', level=None):
+        """
+        name: 'png', 'jpeg' or 'webp'
+        level: PNG compression level (0-9, default 1 for speed) or JPEG/WebP quality (0-100, default 90)
+        """
+        if name not in self._formats:
+            raise ValueError(f"Unknown image codec: {name}")
+        self.name = name
+        self.codec_id, self.ext, self.param = self._formats[name]
+        self.level = level if level is not None else (1 if name == 'png' else 90)
+
+    def encode(self, frame):
+        ok, buffer = cv2.imencode(self.ext, frame, [self.param, self.level])
+        if not ok:
+            raise ValueError(f"cv2.imencode failed for {self.name}")
+        return pack(VIDEO_MAGIC, self.codec_id, {'shape': frame.shape, 'dtype': str(frame.dtype)}, buffer.tobytes())
+
+
+class DeltaFrameCodec:
+    """
+    Keyframe + delta codec. Every keyframe_interval frames (or on a shape change) a full frame is stored;
+    in between, the wrap-around difference from the previous frame is stored. Static or slowly changing
+    scenes produce mostly-zero deltas that zlib compresses very well. Lossless.
+    Stateful: frames must be encoded in order (EncodingStage runs stateful codecs on a single worker).
+    """
+    name = 'delta'
+    codec_id = 4
+    stateful = True
+
+    def __init__(self, keyframe_interval=30, level=1):
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self._prev = None
+        self._since_keyframe = 0
+
+    def encode(self, frame):
+        frame = np.ascontiguousarray(frame)
+        header = {'shape': frame.shape, 'dtype': str(frame.dtype)}
+        keyframe = (self._prev is None or self._prev.shape != frame.shape
+                    or self._since_keyframe >= self.keyframe_interval - 1)
+        if keyframe:
+            payload = zlib.compress(frame.tobytes(), self.level)
+            self._since_keyframe = 0
+        else:
+            # uint8/int arithmetic wraps, so decoding adds the delta back exactly
+            payload = zlib.compress((frame - self._prev).tobytes(), self.level)
+            self._since_keyframe += 1
+        self._prev = frame.copy()
+        return pack(VIDEO_MAGIC, self.codec_id, header, payload, flags=FLAG_KEYFRAME if keyframe else 0)
+
+
+FRAME_CODECS = {
+    'raw': RawFrameCodec,
+    'png': lambda **kwargs: ImageFrameCodec('png', **kwargs),
+    'jpeg': lambda **kwargs: ImageFrameCodec('jpeg', **kwargs),
+    'webp': lambda **kwargs: ImageFrameCodec('webp', **kwargs),
+    'delta': DeltaFrameCodec,
+}
+
+def get_frame_codec(name, **kwargs):
+    """Returns a new codec instance by name ('raw', 'png', 'jpeg', 'webp', 'delta')."""
+    if name not in FRAME_CODECS:
+        raise ValueError(f"Unknown frame codec: {name}")
+    return FRAME_CODECS[name](**kwargs)
+
+def is_encoded_frame(data):
+    return is_packed(data, VIDEO_MAGIC)
+
+def decode_frame(data, reference=None):
+    """
+    Decode a frame produced by any frame codec.
+    Args:
+        data: bytes/memoryview from codec.encode
+        reference: previous decoded frame (required for non-key delta frames)
+    Returns:
+        numpy array with the original shape and dtype
+    Raises:
+        ValueError: if data is not an encoded frame or a delta frame has no reference
+    """
+    codec_id, flags, header, payload = unpack(data, VIDEO_MAGIC)
+    shape, dtype = tuple(header['shape']), np.dtype(header['dtype'])
+    if codec_id == RawFrameCodec.codec_id:
+        return np.frombuffer(payload, dtype=dtype).reshape(shape)
+    if codec_id in (1, 2, 3):
+        frame = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_UNCHANGED)
+        return frame.reshape(shape)
+    if codec_id == DeltaFrameCodec.codec_id:
+        raw = np.frombuffer(zlib.decompress(payload), dtype=dtype).reshape(shape)
+        if flags & FLAG_KEYFRAME:
+            return raw
+        if reference is None:
+            raise ValueError("Delta frame needs the previous decoded frame as reference")
+        return reference + raw
+    raise ValueError(f"Unknown frame codec id: {codec_id}")
+
+
+class FrameDecoder:
+    """Stateful decoder for a sequence of encoded frames (keeps the reference for delta frames)."""
+    def __init__(self):
+        self.reference = None
+
+    def decode(self, data):
+        frame = decode_frame(data, reference=self.reference)
+        self.reference = frame
+        return frame
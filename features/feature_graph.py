@@ -0,0 +1,182 @@
+"""
+feature_graph.py
+
+Executor-aware feature graph for perception.
+- Each feature declares the inputs/features it depends on; the graph runs them in dependency order.
+- With an executor, every feature whose dependencies are ready is submitted at once, so independent
+  NumPy/SciPy extractors (which release the GIL) run concurrently on a thread pool.
+- Per-feature deadlines (seconds from the start of run) drop late features for that run instead of delaying
+  the observation; features depending on a dropped or failed feature are skipped.
+- Results use the perception format: {'value': ..., 'lag': seconds since capture}; dropped features are
+  {'value': None, 'lag': None, 'dropped': True}.
+"""
+
+import threading
+import time
+
+
+class FeatureNode:
+    def __init__(self, name, fn, deps=(), deadline=None, output=True):
+        """
+        name: feature name (key in the result dict)
+        fn: called with the values of deps, in order
+        deps: names of graph inputs (passed to run) or other features
+        deadline: seconds after run() starts after which this feature is dropped (None: graph default)
+        output: include in the result dict (False for shared intermediates such as an STFT)
+        """
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.deadline = deadline
+        self.output = output
+
+
+class _Run:
+    # State of one run(): graph inputs and computed values, results, and outstanding dependency counts
+    def __init__(self, graph, inputs, capture_time, order):
+        self.values = dict(inputs)
+        self.results = {}
+        self.capture_time = capture_time
+        # Only features computed in this run are waited on; others' values come from inputs
+        self.active = set(order)
+        self.pending = {name: sum(dep in self.active for dep in graph.nodes[name].deps) for name in order}
+        self.cond = threading.Condition()
+        self.closed = False  # Set once run() returns: late results are discarded and dependents not started
+
+
+class FeatureGraph:
+    def __init__(self, executor=None, default_deadline=None):
+        """
+        executor: concurrent.futures executor for parallel execution (None: run inline in dependency order)
+        default_deadline: per-feature deadline (seconds from run start) for nodes without their own
+        """
+        self.executor = executor
+        self.default_deadline = default_deadline
+        self.nodes = {}
+        self._order = None
+        self._dependents = None
+        self.dropped = {}  # Feature name -> number of runs it was dropped from
+        self.durations = {}  # Feature name -> seconds its last computation took
+
+    def add(self, name, fn, deps=(), deadline=None, output=True):
+        """Add a feature node (see FeatureNode). Returns self for chaining."""
+        if name in self.nodes:
+            raise ValueError(f"Feature '{name}' already in graph")
+        self.nodes[name] = FeatureNode(name, fn, deps, deadline, output)
+        self._order = None
+        return self
+
+    def order(self):
+        """Features in topological order. Raises ValueError on dependency cycles."""
+        if self._order is None:
+            order, state = [], {}
+
+            def visit(name, path):
+                if state.get(name) == 'done' or name not in self.nodes:
+                    return
+                if state.get(name) == 'visiting':
+                    raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+                state[name] = 'visiting'
+                for dep in self.nodes[name].deps:
+                    visit(dep, path + [name])
+                state[name] = 'done'
+                order.append(name)
+
+            for name in self.nodes:
+                visit(name, [])
+            self._order = order
+            self._dependents = {name: [n for n in order if name in self.nodes[n].deps] for name in order}
+        return self._order
+
+    def _deadline(self, node):
+        return node.deadline if node.deadline is not None else self.default_deadline
+
+    def _compute(self, run, node):
+        # Returns (value, ok). Inputs are read without the lock: values are only added, never replaced
+        if any(dep in run.active and dep not in run.values for dep in node.deps):
+            return "Error: dependency failed", False
+        missing = [dep for dep in node.deps if dep not in run.values]
+        if missing:
+            return f"Error: missing input {missing[0]}", False
+        t0 = time.perf_counter()
+        try:
+            return node.fn(*[run.values[dep] for dep in node.deps]), True
+        except Exception as e:
+            return f"Error: {e}", False
+        finally:
+            self.durations[node.name] = time.perf_counter() - t0
+
+    def _done(self, run, node, value, ok):
+        # Record a finished feature, then start the dependents that became ready
+        with run.cond:
+            if run.closed:
+                return
+            if ok:
+                run.values[node.name] = value
+            run.results[node.name] = {'value': value, 'lag': time.time() - run.capture_time}
+            run.cond.notify_all()
+            ready = []
+            for name in self._dependents[node.name]:
+                if name not in run.active:
+                    continue
+                run.pending[name] -= 1
+                if run.pending[name] == 0:
+                    ready.append(name)
+        self._submit(run, ready)
+
+    def _submit(self, run, names):
+        for name in names:
+            node = self.nodes[name]
+            future = self.executor.submit(self._compute, run, node)
+            future.add_done_callback(lambda f, node=node: self._done(run, node, *f.result()))
+
+    def run(self, inputs, capture_time=None, only=None):
+        """
+        Compute every feature for one set of inputs (e.g., {'chunk': audio_chunk}).
+        Args:
+            inputs: dict of graph input values (may also supply values for features not computed this run)
+            capture_time: time.time() capture timestamp used for lag (defaults to now)
+            only: optional set of feature names to compute; other features are neither run nor reported
+        Returns:
+            dict of output feature name -> {'value', 'lag'} (or {'value': None, 'lag': None, 'dropped': True})
+        """
+        start = time.time()
+        order = self.order()
+        if only is not None:
+            order = [name for name in order if name in only]
+        run = _Run(self, inputs, capture_time if capture_time is not None else start, order)
+        if self.executor is None:
+            for name in order:
+                node = self.nodes[name]
+                deadline = self._deadline(node)
+                if deadline is not None and time.time() - start > deadline:
+                    continue  # Already late: dropped
+                value, ok = self._compute(run, node)
+                if ok:
+                    run.values[name] = value
+                run.results[name] = {'value': value, 'lag': time.time() - run.capture_time}
+        else:
+            self._submit(run, [name for name in order if run.pending[name] == 0])
+            # Wait for each output feature until its own deadline
+            with run.cond:
+                for name in order:
+                    node = self.nodes[name]
+                    if not node.output:
+                        continue
+                    deadline = self._deadline(node)
+                    while name not in run.results:
+                        remaining = None if deadline is None else start + deadline - time.time()
+                        if remaining is not None and remaining <= 0:
+                            break
+                        run.cond.wait(remaining)
+                run.closed = True
+        observation = {}
+        for name in order:
+            node = self.nodes[name]
+            if name not in run.results:
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+                if node.output:
+                    observation[name] = {'value': None, 'lag': None, 'dropped': True}
+            elif node.output:
+                observation[name] = run.results[name]
+        return observation
@@ -0,0 +1,288 @@
+"""
+registry.py
+
+Feature-extractor registry and per-tick scheduler for perception.
+- Each extractor is registered with its inputs (raw inputs such as 'frame'/'chunk', shared intermediates such
+  as 'gray'/'stft', or other features), a cost class and a target rate: every tick, every N ticks, or on change.
+- FeatureScheduler builds the dependency DAG (features.feature_graph.FeatureGraph), runs only the features that
+  subscribers need and that are due this tick, and enforces a per-tick latency budget: features that do not
+  fit are deferred (their last value is reported as stale) and forced after max_deferrals ticks.
+- Cost estimates start from the cost class and follow measured run times.
+"""
+
+import time
+
+try:
+    from features.feature_graph import FeatureGraph
+except ImportError:  # Running as a script from inside features/
+    from feature_graph import FeatureGraph
+
+# Initial per-call cost estimates (seconds) per cost class, refined by measurement
+COST_CLASSES = {'cheap': 0.001, 'medium': 0.005, 'expensive': 0.05}
+
+
+def check_rate(name, rate, inputs, trigger):
+    """Raise ValueError unless rate/trigger form a valid schedule for a feature with these inputs."""
+    if rate != 'on_change' and (isinstance(rate, bool) or not isinstance(rate, int) or rate < 1):
+        raise ValueError(f"rate of '{name}' must be a positive int or 'on_change', got {rate!r}")
+    if rate == 'on_change' and not trigger:
+        raise ValueError(f"rate 'on_change' of '{name}' needs trigger features (it would never run again)")
+    if any(dep not in inputs for dep in trigger):
+        raise ValueError(f"trigger features of '{name}' must also be among its inputs")
+
+
+class FeatureSpec:
+    def __init__(self, name, fn, inputs=(), cost='medium', rate=1, trigger=(), output=True):
+        """
+        name: feature name (key in observations)
+        fn: extractor, called with the values of inputs in order
+        inputs: raw input names, intermediate names or feature names this extractor consumes
+        cost: 'cheap', 'medium' or 'expensive' (initial estimate for budgeting)
+        rate: 1 (every tick), N (every N ticks) or 'on_change' (when a trigger feature is truthy this tick)
+        trigger: feature names whose truthy value marks a change (for rate='on_change'; must also be inputs)
+        output: report in observations (False for shared intermediates such as grayscale or an STFT)
+        """
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class: {cost}")
+        check_rate(name, rate, inputs, trigger)
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.cost = cost
+        self.rate = rate
+        self.trigger = tuple(trigger)
+        self.output = output
+
+
+class FeatureRegistry:
+    def __init__(self):
+        self.specs = {}
+
+    def register(self, name, fn, inputs=(), cost='medium', rate=1, trigger=(), output=True):
+        """Register an extractor (see FeatureSpec). Returns the spec."""
+        if name in self.specs:
+            raise ValueError(f"Feature '{name}' already registered")
+        spec = FeatureSpec(name, fn, inputs, cost, rate, trigger, output)
+        self.specs[name] = spec
+        return spec
+
+    def feature(self, name, inputs=(), cost='medium', rate=1, trigger=(), output=True):
+        """Decorator form of register."""
+        def decorator(fn):
+            self.register(name, fn, inputs, cost, rate, trigger, output)
+            return fn
+        return decorator
+
+    def get(self, name):
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown feature '{name}' (registered: {', '.join(self.specs)})") from None
+
+    def set_rate(self, name, rate, trigger=None):
+        """
+        Override the rate of a registered feature (before a FeatureScheduler is built on the registry).
+        trigger: trigger features for rate='on_change' (None keeps the registered ones)
+        """
+        spec = self.get(name)
+        trigger = spec.trigger if trigger is None else tuple(trigger)
+        check_rate(name, rate, spec.inputs, trigger)
+        spec.rate = rate
+        spec.trigger = trigger
+
+    def set_rates(self, rates):
+        """Apply {name: rate} or {name: (rate, trigger)} overrides (see set_rate)."""
+        for name, rate in (rates or {}).items():
+            if isinstance(rate, (tuple, list)):
+                self.set_rate(name, *rate)
+            else:
+                self.set_rate(name, rate)
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def __iter__(self):
+        return iter(self.specs.values())
+
+    def order(self):
+        """Specs in dependency order (inputs before the features that consume them)."""
+        graph = FeatureGraph()
+        for spec in self.specs.values():
+            graph.add(spec.name, spec.fn, deps=spec.inputs)
+        return [self.specs[name] for name in graph.order()]
+
+
+class FeatureScheduler:
+    def __init__(self, registry, budget=None, subscriptions=None, executor=None, deadline=None, max_deferrals=5):
+        """
+        registry: FeatureRegistry
+        budget: per-tick latency budget in seconds (None: no budget)
+        subscriptions: feature names consumers use (None: every output feature); their inputs run as needed
+        executor: optional executor to run independent features concurrently (see FeatureGraph)
+        deadline: per-feature deadline in seconds from the start of the tick; features still running are
+                  dropped for that tick (see FeatureGraph; only effective with an executor)
+        max_deferrals: ticks a feature may be deferred by the budget before it is forced to run
+        """
+        self.registry = registry
+        self.budget = budget
+        self.max_deferrals = max_deferrals
+        self.executor = executor
+        self.deadline = deadline
+        self.subscriptions = None if subscriptions is None else set(subscriptions)
+        self.tick = 0
+        self._graph = None
+        self._last = {}  # Feature name -> (value, capture time) of its last computation
+        self._last_tick = {}  # Feature name -> tick it last ran
+        self._deferrals = {}  # Feature name -> consecutive ticks deferred by the budget
+        self._estimates = {spec.name: COST_CLASSES[spec.cost] for spec in registry}
+        self.runs = {}
+        self.deferred = {}
+        self._unchanged = set()  # On-change features not triggered in the current tick
+
+    def subscribe(self, names):
+        """Restrict computed features to names (and whatever they depend on). None subscribes to everything."""
+        self.subscriptions = None if names is None else set(names)
+
+    def _build_graph(self):
+        graph = FeatureGraph(self.executor, default_deadline=self.deadline)
+        for spec in self.registry:
+            fn = spec.fn
+            if spec.rate == 'on_change':
+                fn = self._on_change(spec)
+            graph.add(spec.name, fn, deps=spec.inputs, output=True)
+        return graph
+
+    def _on_change(self, spec):
+        positions = [spec.inputs.index(name) for name in spec.trigger]
+
+        def run_if_changed(*values):
+            if spec.name in self._last and not any(values[i] for i in positions):
+                # Not triggered: pass the last value on to dependents and report it as stale
+                self._unchanged.add(spec.name)
+                return self._last[spec.name][0]
+            return spec.fn(*values)
+        return run_if_changed
+
+    def reset(self):
+        """Forget last values, rate schedule and deferrals (e.g., when a new stream starts). Estimates are kept."""
+        self.tick = 0
+        self._last = {}
+        self._last_tick = {}
+        self._deferrals = {}
+
+    def needed(self):
+        """Feature names required by the subscriptions, including the intermediates they depend on."""
+        roots = [spec.name for spec in self.registry if spec.output] if self.subscriptions is None \
+            else [name for name in self.subscriptions if name in self.registry]
+        needed, stack = set(), list(roots)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            stack.extend(dep for dep in self.registry.get(name).inputs if dep in self.registry)
+        return needed
+
+    def plan(self):
+        """
+        Features to compute this tick, in dependency order: needed, due by rate, and within the budget.
+        A feature is skipped if a dependency was deferred this tick (it would only see stale inputs).
+        """
+        if self._graph is None:
+            self._graph = self._build_graph()
+        needed = self.needed()
+        planned, skipped = [], set()
+        spent = 0.0
+        for name in self._graph.order():
+            if name not in needed:
+                continue
+            spec = self.registry.get(name)
+            last = self._last_tick.get(name)
+            due = last is None or spec.rate == 'on_change' or self.tick - last >= spec.rate
+            if not due:
+                continue
+            if any(dep in skipped for dep in spec.inputs):
+                skipped.add(name)
+                continue
+            estimate = self._estimates[name]
+            forced = name not in self._last or self._deferrals.get(name, 0) >= self.max_deferrals
+            if self.budget is not None and not forced and spent + estimate > self.budget:
+                skipped.add(name)
+                continue
+            planned.append(name)
+            spent += estimate
+        for name in skipped:
+            self._deferrals[name] = self._deferrals.get(name, 0) + 1
+            self.deferred[name] = self.deferred.get(name, 0) + 1
+        return planned
+
+    def run(self, inputs, capture_time=None, precomputed=None, exclude=()):
+        """
+        Run one tick.
+        Args:
+            inputs: raw inputs (e.g., {'frame': frame, 'frame_timestamp': ts})
+            capture_time: time.time() capture timestamp of the inputs (for lag; defaults to now)
+            precomputed: optional {feature name: value} computed elsewhere (e.g., vectorized over a batch); used
+                instead of calling the extractor when the feature is planned this tick, ignored otherwise
+            exclude: feature names neither computed nor reported this tick
+        Returns:
+            dict of feature name -> {'value', 'lag'} for subscribed output features. Features not recomputed this
+            tick report their last value with 'stale': True (lag then counts from that value's capture);
+            features never computed report {'value': None, 'lag': None, 'deferred': True}.
+        """
+        if capture_time is None:
+            capture_time = time.time()
+        precomputed = precomputed or {}
+        planned = [name for name in self.plan() if name not in exclude]
+        graph_inputs = dict(inputs)
+        # Features not recomputed this tick feed their last values to the ones that are
+        for name, (value, _) in self._last.items():
+            if name not in planned:
+                graph_inputs[name] = value
+        supplied = {name: precomputed[name] for name in planned
+                    if name in precomputed and self.registry.get(name).rate != 'on_change'}
+        graph_inputs.update(supplied)
+        self._unchanged = set()
+        results = self._graph.run(graph_inputs, capture_time=capture_time, only=set(planned) - set(supplied))
+        now = time.time()
+        for name, value in supplied.items():
+            results[name] = {'value': value, 'lag': now - capture_time}
+        for name in planned:
+            result = results.get(name)
+            if result is None or result.get('dropped') or name in self._unchanged:
+                continue
+            self._last[name] = (result['value'], capture_time)
+            self._last_tick[name] = self.tick
+            self._deferrals[name] = 0
+            self.runs[name] = self.runs.get(name, 0) + 1
+            measured = None if name in supplied else self._graph.durations.get(name)
+            if measured is not None:
+                self._estimates[name] = 0.8 * self._estimates[name] + 0.2 * measured
+        self.tick += 1
+        now = time.time()
+        observation = {}
+        wanted = self.subscriptions if self.subscriptions is not None else {s.name for s in self.registry if s.output}
+        for name in self._graph.order():
+            spec = self.registry.get(name)
+            if name not in wanted or not spec.output or name in exclude:
+                continue
+            result = results.get(name)
+            if result is not None and (result.get('dropped') or name not in self._unchanged):
+                observation[name] = result  # Fresh, or dropped by its deadline ({'dropped': True})
+            elif name in self._last:
+                value, value_time = self._last[name]
+                observation[name] = {'value': value, 'lag': now - value_time, 'stale': True}
+            else:
+                observation[name] = {'value': None, 'lag': None, 'deferred': True}
+        return observation
+
+    def stats(self):
+        """Per-feature runs, budget deferrals and current cost estimate (ms)."""
+        return {
+            spec.name: {
+                'runs': self.runs.get(spec.name, 0),
+                'deferred': self.deferred.get(spec.name, 0),
+                'estimate_ms': 1000.0 * self._estimates[spec.name],
+            }
+            for spec in self.registry
+        }
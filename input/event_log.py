@@ -0,0 +1,95 @@
+"""
+event_log.py
+
+Compact, bounded, time-indexed store for keyboard/mouse events.
+- Events carry float timestamps (time.time(), clamped to be non-decreasing so the log stays sorted).
+- Events are kept in fixed-size chunks; the oldest chunk is dropped once max_chunks is reached,
+  so memory stays bounded over long sessions with hundreds of mouse moves per second.
+- Range queries use bisect (O(log n + k)); consumers can also read with a cursor and only pay for new events.
+"""
+
+import bisect
+import collections
+import threading
+import time
+
+
+class EventLog:
+    def __init__(self, chunk_size=4096, max_chunks=64):
+        """
+        chunk_size: events per chunk
+        max_chunks: chunks retained (capacity is chunk_size * max_chunks events)
+        """
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        # Each chunk is (first sequence number, [timestamps], [events])
+        self._chunks = collections.deque()
+        self._last_time = float('-inf')
+        self.total_appended = 0  # Sequence number of the next event
+        # Appends come from pynput listener threads, reads from the orchestrator
+        self._lock = threading.Lock()
+
+    def append(self, event_type, data, *extra, timestamp=None):
+        """
+        Record an event as (timestamp, event_type, data, *extra) and return it.
+        timestamp defaults to time.time().
+        """
+        t = time.time() if timestamp is None else timestamp
+        with self._lock:
+            # Keep timestamps non-decreasing (wall clock can step back) so bisect stays valid
+            if t < self._last_time:
+                t = self._last_time
+            self._last_time = t
+            event = (t, event_type, data) + extra
+            if not self._chunks or len(self._chunks[-1][1]) >= self.chunk_size:
+                if len(self._chunks) >= self.max_chunks:
+                    self._chunks.popleft()
+                self._chunks.append((self.total_appended, [], []))
+            _, times, events = self._chunks[-1]
+            times.append(t)
+            events.append(event)
+            self.total_appended += 1
+        return event
+
+    def range(self, start_time, end_time):
+        """Returns events with start_time <= timestamp < end_time, in order."""
+        with self._lock:
+            chunks = list(self._chunks)
+        result = []
+        # First chunk that can contain start_time: last chunk whose first timestamp <= start_time
+        first_times = [times[0] for _, times, _ in chunks]
+        i = max(0, bisect.bisect_right(first_times, start_time) - 1)
+        for _, times, events in chunks[i:]:
+            if times[0] >= end_time:
+                break
+            lo = bisect.bisect_left(times, start_time)
+            hi = bisect.bisect_left(times, end_time)
+            result.extend(events[lo:hi])
+        return result
+
+    def read(self, cursor):
+        """
+        Consumed-cursor read: returns (events appended since cursor, new cursor).
+        Start with cursor=0 (or log.total_appended to skip history). Events that were dropped from the
+        bounded log before being read are skipped.
+        """
+        with self._lock:
+            result = []
+            for first_seq, _, events in self._chunks:
+                if first_seq + len(events) <= cursor:
+                    continue
+                result.extend(events[max(0, cursor - first_seq):])
+            return result, self.total_appended
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(events) for _, _, events in self._chunks)
+
+    def __iter__(self):
+        with self._lock:
+            chunks = list(self._chunks)
+        for _, _, events in chunks:
+            yield from list(events)
+
+    def __repr__(self):
+        return f"EventLog({len(self)} events)"
@@ -12,7 +12,11 @@ Keyboard and mouse input capture and injection for embodied agent using pynput.
 from pynput import keyboard, mouse
 import time
 import os
-from datetime import datetime
+
+try:
+    from input.event_log import EventLog
+except ImportError:  # Running as a script from inside input/
+    from event_log import EventLog
 
 class InputCapture:
     def pause(self):
@@ -21,53 +25,50 @@ class InputCapture:
         if hasattr(self, 'mouse_listener') and self.mouse_listener:
             self.mouse_listener.stop()
         print("[InputCapture] Paused keyboard and mouse listeners.")
-    def __init__(self):
+    def resume(self):
+        # pynput listeners cannot be restarted once stopped: start new ones if listening was active
+        if getattr(self, 'keyboard_listener', None) is not None:
+            self.start_listeners()
+            print("[InputCapture] Resumed keyboard and mouse listeners.")
+    def __init__(self, event_chunk_size=4096, max_event_chunks=64):
         self.keyboard_controller = keyboard.Controller()
         self.mouse_controller = mouse.Controller()
-        self.events = []  # Store captured events
+        # Store captured events: bounded, time-indexed log of (timestamp, type, data[, duration]) tuples
+        self.events = EventLog(chunk_size=event_chunk_size, max_chunks=max_event_chunks)
+        self._event_cursor = 0
         self.key_down_time = {}
         self.button_down_time = {}
         self.current_keys = set()
         self.current_buttons = set()
         self.mouse_position = (0, 0)
-        self.keyboard_controller = keyboard.Controller()
-        self.mouse_controller = mouse.Controller()
-        self.events = []  # Store captured events
 
     # Keyboard event capture
     def on_press(self, key):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         self.key_down_time[key] = time.time()
         self.current_keys.add(key)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        self.events.append((timestamp, 'key_press', str(key)))
+        self.events.append('key_press', str(key))
 
     def on_release(self, key):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         if key in self.key_down_time:
             duration = time.time() - self.key_down_time[key]
-            self.events.append((timestamp, 'key_hold', str(key), duration))
+            self.events.append('key_hold', str(key), duration)
             self.key_down_time.pop(key, None)
         self.current_keys.discard(key)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        self.events.append((timestamp, 'key_release', str(key)))
+        self.events.append('key_release', str(key))
 
     # Mouse event capture
     def on_move(self, x, y):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         self.mouse_position = (x, y)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        self.events.append((timestamp, 'mouse_move', (x, y)))
+        self.events.append('mouse_move', (x, y))
 
     def on_click(self, x, y, button, pressed):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         if pressed:
             self.button_down_time[button] = time.time()
             self.current_buttons.add(button)
         else:
             if button in self.button_down_time:
                 duration = time.time() - self.button_down_time[button]
-                self.events.append((timestamp, 'button_hold', (x, y, str(button)), duration))
+                self.events.append('button_hold', (x, y, str(button)), duration)
                 self.button_down_time.pop(button, None)
             self.current_buttons.discard(button)
     def get_current_state(self):
@@ -81,21 +82,16 @@ class InputCapture:
         return keyboard_state, mouse_state
 
     def get_events_since(self, start_time, end_time):
-        # Returns events that occurred between start_time and end_time
-        filtered_events = [e for e in self.events if start_time <= self._event_time_to_float(e[0]) < end_time]
-        return filtered_events
-
-    def _event_time_to_float(self, timestamp):
-        # Helper to convert timestamp string to float
-        dt = datetime.strptime(timestamp, '%Y%m%d_%H%M%S_%f')
-        return dt.timestamp()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        action = 'mouse_press' if pressed else 'mouse_release'
-        self.events.append((timestamp, action, (x, y, str(button))))
+        # Returns events that occurred between start_time and end_time (bisect over the time-indexed log)
+        return self.events.range(start_time, end_time)
+
+    def get_new_events(self):
+        # Returns events recorded since the previous call (consumed cursor: cost is O(new events))
+        events, self._event_cursor = self.events.read(self._event_cursor)
+        return events
 
     def on_scroll(self, x, y, dx, dy):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        self.events.append((timestamp, 'mouse_scroll', (x, y, dx, dy)))
+        self.events.append('mouse_scroll', (x, y, dx, dy))
 
     def start_listeners(self):
         self.keyboard_listener = keyboard.Listener(
@@ -142,4 +138,4 @@ if __name__ == "__main__":
     capture.move_mouse_horizontal(500)
     # Print captured events
     time.sleep(2)
-    print(capture.events)
+    print(list(capture.events))
@@ -9,9 +9,19 @@ Orchestrates synchronized multi-modal input (visual, audio, keyboard, mouse) for
 import time
 import os
 import numpy as np
-import mss
 from datetime import datetime
 
+try:
+    from input.tick_scheduler import TickScheduler
+except ImportError:  # Running as a script from inside input/
+    from tick_scheduler import TickScheduler
+try:
+    from tracing.tracer import tracer, DEBUG
+except ImportError:  # Running as a script from inside input/
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from tracing.tracer import tracer, DEBUG
+
 class AgentObservation:
     def __init__(self, timestamp, video_frame, audio_chunk, keyboard_state, mouse_state, events):
         self.timestamp = timestamp
@@ -31,44 +41,150 @@ class InputOrchestrator:
         if hasattr(self.input_capture, 'pause'):
             self.input_capture.pause()
         print("[InputOrchestrator] Paused all input capture systems.")
-    def __init__(self, video_capture, audio_capture, input_capture, timestep=1/60):
+
+    def resume(self):
+        """Resume all input capture systems paused by pause()."""
+        for capture in (self.video_capture, self.audio_capture, self.input_capture):
+            if hasattr(capture, 'resume'):
+                capture.resume()
+        print("[InputOrchestrator] Resumed all input capture systems.")
+
+    def __init__(self, video_capture, audio_capture, input_capture, timestep=1/60, save_png=False):
         self.video_capture = video_capture      # e.g., VisualInputCapture instance
         self.audio_capture = audio_capture      # e.g., AudioInputCapture instance
         self.input_capture = input_capture      # e.g., InputCapture instance
         self.timestep = timestep
+        self.save_png = save_png                # Also write each frame to output_dir as PNG (slow)
         self.last_time = time.time()
+        self.scheduler = None                   # TickScheduler of the running stream (see stream_observations)
+        # Graceful degradation: per-modality capture cost (EMA, seconds) and consecutive skips
+        self.capture_budget_fraction = 0.5      # Share of each tick that capture may use
+        self.max_consecutive_skips = 5          # A skipped modality is refreshed at least this often
+        self._stage_cost = {}
+        self._consecutive_skips = {'video': 0, 'audio': 0}
+        self._last_video_frame = None
+        self._last_video_frame_owned = False  # _last_video_frame is a private copy, not a capture ring view
+        self._last_audio_chunk = None
+        self.running = False                    # Capture engines started by start()
+
+    def start(self):
+        """
+        Start background capture engines where available: the VisualInputCapture capture thread and the
+        AudioInputCapture continuous stream, so each tick reads the latest data instead of waiting on capture.
+        """
+        if hasattr(self.video_capture, 'start'):
+            self.video_capture.start()
+        if hasattr(self.audio_capture, 'start_stream'):
+            self.audio_capture.start_stream()
+        self.running = True
+
+    def stop(self):
+        """Stop background capture engines started by start()."""
+        if hasattr(self.video_capture, 'stop'):
+            self.video_capture.stop()
+        if hasattr(self.audio_capture, 'stop_stream'):
+            self.audio_capture.stop_stream()
+        self.running = False
 
-    def get_observation(self):
+    def _get_video_frame(self):
+        # Returns the current frame as an (H, W, 3) RGB uint8 view (no conversion copy), or None
+        if getattr(self.video_capture, 'running', False):
+            # Background capture engine: latest frame in O(1), with its own capture time and sequence number
+            frame, self._video_frame_timestamp, self._video_frame_seq = self.video_capture.get_latest(channels='rgb')
+            return frame
+        if hasattr(self.video_capture, 'get_frame_array'):
+            return self.video_capture.get_frame_array(channels='rgb')
+        video_frame = self.video_capture.get_frame()
+        if video_frame is None:
+            return None
+        # mss ScreenShot: view its raw BGRA memory and reverse channels as a view
+        width, height = video_frame.size
+        return np.frombuffer(video_frame.raw, dtype=np.uint8).reshape((height, width, 4))[:, :, 2::-1]
+
+    def _record_stage(self, stage_times, name, t0):
+        elapsed = time.perf_counter() - t0
+        stage_times[name] = elapsed
+        previous = self._stage_cost.get(name)
+        self._stage_cost[name] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+        if self.scheduler is not None:
+            self.scheduler.record_stage(name, elapsed)
+
+    def plan_skips(self, budget):
+        """
+        Choose modalities to skip this tick so the expected capture cost fits in budget (seconds).
+        The most expensive skippable modality is dropped first, but none is skipped more than
+        max_consecutive_skips ticks in a row. Returns a set like {'video'}.
+        """
+        costs = {name: self._stage_cost.get(name, 0.0) for name in ('video', 'audio', 'input')}
+        skip = set()
+        for name in sorted(('video', 'audio'), key=lambda n: costs[n], reverse=True):
+            if sum(c for n, c in costs.items() if n not in skip) <= budget:
+                break
+            if self._consecutive_skips[name] < self.max_consecutive_skips:
+                skip.add(name)
+        return skip
+
+    def get_observation(self, skip=()):
+        """
+        Capture one synchronized observation.
+        Args:
+            skip: modalities ('video', 'audio') to skip this tick; their previous values are reused
+        """
         now = time.time()
+        monotonic_now = time.monotonic()
         timestamp = datetime.now().isoformat(sep=' ', timespec='microseconds')
+        stage_times = {}
+        for name in self._consecutive_skips:
+            self._consecutive_skips[name] = self._consecutive_skips[name] + 1 if name in skip else 0
         video_frame = None
-        if self.video_capture:
-            video_frame = self.video_capture.get_frame()
-            if video_frame is not None:
-                try:
-                    frame_bytes = video_frame.rgb if hasattr(video_frame, 'rgb') else None
-                except Exception as e:
-                    print(f"[ERROR] Could not access video_frame.rgb: {e}")
-            else:
+        self._video_frame_timestamp = None
+        self._video_frame_seq = None
+        if self.video_capture and 'video' in skip:
+            if self._last_video_frame is not None and not self._last_video_frame_owned:
+                # Reused across ticks while capture keeps filling the ring: keep a copy, not the slot
+                self._last_video_frame = self._last_video_frame.copy()
+                self._last_video_frame_owned = True
+            video_frame = self._last_video_frame
+        elif self.video_capture:
+            t0 = time.perf_counter()
+            try:
+                video_frame = self._get_video_frame()
+            except Exception as e:
+                print(f"[ERROR] Could not capture video frame: {e}")
+            self._record_stage(stage_times, 'video', t0)
+            if video_frame is None:
                 print("[WARN] video_frame is None!")
-        audio_chunk = self.audio_capture.get_one_second_chunk()
+            self._last_video_frame = video_frame
+            self._last_video_frame_owned = False
+        if 'audio' in skip and self._last_audio_chunk is not None:
+            audio_chunk = self._last_audio_chunk
+        else:
+            t0 = time.perf_counter()
+            audio_chunk = self.audio_capture.get_one_second_chunk()
+            self._record_stage(stage_times, 'audio', t0)
+            self._last_audio_chunk = audio_chunk
+        t0 = time.perf_counter()
         keyboard_state, mouse_state = self.input_capture.get_current_state()
-        events = self.input_capture.get_events_since(self.last_time, now)
+        if hasattr(self.input_capture, 'get_new_events'):
+            # Consumed cursor: each tick only pays for events recorded since the previous tick
+            events = self.input_capture.get_new_events()
+        else:
+            events = self.input_capture.get_events_since(self.last_time, now)
+        self._record_stage(stage_times, 'input', t0)
         self.last_time = now
         obs = {}
         # Visual
         if self.video_capture and video_frame is not None:
-            frame_path = os.path.join(self.video_capture.output_dir, f"frame_{timestamp}.png")
-            try:
-                mss.tools.to_png(video_frame.rgb, video_frame.size, output=frame_path)
-                obs['visual_frame_path'] = frame_path
-                # Convert bytes to numpy array with correct shape (height, width, 3)
-                width, height = video_frame.size
-                arr = np.frombuffer(video_frame.rgb, dtype=np.uint8).reshape((height, width, 3))
-                obs['video_frame'] = arr
-            except Exception as e:
-                print(f"[ERROR] Could not save frame or extract bytes: {e}")
-                obs['video_frame'] = None
+            # RGB (H, W, 3) view into the capture ring buffer; copy it to keep it beyond the next few ticks
+            obs['video_frame'] = video_frame
+            if self.save_png:
+                frame_path = os.path.join(self.video_capture.output_dir, f"frame_{timestamp}.png")
+                try:
+                    # cv2 expects BGR: reversing the RGB view gives a BGR view
+                    cv2.imwrite(frame_path, video_frame[:, :, ::-1])
+                    obs['visual_frame_path'] = frame_path
+                except Exception as e:
+                    print(f"[ERROR] Could not save frame: {e}")
         else:
             obs['video_frame'] = None
         # Add shape and dtype for video_frame if present
@@ -79,6 +195,13 @@ class InputOrchestrator:
             obs['video_frame_shape'] = None
             obs['video_frame_dtype'] = None
         obs['timestamp'] = timestamp
+        # Monotonic tick time, comparable with AudioInputCapture.get_range and capture-thread monotonic times
+        obs['monotonic_timestamp'] = monotonic_now
+        obs['stage_times'] = stage_times
+        obs['skipped_modalities'] = sorted(skip)
+        # Capture time and sequence number of the frame (background capture engine only)
+        obs['video_frame_timestamp'] = self._video_frame_timestamp
+        obs['video_frame_seq'] = self._video_frame_seq
         # Store audio as numpy array in memory, serialize for DB
         obs['audio_chunk'] = audio_chunk
         if audio_chunk is not None and isinstance(audio_chunk, np.ndarray):
@@ -90,18 +213,39 @@ class InputOrchestrator:
         obs['keyboard_state'] = keyboard_state
         obs['mouse_state'] = mouse_state
         obs['events'] = events
-        print(f"[DEBUG] Final obs['video_frame'] type: {type(obs['video_frame'])}, length: {len(obs['video_frame']) if obs['video_frame'] is not None else 'NULL'}")
-        print(f"[DEBUG] Final obs['video_frame_shape']: {obs['video_frame_shape']}, obs['video_frame_dtype']: {obs['video_frame_dtype']}")
-        print(f"[DEBUG] Final obs['audio_shape']: {obs['audio_shape']}, obs['audio_dtype']: {obs['audio_dtype']}")
+        if tracer.enabled(DEBUG):
+            tracer.debug('orchestrator.observation', video_frame_shape=obs['video_frame_shape'],
+                         video_frame_dtype=obs['video_frame_dtype'], audio_shape=obs['audio_shape'],
+                         audio_dtype=obs['audio_dtype'], skipped=obs['skipped_modalities'], n_events=len(events),
+                         stage_ms={name: 1000.0 * t for name, t in stage_times.items()})
         return obs
 
-    def stream_observations(self, duration=1.0):
-        end_time = time.time() + duration
+    def stream_observations(self, duration=1.0, degrade=True):
+        """
+        Capture observations at 1/timestep Hz on absolute deadlines (no drift from capture time).
+        If degrade is True, expensive modalities are skipped (previous value reused) when their expected
+        cost would not fit the tick's capture budget, instead of slipping the clock.
+        Timing statistics (missed deadlines, jitter, per-stage timing) are in self.scheduler.stats().
+        The returned observations are kept beyond the capture ring, so each holds its own copy of the frame.
+        Capture engines not already running are started for the stream (see start()) and stopped after it.
+        """
+        started_here = not self.running
+        if started_here:
+            self.start()
+        self.scheduler = TickScheduler(1.0 / self.timestep)
+        end_time = time.monotonic() + duration
         observations = []
-        while time.time() < end_time:
-            obs = self.get_observation()
-            observations.append(obs)
-            time.sleep(self.timestep)
+        try:
+            while time.monotonic() < end_time:
+                self.scheduler.wait()
+                skip = self.plan_skips(self.capture_budget_fraction * self.scheduler.period) if degrade else set()
+                obs = self.get_observation(skip=skip)
+                if isinstance(obs['video_frame'], np.ndarray):
+                    obs['video_frame'] = obs['video_frame'].copy()
+                observations.append(obs)
+        finally:
+            if started_here:
+                self.stop()
         return observations
 
 
@@ -125,28 +269,50 @@ class OnlineAgentRunner:
         self.video_path = video_path
         self.audio_path = audio_path
         self._init_video_writer = False
+        self.scheduler = None
 
-    def run(self, duration=10.0):
-        start_time = time.time()
-        while time.time() - start_time < duration:
-            obs = self.orchestrator.get_observation()
-            # --- Optional: Raw Data Storage ---
-            if self.record_video and obs.get('video_frame') is not None:
-                frame = obs['video_frame']
-                if not self._init_video_writer:
-                    height, width, _ = frame.shape
-                    self.video_writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'XVID'), 1/self.orchestrator.timestep, (width, height))
-                    self._init_video_writer = True
-                self.video_writer.write(frame)
-            if self.record_audio and obs.get('audio_chunk') is not None:
-                self.audio_frames.append(obs['audio_chunk'])
-            # --- Perception and Agent ---
-            features = self.perception_pipeline(obs)
-            self.buffer.append({'timestamp': obs['timestamp'], 'features': features})
-            self.agent.observe(features, buffer=list(self.buffer))
-            # --- Episodic Memory (example: store salient events) ---
-            if hasattr(self.agent, 'is_salient') and self.agent.is_salient(features):
-                self.episodic_memory.append({'timestamp': obs['timestamp'], 'features': features})
+    def run(self, duration=10.0, degrade=True):
+        """
+        Run the observe -> perceive -> agent loop at the orchestrator's tick rate on absolute deadlines.
+        Timing statistics (missed deadlines, jitter, per-stage timing) are in self.scheduler.stats().
+        The orchestrator's capture engines are started for the run (unless already running) and stopped after it.
+        """
+        self.scheduler = TickScheduler(1.0 / self.orchestrator.timestep)
+        self.orchestrator.scheduler = self.scheduler
+        started_here = not self.orchestrator.running
+        if started_here:
+            self.orchestrator.start()
+        end_time = time.monotonic() + duration
+        try:
+            while time.monotonic() < end_time:
+                self.scheduler.wait()
+                skip = set()
+                if degrade:
+                    skip = self.orchestrator.plan_skips(self.orchestrator.capture_budget_fraction * self.scheduler.period)
+                obs = self.orchestrator.get_observation(skip=skip)
+                # --- Optional: Raw Data Storage ---
+                if self.record_video and obs.get('video_frame') is not None:
+                    frame = obs['video_frame']
+                    if not self._init_video_writer:
+                        height, width, _ = frame.shape
+                        self.video_writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'XVID'), 1/self.orchestrator.timestep, (width, height))
+                        self._init_video_writer = True
+                    # Contiguous copy: the observation's frame is a view into the capture ring
+                    self.video_writer.write(frame.copy())
+                if self.record_audio and obs.get('audio_chunk') is not None:
+                    self.audio_frames.append(obs['audio_chunk'])
+                # --- Perception and Agent ---
+                with self.scheduler.stage('perception'):
+                    features = self.perception_pipeline(obs)
+                self.buffer.append({'timestamp': obs['timestamp'], 'features': features})
+                with self.scheduler.stage('agent'):
+                    self.agent.observe(features, buffer=list(self.buffer))
+                # --- Episodic Memory (example: store salient events) ---
+                if hasattr(self.agent, 'is_salient') and self.agent.is_salient(features):
+                    self.episodic_memory.append({'timestamp': obs['timestamp'], 'features': features})
+        finally:
+            if started_here:
+                self.orchestrator.stop()
         # --- Finalize video/audio writing ---
         if self.record_video and self.video_writer is not None:
             self.video_writer.release()
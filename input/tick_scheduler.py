@@ -0,0 +1,107 @@
+"""
+tick_scheduler.py
+
+Deadline-based tick scheduler for the input/agent loop.
+- Ticks are scheduled on absolute monotonic deadlines (start + k * period), so capture/processing time
+  does not add to the period and the loop does not drift.
+- Every tick whose work ends past its deadline counts as a missed deadline (however small the overrun);
+  whole periods overrun are skipped and counted separately (the clock never slips or bursts to catch up).
+- Records tick jitter and per-stage timings for reporting.
+"""
+
+import collections
+import contextlib
+import time
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+class TickScheduler:
+    def __init__(self, rate_hz=60.0, history=600, clock=time.monotonic, sleep=time.sleep):
+        """
+        rate_hz: target tick rate (e.g., 60 Hz)
+        history: number of recent ticks kept for jitter/stage statistics
+        clock, sleep: monotonic time source and sleep function (injectable, e.g., a fake clock in tests)
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.history = history
+        self.next_deadline = None
+        self.tick_start = None
+        self.ticks = 0
+        self.missed_deadlines = 0  # Ticks whose work ended after the next tick's deadline
+        self.skipped_ticks = 0  # Whole periods skipped to get back on schedule
+        self.jitter = collections.deque(maxlen=history)  # Seconds each tick started after its deadline
+        self.stage_times = collections.defaultdict(lambda: collections.deque(maxlen=history))
+
+    def wait(self):
+        """
+        Sleep until the next tick deadline and return the tick's monotonic start time.
+        If the previous tick overran its deadline it is counted as missed; whole periods already past are
+        skipped (and counted in skipped_ticks), so the next tick is aligned to the schedule rather than run late.
+        """
+        now = self.clock()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        elif now > self.next_deadline:
+            self.missed_deadlines += 1
+            skipped = int((now - self.next_deadline) / self.period)
+            self.skipped_ticks += skipped
+            self.next_deadline += skipped * self.period
+        delay = self.next_deadline - now
+        if delay > 0:
+            self.sleep(delay)
+        self.tick_start = self.clock()
+        self.jitter.append(self.tick_start - self.next_deadline)
+        self.next_deadline += self.period
+        self.ticks += 1
+        return self.tick_start
+
+    def remaining(self):
+        """Seconds left in the current tick before the next deadline (negative if overrun)."""
+        if self.next_deadline is None:
+            return self.period
+        return self.next_deadline - self.clock()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a stage of the current tick: `with scheduler.stage('perception'): ...`"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[name].append(time.perf_counter() - t0)
+
+    def record_stage(self, name, seconds):
+        self.stage_times[name].append(seconds)
+
+    def stats(self):
+        """
+        Returns dict with tick count, missed deadlines, skipped ticks, jitter (ms: mean/p95/max) and per-stage timing
+        (ms: mean/p95) over the recent history.
+        """
+        jitter = list(self.jitter)
+        stages = {}
+        for name, times in self.stage_times.items():
+            times = list(times)
+            stages[name] = {
+                'mean_ms': 1000.0 * sum(times) / len(times) if times else None,
+                'p95_ms': 1000.0 * _percentile(times, 95) if times else None,
+            }
+        return {
+            'rate_hz': self.rate_hz,
+            'ticks': self.ticks,
+            'missed_deadlines': self.missed_deadlines,
+            'skipped_ticks': self.skipped_ticks,
+            'jitter_mean_ms': 1000.0 * sum(jitter) / len(jitter) if jitter else None,
+            'jitter_p95_ms': 1000.0 * _percentile(jitter, 95) if jitter else None,
+            'jitter_max_ms': 1000.0 * max(jitter) if jitter else None,
+            'stages': stages,
+        }
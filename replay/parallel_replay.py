@@ -0,0 +1,203 @@
+"""
+parallel_replay.py
+
+Sharded, multi-process replay of recorded sessions through perception.
+- The session is split into contiguous time shards. Each shard starts overlap_seconds early: those warmup
+  frames only rebuild temporal state (previous frames for motion/change, last object detections) and their
+  features are discarded, so shard boundaries produce the same features as one sequential pass.
+  Object detection runs once per detection_interval slot of absolute frame time, so it is in phase across
+  shards as long as the overlap covers one interval (the default overlap is derived from it).
+  Exception: the feature scheduler restarts its tick count at each shard's warmup frame, so features given
+  an every-N-frames rate (visual_options feature_rates) run on a per-shard phase, and a feature_budget
+  defers by measured time; those features can differ from a sequential pass near shard boundaries.
+- Shards fan out to a process pool. Each worker process owns one VisualPerception (and YOLO net) and
+  StreamingAudioPerception, created once and reset between shards, and memory-maps the session itself
+  (only shard bounds cross the process boundary).
+- Per shard, visual and audio feature streams are merged in timestamp order; shards are delivered in order,
+  so the output is one timestamp-ordered stream.
+
+Usage:
+    python -m replay.parallel_replay path/to/session [--workers 8] [--audio]
+"""
+
+import concurrent.futures
+import heapq
+import os
+import time
+import numpy as np
+
+try:
+    from replay.session_reader import SessionReader
+except ImportError:  # Running as a script from inside replay/
+    from session_reader import SessionReader
+
+# Per-process perception state, created by _init_worker for one set of options (rebuilt if they change)
+_worker = {}
+
+
+def plan_shards(frame_times, n_shards, overlap_seconds=1.0):
+    """
+    Split frames into n_shards contiguous time ranges of equal duration.
+    Args:
+        frame_times: sorted frame timestamps (e.g., SessionReader.frame_times)
+        n_shards: number of shards (fewer are returned if some time ranges contain no frames)
+        overlap_seconds: warmup span replayed before each shard's first frame
+    Returns:
+        list of (warmup_start, start, stop) frame index triples; features are kept for [start, stop)
+    """
+    n = len(frame_times)
+    if n == 0:
+        return []
+    t0, t1 = float(frame_times[0]), float(frame_times[-1])
+    edges = np.searchsorted(frame_times, np.linspace(t0, t1, n_shards + 1)[1:-1], side='left')
+    bounds = [0] + [int(e) for e in edges] + [n]
+    shards = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop <= start:
+            continue
+        warmup_start = int(np.searchsorted(frame_times, frame_times[start] - overlap_seconds, side='left'))
+        shards.append((warmup_start, start, stop))
+    return shards
+
+
+def _feature_values(observation, skip=('frame_timestamp', 'chunk_timestamp', 'frame_cache')):
+    # Offline, per-feature lag is meaningless: keep only the values
+    return {name: value['value'] if isinstance(value, dict) and 'value' in value else value
+            for name, value in observation.items() if name not in skip}
+
+
+def _init_worker(options):
+    _close_worker()
+    from visual.perception import VisualPerception
+    _worker['visual'] = VisualPerception(async_detection=False, **options.get('visual_options', {}))
+    _worker['audio'] = None
+    if options.get('audio'):
+        from audio.perception import StreamingAudioPerception
+        _worker['audio'] = StreamingAudioPerception(sample_rate=options['samplerate'])
+    _worker['options'] = options
+
+
+def _close_worker():
+    for name in ('visual', 'audio'):
+        perception = _worker.get(name)
+        if perception is not None and hasattr(perception, 'close'):
+            perception.close()
+    _worker.clear()
+
+
+def _replay_shard(path, shard, options):
+    """
+    Replay one shard in the calling worker process.
+    Returns a timestamp-ordered list of (timestamp, frame index, modality, features).
+    """
+    if _worker.get('options') != options:
+        _init_worker(options)
+    visual, audio = _worker['visual'], _worker['audio']
+    visual.reset()
+    if audio is not None:
+        audio.reset()
+    warmup_start, start, stop = shard
+    batch_size = options.get('batch_size', 16)
+    read_text = options.get('read_text', True)
+    visual_stream = []
+    audio_stream = []
+    with SessionReader(path, prefetch=options.get('prefetch', 8)) as reader:
+        batch = []
+
+        def flush():
+            # Frames are stored as captured (RGB from InputOrchestrator); perception expects BGR
+            frames = [frame[:, :, ::-1] if frame.ndim == 3 else frame for _, _, frame in batch]
+            observations = visual.process_batch(frames, [t for _, t, _ in batch], read_text=read_text)
+            for (i, t, _), obs in zip(batch, observations):
+                if i >= start:
+                    visual_stream.append((t, i, 'visual', _feature_values(obs)))
+            batch.clear()
+
+        previous = None
+        for i, t, frame in reader.iter_frames(warmup_start, stop):
+            batch.append((i, t, frame))
+            if len(batch) >= batch_size:
+                flush()
+            if audio is not None:
+                # Warmup audio also runs, so filter state is settled when the shard starts
+                chunk = reader.audio_range(previous if previous is not None else t - 1.0, t)
+                if len(chunk):
+                    features = _feature_values(audio.process_chunk(chunk, chunk_timestamp=t))
+                    if i >= start:
+                        audio_stream.append((t, i, 'audio', features))
+            previous = t
+        if batch:
+            flush()
+    return list(heapq.merge(visual_stream, audio_stream, key=lambda item: (item[0], item[1])))
+
+
+class ParallelReplay:
+    def __init__(self, path, workers=None, shards_per_worker=2, overlap_seconds=None, audio=False,
+                 read_text=True, batch_size=16, visual_options=None):
+        """
+        path: session directory (replay.session_writer format)
+        workers: worker processes (default: os.cpu_count())
+        shards_per_worker: shards per worker; more shards balance load better but replay more warmup frames
+        overlap_seconds: warmup span before each shard; must cover the longest temporal dependency, so it is
+                         raised to at least the object detection interval (default: that interval, at least 1 s)
+        audio: also run StreamingAudioPerception on the audio between consecutive frames
+        read_text: run OCR (usually the slowest per-frame feature)
+        batch_size: frames per VisualPerception.process_batch call
+        visual_options: extra keyword arguments for VisualPerception (e.g., {'detection_interval': 0.5})
+        """
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        from visual.perception import DEFAULT_DETECTION_INTERVAL
+        detection_interval = (visual_options or {}).get('detection_interval', DEFAULT_DETECTION_INTERVAL)
+        self.overlap_seconds = max(1.0 if overlap_seconds is None else overlap_seconds, detection_interval)
+        with SessionReader(path, prefetch=0) as reader:
+            self.n_frames = len(reader)
+            self.shards = plan_shards(reader.frame_times, self.workers * shards_per_worker, self.overlap_seconds)
+            samplerate = reader.samplerate
+        self.options = {
+            'audio': audio, 'samplerate': samplerate, 'read_text': read_text,
+            'batch_size': batch_size, 'visual_options': visual_options or {},
+        }
+
+    def run(self):
+        """
+        Replay the whole session and yield (timestamp, frame index, modality, features) in timestamp order.
+        Results stream as soon as the earliest outstanding shard completes.
+        """
+        if self.workers == 1:
+            # In-process: no pool, same code path; the perception state lives only for this run
+            try:
+                for shard in self.shards:
+                    yield from _replay_shard(self.path, shard, self.options)
+            finally:
+                _close_worker()
+            return
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.options,)) as pool:
+            futures = [pool.submit(_replay_shard, self.path, shard, self.options) for shard in self.shards]
+            # Shards are contiguous and disjoint in time, so in-order delivery of shard results is a full merge
+            for future in futures:
+                yield from future.result()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a recorded session through perception on a process pool")
+    parser.add_argument('path', help='session directory')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--overlap', type=float, default=None,
+                        help='warmup seconds per shard (default and minimum: the object detection interval)')
+    parser.add_argument('--audio', action='store_true')
+    parser.add_argument('--no-text', action='store_true', help='skip OCR')
+    args = parser.parse_args()
+    replay = ParallelReplay(args.path, workers=args.workers, overlap_seconds=args.overlap,
+                            audio=args.audio, read_text=not args.no_text)
+    print(f"[INFO] Replaying {replay.n_frames} frames in {len(replay.shards)} shards on {replay.workers} workers")
+    t0 = time.perf_counter()
+    count = sum(1 for _, _, modality, _ in replay.run() if modality == 'visual')
+    elapsed = time.perf_counter() - t0
+    print(f"[RESULT] {count} frames in {elapsed:.2f}s ({count / elapsed if elapsed > 0 else 0.0:.1f} frames/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+session_reader.py
+
+Memory-mapped reader for session files written by replay.session_writer.SessionWriter.
+- Frames, audio and index files are memory-mapped read-only; raw frames and audio are returned as zero-copy
+  NumPy views (no .tobytes() copies, no per-frame decode step).
+- Random access by index or by timestamp (binary search over the frame/audio/event timestamp columns).
+- Sequential iteration prefetches ahead on a background thread (madvise(WILLNEED) for raw frames, decoding
+  for encoded frames), so replaying a long session through perception is CPU-bound rather than I/O-bound.
+
+Usage (replay a session through perception and report throughput):
+    python -m replay.session_reader path/to/session [--audio]
+"""
+
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+try:
+    from replay.session_writer import AUDIO_INDEX_DTYPE, EVENT_INDEX_DTYPE, FRAME_INDEX_DTYPE
+except ImportError:  # Running as a script from inside replay/
+    from session_writer import AUDIO_INDEX_DTYPE, EVENT_INDEX_DTYPE, FRAME_INDEX_DTYPE
+
+
+def _map_file(path):
+    # Read-only map of a whole file; None for missing/empty files (mmap cannot map zero bytes)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_records(path, dtype):
+    mapped = _map_file(path)
+    if mapped is None:
+        return None, np.zeros(0, dtype=dtype)
+    return mapped, np.frombuffer(mapped, dtype=dtype, count=len(mapped) // dtype.itemsize)
+
+
+def _event_from_json(values):
+    # JSON turns tuples into lists: restore the (timestamp, event_type, data, *extra) tuple shape
+    return tuple(tuple(v) if isinstance(v, list) else v for v in values)
+
+
+class SessionReader:
+    def __init__(self, path, prefetch=8):
+        """
+        path: session directory written by SessionWriter (open it after the writer has been flushed/closed)
+        prefetch: frames kept ready ahead of the consumer during sequential iteration
+        """
+        self.path = path
+        self.prefetch = prefetch
+        with open(os.path.join(path, 'session.json'), 'r') as f:
+            self.meta = json.load(f)
+        self.samplerate = self.meta['samplerate']
+        self.channels = self.meta['channels']
+        self.encoded = self.meta['frame_codec'] != 'raw'
+        self._maps = []
+        self._frame_map = self._keep(_map_file(os.path.join(path, 'frames.bin')))
+        self._frame_index = self._keep_records('frame_index.bin', FRAME_INDEX_DTYPE)
+        self._frames = None
+        if not self.encoded and self.meta['frame_shape'] is not None and self._frame_map is not None:
+            shape = tuple(self.meta['frame_shape'])
+            dtype = np.dtype(self.meta['frame_dtype'])
+            frame_nbytes = int(np.prod(shape)) * dtype.itemsize
+            # Ignore a trailing partial record (e.g., recorder killed mid-write)
+            count = min(len(self._frame_index), len(self._frame_map) // frame_nbytes)
+            self._frame_index = self._frame_index[:count]
+            self._frames = np.frombuffer(self._frame_map, dtype=dtype, count=count * int(np.prod(shape))).reshape((count,) + shape)
+        self.frame_times = self._frame_index['time']
+        audio_dtype = np.dtype(self.meta['audio_dtype'])
+        self._audio_map = self._keep(_map_file(os.path.join(path, 'audio.bin')))
+        if self._audio_map is not None:
+            n_samples = len(self._audio_map) // (audio_dtype.itemsize * self.channels)
+            self.audio = np.frombuffer(self._audio_map, dtype=audio_dtype, count=n_samples * self.channels).reshape(n_samples, self.channels)
+        else:
+            self.audio = np.zeros((0, self.channels), dtype=audio_dtype)
+        self._audio_index = self._keep_records('audio_index.bin', AUDIO_INDEX_DTYPE)
+        self._events_map = self._keep(_map_file(os.path.join(path, 'events.jsonl')))
+        self._event_index = self._keep_records('event_index.bin', EVENT_INDEX_DTYPE)
+        self.event_times = self._event_index['time']
+
+    def _keep(self, mapped):
+        if mapped is not None:
+            self._maps.append(mapped)
+        return mapped
+
+    def _keep_records(self, name, dtype):
+        mapped, records = _map_records(os.path.join(self.path, name), dtype)
+        self._keep(mapped)
+        return records
+
+    def __len__(self):
+        return len(self._frame_index)
+
+    @property
+    def duration(self):
+        """Seconds between the first and last frame."""
+        return float(self.frame_times[-1] - self.frame_times[0]) if len(self) > 1 else 0.0
+
+    # Frames
+
+    def frame(self, index):
+        """Frame at index: a read-only zero-copy view for raw sessions, a decoded array for encoded ones."""
+        if self._frames is not None:
+            return self._frames[index]
+        record = self._frame_index[index]
+        from encoding.frame_codecs import decode_frame
+        return decode_frame(memoryview(self._frame_map)[record['offset']:record['offset'] + record['length']])
+
+    def index_at(self, timestamp):
+        """Index of the latest frame captured at or before timestamp (0 if timestamp precedes the session)."""
+        return max(0, int(np.searchsorted(self.frame_times, timestamp, side='right')) - 1)
+
+    def frame_at(self, timestamp):
+        """Returns (frame, frame timestamp, index) for the latest frame at or before timestamp."""
+        index = self.index_at(timestamp)
+        return self.frame(index), float(self.frame_times[index]), index
+
+    def _willneed(self, start, stop):
+        # Ask the kernel to read frames [start, stop) ahead asynchronously (Linux/macOS; no-op elsewhere)
+        if not hasattr(self._frame_map, 'madvise') or start >= stop:
+            return
+        first = int(self._frame_index[start]['offset'])
+        last = self._frame_index[stop - 1]
+        end = int(last['offset'] + last['length'])
+        aligned = first - first % mmap.PAGESIZE
+        self._frame_map.madvise(mmap.MADV_WILLNEED, aligned, end - aligned)
+
+    def iter_frames(self, start=0, stop=None, step=1, prefetch=True):
+        """
+        Sequentially yield (index, timestamp, frame) for frames [start, stop) with the given step.
+        With prefetch, a background thread reads (raw) or decodes (encoded) up to self.prefetch frames ahead.
+        """
+        indices = range(start, len(self) if stop is None else min(stop, len(self)), step)
+        if not prefetch or self.prefetch <= 0:
+            for i in indices:
+                yield i, float(self.frame_times[i]), self.frame(i)
+            return
+        ready = queue.Queue(maxsize=self.prefetch)
+        done = object()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                for n, i in enumerate(indices):
+                    if cancelled.is_set():
+                        return
+                    if self._frames is not None and n % self.prefetch == 0 and step == 1:
+                        self._willneed(i, min(i + 2 * self.prefetch, indices.stop))
+                    ready.put((i, float(self.frame_times[i]), self.frame(i)))
+            finally:
+                ready.put(done)
+
+        worker = threading.Thread(target=produce, name="SessionPrefetch", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is done:
+                    return
+                yield item
+        finally:
+            cancelled.set()
+            # Unblock the producer if it is waiting on a full queue
+            while worker.is_alive():
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    worker.join(0.01)
+
+    # Audio
+
+    def sample_index(self, timestamp):
+        """Maps a timestamp to a sample index using the nearest preceding audio block's timestamp."""
+        if len(self._audio_index) == 0:
+            return 0
+        block = max(0, int(np.searchsorted(self._audio_index['time'], timestamp, side='right')) - 1)
+        first_sample, block_time = self._audio_index[block]
+        index = int(first_sample) + int(round((timestamp - block_time) * self.samplerate))
+        return min(max(index, 0), len(self.audio))
+
+    def audio_range(self, t0, t1):
+        """Zero-copy view of the samples captured between t0 and t1, shape (n_samples, channels)."""
+        return self.audio[self.sample_index(t0):self.sample_index(t1)]
+
+    # Events
+
+    def events_range(self, t0, t1):
+        """Input events with t0 <= timestamp < t1, as (timestamp, event_type, data, *extra) tuples."""
+        lo = int(np.searchsorted(self.event_times, t0, side='left'))
+        hi = int(np.searchsorted(self.event_times, t1, side='left'))
+        events = []
+        for record in self._event_index[lo:hi]:
+            line = self._events_map[record['offset']:record['offset'] + record['length']]
+            events.append(_event_from_json(json.loads(line)))
+        return events
+
+    # Replay
+
+    def iter_observations(self, start=0, stop=None, step=1, audio_window=None):
+        """
+        Yield observation dicts for replay through perception: video_frame, video_frame_timestamp,
+        audio_chunk (the audio_window seconds before the frame, or the audio since the previous yielded frame
+        if audio_window is None; one second for the first frame) and events (input events since the previous
+        yielded frame).
+        """
+        previous = None
+        for i, timestamp, frame in self.iter_frames(start, stop, step):
+            # The first frame gets everything recorded before it
+            since = previous if previous is not None else float('-inf')
+            if audio_window is not None:
+                audio_from = timestamp - audio_window
+            else:
+                audio_from = previous if previous is not None else timestamp - 1.0
+            yield {
+                'video_frame': frame,
+                'video_frame_timestamp': timestamp,
+                'video_frame_index': i,
+                'audio_chunk': self.audio_range(audio_from, timestamp),
+                'events': self.events_range(since, timestamp),
+            }
+            previous = timestamp
+
+    def close(self):
+        """Release the memory maps. Views returned earlier must not be used afterwards."""
+        self._frames = None
+        self.audio = None
+        self._frame_index = self._audio_index = self._event_index = None
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # Views still reference the map; it is released when they are garbage collected
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a recorded session through perception")
+    parser.add_argument('path', help='session directory')
+    parser.add_argument('--audio', action='store_true', help='also run AudioPerception on the audio between frames')
+    parser.add_argument('--step', type=int, default=1, help='replay every n-th frame')
+    args = parser.parse_args()
+    from visual.perception import VisualPerception
+    reader = SessionReader(args.path)
+    visual = VisualPerception(async_detection=False)
+    audio = None
+    if args.audio:
+        from audio.perception import AudioPerception
+        audio = AudioPerception(sample_rate=reader.samplerate)
+    print(f"[INFO] Replaying {len(reader)} frames ({reader.duration:.1f}s, codec {reader.meta['frame_codec']})")
+    t0 = time.perf_counter()
+    count = 0
+    for obs in reader.iter_observations(step=args.step):
+        # Session frames are stored as captured (RGB from InputOrchestrator); perception expects BGR
+        visual.process_frame(obs['video_frame'][:, :, ::-1], frame_timestamp=obs['video_frame_timestamp'])
+        if audio is not None and len(obs['audio_chunk']):
+            audio.process_chunk(obs['audio_chunk'], chunk_timestamp=obs['video_frame_timestamp'])
+        count += 1
+    elapsed = time.perf_counter() - t0
+    print(f"[RESULT] {count} frames in {elapsed:.2f}s ({count / elapsed if elapsed > 0 else 0.0:.1f} frames/s)")
+    visual.close()
+    reader.close()
+
+if __name__ == "__main__":
+    main()
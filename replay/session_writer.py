@@ -0,0 +1,150 @@
+"""
+session_writer.py
+
+Append-only session file format for recorded observations, designed for memory-mapped replay.
+A session is a directory:
+- session.json: frame shape/dtype/codec and audio samplerate/channels/dtype
+- frames.bin + frame_index.bin: frame payloads (raw arrays, or bytes from a stateless encoding.frame_codecs codec)
+  and fixed-size index records (timestamp, offset, length)
+- audio.bin + audio_index.bin: continuous raw samples and one index record (first sample index, timestamp)
+  per written block
+- events.jsonl + event_index.bin: one JSON line per input event and index records (timestamp, offset, length)
+Timestamps are time.time() seconds (the clock of frame capture times and input events).
+Read sessions back with replay.session_reader.SessionReader.
+"""
+
+import json
+import os
+from datetime import datetime
+import numpy as np
+
+SESSION_VERSION = 1
+FRAME_INDEX_DTYPE = np.dtype([('time', '<f8'), ('offset', '<i8'), ('length', '<i8')])
+AUDIO_INDEX_DTYPE = np.dtype([('sample', '<i8'), ('time', '<f8')])
+EVENT_INDEX_DTYPE = np.dtype([('time', '<f8'), ('offset', '<i8'), ('length', '<i8')])
+
+
+def _wall_time(timestamp):
+    # Observation timestamps are ISO strings (InputOrchestrator) or floats (capture engines)
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class SessionWriter:
+    def __init__(self, path, frame_codec=None, samplerate=44100, channels=2, audio_dtype='int16', codec_options=None):
+        """
+        path: session directory (created if missing; an existing session is appended to)
+        frame_codec: None to store raw frames (zero-copy replay), or a stateless encoding.frame_codecs codec name
+                     ('png', 'jpeg', 'webp'); stateful codecs are rejected because replay needs random access
+        samplerate/channels/audio_dtype: format of the continuous audio written with write_audio
+        codec_options: keyword arguments for the frame codec constructor
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.codec = None
+        if frame_codec not in (None, 'raw'):
+            from encoding.frame_codecs import get_frame_codec
+            self.codec = get_frame_codec(frame_codec, **(codec_options or {}))
+            if self.codec.stateful:
+                raise ValueError(f"Frame codec '{frame_codec}' is stateful; session files need random access")
+        self._meta_path = os.path.join(path, 'session.json')
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, 'r') as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {
+                'version': SESSION_VERSION,
+                'frame_shape': None, 'frame_dtype': None, 'frame_codec': self.codec.name if self.codec else 'raw',
+                'samplerate': samplerate, 'channels': channels, 'audio_dtype': str(np.dtype(audio_dtype)),
+            }
+            self._save_meta()
+        self._files = {name: open(os.path.join(path, name), 'ab') for name in (
+            'frames.bin', 'frame_index.bin', 'audio.bin', 'audio_index.bin', 'events.jsonl', 'event_index.bin')}
+        self._audio_samples = self._files['audio.bin'].tell() // (
+            np.dtype(self.meta['audio_dtype']).itemsize * self.meta['channels'])
+        self.frames_written = self._files['frame_index.bin'].tell() // FRAME_INDEX_DTYPE.itemsize
+        self.events_written = self._files['event_index.bin'].tell() // EVENT_INDEX_DTYPE.itemsize
+
+    def _save_meta(self):
+        with open(self._meta_path, 'w') as f:
+            json.dump(self.meta, f, indent=2)
+
+    def write_frame(self, frame, timestamp):
+        """
+        Append a frame (numpy array, H x W x C). All raw frames of a session must share one shape and dtype.
+        timestamp: capture time (time.time() seconds, datetime or ISO string)
+        """
+        if self.meta['frame_shape'] is None:
+            self.meta['frame_shape'] = list(frame.shape)
+            self.meta['frame_dtype'] = str(frame.dtype)
+            self._save_meta()
+        elif self.codec is None and (list(frame.shape) != self.meta['frame_shape'] or str(frame.dtype) != self.meta['frame_dtype']):
+            raise ValueError(f"Frame shape {frame.shape}/{frame.dtype} differs from the session's "
+                             f"{tuple(self.meta['frame_shape'])}/{self.meta['frame_dtype']}")
+        data = self.codec.encode(frame) if self.codec is not None else memoryview(np.ascontiguousarray(frame)).cast('B')
+        frames = self._files['frames.bin']
+        offset = frames.tell()
+        frames.write(data)
+        record = np.array([(_wall_time(timestamp), offset, len(data))], dtype=FRAME_INDEX_DTYPE)
+        self._files['frame_index.bin'].write(record.tobytes())
+        self.frames_written += 1
+
+    def write_audio(self, block, timestamp):
+        """
+        Append a block of continuous audio (n_samples, channels).
+        timestamp: capture time of the block's first sample (time.time() seconds, datetime or ISO string)
+        """
+        block = np.ascontiguousarray(block, dtype=self.meta['audio_dtype'])
+        if block.ndim != 2 or block.shape[1] != self.meta['channels']:
+            raise ValueError(f"Audio block shape {block.shape} does not match {self.meta['channels']} channels")
+        if len(block) == 0:
+            return
+        record = np.array([(self._audio_samples, _wall_time(timestamp))], dtype=AUDIO_INDEX_DTYPE)
+        self._files['audio.bin'].write(block.tobytes())
+        self._files['audio_index.bin'].write(record.tobytes())
+        self._audio_samples += len(block)
+
+    def write_events(self, events):
+        """Append input events as recorded by InputCapture: tuples (timestamp, event_type, data, *extra)."""
+        jsonl = self._files['events.jsonl']
+        records = []
+        for event in events:
+            line = (json.dumps(list(event)) + '\n').encode('utf-8')
+            records.append((float(event[0]), jsonl.tell(), len(line)))
+            jsonl.write(line)
+        if records:
+            self._files['event_index.bin'].write(np.array(records, dtype=EVENT_INDEX_DTYPE).tobytes())
+            self.events_written += len(records)
+
+    def write_observation(self, observation, audio_block=None, audio_timestamp=None):
+        """
+        Append the frame and input events of an InputOrchestrator observation.
+        Observations carry overlapping one-second audio chunks, so audio is not taken from them: pass the new
+        samples since the previous observation as audio_block (e.g., from AudioInputCapture.get_range).
+        """
+        frame = observation.get('video_frame')
+        if isinstance(frame, np.ndarray):
+            timestamp = observation.get('video_frame_timestamp') or observation['timestamp']
+            self.write_frame(frame, timestamp)
+        if observation.get('events'):
+            self.write_events(observation['events'])
+        if audio_block is not None:
+            self.write_audio(audio_block, audio_timestamp if audio_timestamp is not None else observation['timestamp'])
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
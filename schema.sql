@@ -1,10 +1,19 @@
 -- PostgreSQL schema for agent observations with TimescaleDB
+-- Idempotent: safe to re-apply to an existing database, which also migrates it (see the end of the file)
 
-CREATE TABLE agent_observations (
+CREATE TABLE IF NOT EXISTS agent_observations (
     id SERIAL,
     timestamp TIMESTAMPTZ NOT NULL,
+    -- Raw payloads: either inline BYTEA (legacy) or a reference into the on-disk blob store
+    -- (db/blob_store.py) as {"segment", "offset", "length", "shape", "dtype", "digest"}
     video_frame BYTEA,
+    video_frame_shape JSONB,
+    video_frame_dtype TEXT,
+    video_frame_ref JSONB,
     audio_chunk BYTEA,
+    audio_shape JSONB,
+    audio_dtype TEXT,
+    audio_chunk_ref JSONB,
     keyboard_state JSONB,
     mouse_state JSONB,
     events JSONB,
@@ -22,4 +31,14 @@ CREATE TABLE agent_observations (
 );
 
 -- Convert to TimescaleDB hypertable
-SELECT create_hypertable('agent_observations', 'timestamp');
\ No newline at end of file
+SELECT create_hypertable('agent_observations', 'timestamp', if_not_exists => TRUE);
+
+-- Migrations for tables created by earlier versions of this file
+-- Payload shape/dtype and blob store references (db/db_insert.py OBSERVATION_COLUMNS always writes them)
+ALTER TABLE agent_observations
+    ADD COLUMN IF NOT EXISTS video_frame_shape JSONB,
+    ADD COLUMN IF NOT EXISTS video_frame_dtype TEXT,
+    ADD COLUMN IF NOT EXISTS video_frame_ref JSONB,
+    ADD COLUMN IF NOT EXISTS audio_shape JSONB,
+    ADD COLUMN IF NOT EXISTS audio_dtype TEXT,
+    ADD COLUMN IF NOT EXISTS audio_chunk_ref JSONB;
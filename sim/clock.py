@@ -0,0 +1,35 @@
+"""
+clock.py
+
+Virtual clock for the simulated environment.
+- Time only moves when the loop advances it, so a simulated session runs as fast as the code allows
+  (or slower than real time under a debugger) while every component sees the same, deterministic timestamps.
+- time() is epoch-like (starts at the wall clock when created) so lag computations stay meaningful;
+  monotonic() counts from zero.
+"""
+
+import time as _time
+
+
+class SimClock:
+    def __init__(self, start=None):
+        """
+        start: epoch seconds at simulated time zero (default: wall clock now)
+        """
+        self.start = _time.time() if start is None else start
+        self.elapsed = 0.0
+
+    def advance(self, seconds):
+        """Move simulated time forward; returns the new time()."""
+        if seconds < 0:
+            raise ValueError("SimClock cannot go backwards")
+        self.elapsed += seconds
+        return self.time()
+
+    def time(self):
+        """Simulated time.time()."""
+        return self.start + self.elapsed
+
+    def monotonic(self):
+        """Simulated time.monotonic() (seconds since the clock was created)."""
+        return self.elapsed
@@ -0,0 +1,139 @@
+"""
+scripted_input.py
+
+Scripted keyboard/mouse input for the simulated environment (no pynput, no display).
+- ScriptedInputCapture follows InputCapture's observation interface (get_current_state, get_new_events,
+  get_events_since) over the same EventLog, with timestamps from a SimClock.
+- A script of (time, event, data) entries is replayed as simulated time reaches each entry, standing in for
+  a human at the keyboard.
+- SimKeyboard/SimMouse are controllers for AgentEnvInterface/ActionExecutor: injected actions are recorded
+  as input events, closing the agent -> environment -> observation loop.
+"""
+
+import bisect
+
+try:
+    from input.event_log import EventLog
+except ImportError:  # Running as a script from inside sim/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from input.event_log import EventLog
+
+
+class ScriptedInputCapture:
+    def __init__(self, clock, script=(), event_chunk_size=4096, max_event_chunks=64):
+        """
+        clock: SimClock providing timestamps
+        script: iterable of (seconds since start, event, data) with event one of
+            'key_press', 'key_release' (data: key name), 'mouse_move' (data: (x, y)),
+            'button_press', 'button_release' (data: button name)
+        """
+        self.clock = clock
+        self.script = sorted(script, key=lambda entry: entry[0])
+        self._script_times = [entry[0] for entry in self.script]
+        self._script_pos = 0
+        self.events = EventLog(chunk_size=event_chunk_size, max_chunks=max_event_chunks)
+        self._event_cursor = 0
+        self.key_down_time = {}
+        self.button_down_time = {}
+        self.mouse_position = (0, 0)
+        self.paused = False
+
+    def _play_script(self):
+        # Replay script entries whose time has come
+        end = bisect.bisect_right(self._script_times, self.clock.monotonic())
+        for _, event, data in self.script[self._script_pos:end]:
+            self.inject(event, data)
+        self._script_pos = max(self._script_pos, end)
+
+    def inject(self, event, data):
+        """Record an input event at the current simulated time, updating held keys/buttons like InputCapture."""
+        if self.paused:
+            return
+        now = self.clock.time()
+        if event == 'key_press':
+            self.key_down_time.setdefault(data, now)
+            self.events.append('key_press', str(data), timestamp=now)
+        elif event == 'key_release':
+            if data in self.key_down_time:
+                self.events.append('key_hold', str(data), now - self.key_down_time.pop(data), timestamp=now)
+            self.events.append('key_release', str(data), timestamp=now)
+        elif event == 'mouse_move':
+            self.mouse_position = tuple(data)
+            self.events.append('mouse_move', self.mouse_position, timestamp=now)
+        elif event == 'button_press':
+            self.button_down_time.setdefault(data, now)
+        elif event == 'button_release':
+            if data in self.button_down_time:
+                duration = now - self.button_down_time.pop(data)
+                self.events.append('button_hold', self.mouse_position + (str(data),), duration, timestamp=now)
+        else:
+            raise ValueError(f"Unknown scripted event: {event}")
+
+    def get_current_state(self):
+        self._play_script()
+        now = self.clock.time()
+        keyboard_state = {str(key): now - t for key, t in self.key_down_time.items()}
+        mouse_state = {
+            'buttons': {str(button): now - t for button, t in self.button_down_time.items()},
+            'position': self.mouse_position,
+        }
+        return keyboard_state, mouse_state
+
+    def get_events_since(self, start_time, end_time):
+        self._play_script()
+        return self.events.range(start_time, end_time)
+
+    def get_new_events(self):
+        self._play_script()
+        events, self._event_cursor = self.events.read(self._event_cursor)
+        return events
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+
+class SimKeyboard:
+    """Keyboard controller (press/release) that records into a ScriptedInputCapture."""
+    def __init__(self, input_capture):
+        self.input_capture = input_capture
+
+    def press(self, key):
+        self.input_capture.inject('key_press', key)
+
+    def release(self, key):
+        self.input_capture.inject('key_release', key)
+
+
+class SimMouse:
+    """Mouse controller (move/press/release/click) that records into a ScriptedInputCapture."""
+    def __init__(self, input_capture, width=None, height=None):
+        """
+        width, height: screen size to clamp the pointer to (None: unclamped)
+        """
+        self.input_capture = input_capture
+        self.width = width
+        self.height = height
+
+    def move(self, dx, dy):
+        x, y = self.input_capture.mouse_position
+        x, y = x + dx, y + dy
+        if self.width is not None:
+            x = min(max(x, 0), self.width - 1)
+        if self.height is not None:
+            y = min(max(y, 0), self.height - 1)
+        self.input_capture.inject('mouse_move', (x, y))
+
+    def press(self, button):
+        self.input_capture.inject('button_press', button)
+
+    def release(self, button):
+        self.input_capture.inject('button_release', button)
+
+    def click(self, button):
+        self.press(button)
+        self.release(button)
@@ -0,0 +1,162 @@
+"""
+simulated_env.py
+
+Headless simulated environment for end-to-end runs and throughput benchmarks.
+- Wires the real InputOrchestrator -> perception -> agent -> AgentEnvInterface loop to synthetic backends:
+  procedural frames/audio (synthetic_capture), scripted input and simulated controllers (scripted_input),
+  and a scripted window manager (window_manager), all on one virtual SimClock.
+- The loop advances simulated time by one timestep per tick without sleeping, so it runs as fast as the
+  pipeline allows (faster than real time) and is deterministic for a given seed and agent.
+- Reports ticks/s, the real-time factor and per-stage timings (TickScheduler statistics).
+
+Usage:
+    python -m sim.simulated_env [--steps 200]
+"""
+
+import time
+
+try:
+    from sim.clock import SimClock
+    from sim.synthetic_capture import SyntheticVisualCapture, SyntheticAudioCapture
+    from sim.scripted_input import ScriptedInputCapture, SimKeyboard, SimMouse
+    from sim.window_manager import SimulatedWindowManager
+except ImportError:  # Running as a script from inside sim/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from sim.clock import SimClock
+    from sim.synthetic_capture import SyntheticVisualCapture, SyntheticAudioCapture
+    from sim.scripted_input import ScriptedInputCapture, SimKeyboard, SimMouse
+    from sim.window_manager import SimulatedWindowManager
+from input.input_orchestrator import InputOrchestrator
+from input.tick_scheduler import TickScheduler
+from agent_env_interface.agent_env_interface import AgentEnvInterface
+from agent.simple_agent import SimpleAgent
+
+SIM_BUTTONS = {'left': 'left', 'right': 'right', 'middle': 'middle'}
+
+
+class SimulatedEnvironment:
+    def __init__(self, agent=None, timestep=1/20, width=320, height=180, samplerate=16000, channels=2,
+                 input_script=(), unfocused=(), visual=True, audio=True, subscriptions=None, seed=0):
+        """
+        agent: object with act(observation) -> list of actions (default: SimpleAgent)
+        timestep: simulated seconds per tick
+        width, height: synthetic frame size
+        samplerate, channels: synthetic audio format
+        input_script: scripted human input, see ScriptedInputCapture
+        unfocused: (start, end) simulated-time intervals during which the game window is not focused
+        visual, audio: run visual/audio perception on each observation
+        subscriptions: perception features to compute; None (default) computes all, 'agent' uses the agent's
+            feature_subscriptions if it declares them (else all). SimpleAgent declares none, so 'agent' turns
+            perception off for it: use it to measure the loop with only the features an agent reads
+        seed: seed of the synthetic scene and audio noise
+        """
+        self.agent = agent if agent is not None else SimpleAgent()
+        self.timestep = timestep
+        self.clock = SimClock()
+        self.video_capture = SyntheticVisualCapture(self.clock, width, height, frame_rate=round(1 / timestep), seed=seed)
+        self.audio_capture = SyntheticAudioCapture(self.clock, samplerate, channels, seed=seed)
+        self.input_capture = ScriptedInputCapture(self.clock, input_script)
+        self.window_manager = SimulatedWindowManager(self.clock, unfocused)
+        self.orchestrator = InputOrchestrator(self.video_capture, self.audio_capture, self.input_capture, timestep=timestep)
+        self.interface = AgentEnvInterface(
+            self.orchestrator, self.window_manager,
+            keyboard=SimKeyboard(self.input_capture),
+            mouse=SimMouse(self.input_capture, width, height),
+            button_map=SIM_BUTTONS,
+        )
+        if subscriptions == 'agent':
+            subscriptions = getattr(self.agent, 'feature_subscriptions', None)
+        self.visual = None
+        self.audio = None
+        if visual:
+            from visual.perception import VisualPerception
+            self.visual = VisualPerception(async_detection=False, subscriptions=subscriptions)
+        if audio:
+            from audio.perception import AudioPerception
+            self.audio = AudioPerception(sample_rate=samplerate, subscriptions=subscriptions)
+        self.scheduler = TickScheduler(1.0 / timestep)
+        self.orchestrator.scheduler = self.scheduler  # Capture stages are recorded alongside perception/agent
+        self.paused_ticks = 0
+        self.actions_sent = 0
+
+    def step(self):
+        """
+        Advance simulated time by one timestep and run one observe -> perceive -> act iteration.
+        Returns the perception features passed to the agent, or None if the game was not focused.
+        """
+        self.clock.advance(self.timestep)
+        self.scheduler.ticks += 1  # Ticks are driven by the virtual clock, not TickScheduler.wait()
+        self.interface.check_focus()
+        if self.interface.paused:
+            self.paused_ticks += 1
+            return None
+        with self.scheduler.stage('capture'):
+            obs = self.interface.get_observation()
+        capture_time = self.clock.time()
+        features = {'timestamp': obs['timestamp'], 'events': obs['events'],
+                    'keyboard_state': obs['keyboard_state'], 'mouse_state': obs['mouse_state']}
+        if self.visual is not None and obs['video_frame'] is not None:
+            with self.scheduler.stage('visual_perception'):
+                features['visual'] = self.visual.process_frame(obs['video_frame'], capture_time)
+        if self.audio is not None and obs['audio_chunk'] is not None:
+            with self.scheduler.stage('audio_perception'):
+                features['audio'] = self.audio.process_chunk(obs['audio_chunk'], capture_time)
+        with self.scheduler.stage('agent'):
+            actions = self.agent.act(features)
+        with self.scheduler.stage('dispatch'):
+            if self.interface.send_actions(actions):
+                self.actions_sent += len(actions)
+        return features
+
+    def run(self, steps):
+        """Run steps ticks as fast as possible and return stats()."""
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            self.step()
+        self.interface.executor.wait_idle(1.0)
+        self.wall_seconds = time.perf_counter() - t0
+        return self.stats()
+
+    def stats(self):
+        """
+        Returns dict with ticks, wall time, ticks/s, real-time factor (simulated seconds per wall second),
+        paused ticks, actions sent/dispatched, dispatch latency and per-stage timing (ms: mean/p95).
+        """
+        wall = getattr(self, 'wall_seconds', None)
+        ticks = self.scheduler.ticks
+        dispatch = self.interface.executor.stats()
+        return {
+            'ticks': ticks,
+            'simulated_seconds': self.clock.monotonic(),
+            'wall_seconds': wall,
+            'ticks_per_s': ticks / wall if wall else None,
+            'realtime_factor': self.clock.monotonic() / wall if wall else None,
+            'paused_ticks': self.paused_ticks,
+            'actions_sent': self.actions_sent,
+            'actions_dispatched': dispatch['dispatched'],
+            'dispatch_latency_p95_ms': dispatch['latency_p95_ms'],
+            'stages': self.scheduler.stats()['stages'],
+        }
+
+    def close(self):
+        self.interface.close()
+        if self.visual is not None:
+            self.visual.close()
+        if self.audio is not None:
+            self.audio.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args()
+    env = SimulatedEnvironment()
+    stats = env.run(args.steps)
+    env.close()
+    print(f"[INFO] {stats['ticks']} ticks in {stats['wall_seconds']:.2f}s: {stats['ticks_per_s']:.1f} ticks/s, "
+          f"{stats['realtime_factor']:.1f}x real time")
+    for name, stage in stats['stages'].items():
+        print(f"  {name}: mean {stage['mean_ms']:.2f} ms, p95 {stage['p95_ms']:.2f} ms")
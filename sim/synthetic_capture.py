@@ -0,0 +1,132 @@
+"""
+synthetic_capture.py
+
+Deterministic, procedural stand-ins for VisualInputCapture and AudioInputCapture (no display, no sound device).
+- Frames: a textured background with a bright square moving across it, rendered into a preallocated FrameRing
+  like the real capture; frame content depends only on the simulated time and the seed.
+- Audio: a sum of sine tones (plus seeded noise), phase-continuous across reads, as int16 like sounddevice.
+- Both follow the capture interface used by InputOrchestrator (get_frame_array / get_one_second_chunk,
+  pause/resume), driven by a SimClock.
+"""
+
+import numpy as np
+
+try:
+    from visual.visual_capture import FrameRing, channel_view
+except ImportError:  # Running as a script from inside sim/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from visual.visual_capture import FrameRing, channel_view
+
+
+class SyntheticVisualCapture:
+    def __init__(self, clock, width=320, height=180, frame_rate=20, seed=0, square_size=24, speed=80.0,
+                 output_dir=None, ring_size=4):
+        """
+        clock: SimClock providing the simulated time
+        width, height: frame size in pixels
+        frame_rate: frames per second; the frame shown at time t is frame int(t * frame_rate)
+        seed: seed of the background texture
+        square_size: side of the moving square (pixels)
+        speed: horizontal speed of the square (pixels per second)
+        output_dir: unused (kept for interface compatibility with VisualInputCapture)
+        ring_size: number of preallocated frame buffers
+        """
+        self.clock = clock
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.square_size = square_size
+        self.speed = speed
+        self.output_dir = output_dir
+        self.paused = False
+        self.frames_rendered = 0
+        rng = np.random.default_rng(seed)
+        background = rng.integers(0, 160, (height, width, 4), dtype=np.uint8)
+        background[:, :, 3] = 255
+        self._background = background
+        self._ring = FrameRing(height, width, size=ring_size)
+        self._rendered_index = None
+
+    def frame_index(self):
+        return int(self.clock.monotonic() * self.frame_rate)
+
+    def _render(self, index):
+        slot = self._ring.fill(self._background)
+        x = int(index / self.frame_rate * self.speed) % max(1, self.width - self.square_size)
+        y = (self.height - self.square_size) // 2
+        slot[y:y + self.square_size, x:x + self.square_size, :3] = 255
+        self.frames_rendered += 1
+        return slot
+
+    def get_frame_array(self, channels='bgr'):
+        """
+        Current frame as a (H, W, C) uint8 view into the ring (see VisualInputCapture.get_frame_array).
+        A frame is rendered once per frame_rate period; repeated calls within it return the same slot.
+        """
+        if self.paused:
+            return None
+        index = self.frame_index()
+        if index != self._rendered_index:
+            self._render(index)
+            self._rendered_index = index
+        return channel_view(self._ring.latest(), channels)
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+
+class SyntheticAudioCapture:
+    def __init__(self, clock, samplerate=16000, channels=2, tones=((220.0, 0.3), (880.0, 0.1)), noise=0.01,
+                 seed=0, segment_duration=0.02, output_dir=None):
+        """
+        clock: SimClock providing the simulated time
+        samplerate: sample rate (Hz)
+        channels: channel count; channel c is attenuated by 1 / (c + 1) so the signal is lateralized
+        tones: (frequency in Hz, amplitude in [0, 1]) pairs
+        noise: amplitude of seeded white noise
+        segment_duration: unused default segment length (kept for interface compatibility)
+        output_dir: unused (kept for interface compatibility with AudioInputCapture)
+        """
+        self.clock = clock
+        self.samplerate = samplerate
+        self.channels = channels
+        self.tones = tuple(tones)
+        self.noise = noise
+        self.seed = seed
+        self.segment_duration = segment_duration
+        self.output_dir = output_dir
+        self.paused = False
+        self._gains = (1.0 / np.arange(1, channels + 1)).astype(np.float32)
+
+    def samples(self, first, n_samples):
+        """Samples [first, first + n_samples) of the infinite synthetic signal as (n_samples, channels) int16."""
+        t = (np.arange(first, first + n_samples, dtype=np.float64) / self.samplerate)
+        signal = np.zeros(n_samples, dtype=np.float32)
+        for freq, amplitude in self.tones:
+            signal += amplitude * np.sin(2 * np.pi * freq * t).astype(np.float32)
+        if self.noise:
+            rng = np.random.default_rng((self.seed, first & 0xFFFFFFFF))
+            signal += self.noise * rng.standard_normal(n_samples, dtype=np.float32)
+        audio = np.clip(signal[:, None] * self._gains[None, :], -1.0, 1.0)
+        return (audio * 32767).astype(np.int16)
+
+    def get_chunk(self, num_samples):
+        """The num_samples ending at the current simulated time (zeros if paused)."""
+        if self.paused:
+            return np.zeros((num_samples, self.channels), dtype='int16')
+        end = int(round(self.clock.monotonic() * self.samplerate))
+        return self.samples(end - num_samples, num_samples)
+
+    def get_one_second_chunk(self):
+        return self.get_chunk(self.samplerate)
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
@@ -0,0 +1,22 @@
+"""
+window_manager.py
+
+Simulated window manager: answers is_focused() from a script of unfocused intervals in simulated time,
+so focus loss/regain (orchestrator pause/resume, held-key release) can be exercised headless.
+"""
+
+
+class SimulatedWindowManager:
+    def __init__(self, clock, unfocused=()):
+        """
+        clock: SimClock providing the simulated time
+        unfocused: (start, end) intervals in seconds since the start during which the game is not focused
+        """
+        self.clock = clock
+        self.unfocused = [tuple(interval) for interval in unfocused]
+        self.checks = 0
+
+    def is_focused(self):
+        self.checks += 1
+        t = self.clock.monotonic()
+        return not any(start <= t < end for start, end in self.unfocused)
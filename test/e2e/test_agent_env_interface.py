@@ -13,6 +13,7 @@ from input.input_orchestrator import InputOrchestrator
 from visual.visual_capture import VisualInputCapture
 from audio.audio_capture import AudioInputCapture
 from input.input_capture import InputCapture
+from agent_env_interface.focus_tracker import FocusTracker, XlibFocusBackend
 
 
 # Real window manager using wmctrl
@@ -83,18 +84,25 @@ def run_agent_env_interface_test(duration=5.0, timestep=1/10):
     input_capture = InputCapture()
     orchestrator = InputOrchestrator(video_capture, audio_capture, input_capture, timestep=timestep)
     # Use the window ID for derek@derek-Precision-3520: ~
-    window_manager = RealWindowManager(target_id="0x3e00004")
+    # Event-driven focus tracking: one X connection, no xprop subprocess per check
+    window_manager = FocusTracker(XlibFocusBackend(), target_id="0x3e00004")
     interface = AgentEnvInterface(orchestrator, window_manager)
 
     print(f"Starting agent-environment interface test for {duration} seconds...")
+    # Capture thread and continuous audio stream: each tick reads the latest data instead of waiting on capture
+    orchestrator.start()
     start_time = time.time()
     step_count = 0
-    while time.time() - start_time < duration:
-        obs = interface.get_observation()
-        action = random_action()
-        interface.send_action(action)
-        step_count += 1
-        time.sleep(timestep)
+    try:
+        while time.time() - start_time < duration:
+            obs = interface.get_observation()
+            action = random_action()
+            interface.send_action(action)
+            step_count += 1
+            time.sleep(timestep)
+    finally:
+        orchestrator.stop()
+        window_manager.stop()
     print(f"Test complete. {step_count} steps executed.")
 
 if __name__ == "__main__":
@@ -23,18 +23,24 @@ def run_full_system_e2e(duration=3.0, timestep=1/10):
     interface = AgentEnvInterface(orchestrator, DummyWindowManager())
     agent = SimpleAgent()
     print("Starting full system E2E test...")
+    orchestrator.start()  # Capture thread and continuous audio stream
     start_time = time.time()
     step = 0
-    while time.time() - start_time < duration:
-        obs = interface.get_observation()
-        actions = agent.act(obs)
-        for action in actions:
-            # Only print keyboard and mouse actions
-            if action.get('type') in ('keyboard', 'mouse'):
-                print(f"Step {step}: Sending {action['type'].capitalize()} Action: {action}")
-            interface.send_action(action)
-        step += 1
-        time.sleep(timestep)
+    try:
+        while time.time() - start_time < duration:
+            obs = interface.get_observation()
+            actions = agent.act(obs)
+            for action in actions:
+                # Only print keyboard and mouse actions
+                if action.get('type') in ('keyboard', 'mouse'):
+                    print(f"Step {step}: Sending {action['type'].capitalize()} Action: {action}")
+            interface.send_actions(actions)
+            step += 1
+            time.sleep(timestep)
+    finally:
+        orchestrator.stop()
+    print(f"Action dispatch: {interface.executor.stats()}")
+    interface.close()
     print("Full system E2E test completed.")
 
 if __name__ == "__main__":
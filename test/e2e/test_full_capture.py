@@ -31,13 +31,17 @@ def run_full_capture_test(dbname='embodied_agent', user='agent', password='agent
     input_capture.start_listeners()
 
     print(f"Starting synchronized capture for {duration} seconds...")
+    orchestrator.start()  # Capture thread and continuous audio stream
     start_time = time.time()
     obs_count = 0
-    while time.time() - start_time < duration:
-        obs = orchestrator.get_observation()
-        insert_observation(conn, obs)
-        obs_count += 1
-        time.sleep(timestep)
+    try:
+        while time.time() - start_time < duration:
+            obs = orchestrator.get_observation()
+            insert_observation(conn, obs)
+            obs_count += 1
+            time.sleep(timestep)
+    finally:
+        orchestrator.stop()
     conn.close()
     print(f"Capture complete. {obs_count} observations inserted.")
 
@@ -0,0 +1,177 @@
+import threading
+import time
+from agent_env_interface.action_executor import ActionExecutor
+from agent_env_interface.agent_env_interface import AgentEnvInterface
+
+class RecordingController:
+    def __init__(self):
+        self.calls = []
+
+    def press(self, target):
+        self.calls.append(('press', target, time.monotonic()))
+
+    def release(self, target):
+        self.calls.append(('release', target, time.monotonic()))
+
+    def move(self, dx, dy):
+        self.calls.append(('move', (dx, dy), time.monotonic()))
+
+    def click(self, target):
+        self.calls.append(('click', target, time.monotonic()))
+
+def _executor():
+    keyboard, mouse = RecordingController(), RecordingController()
+    executor = ActionExecutor(keyboard, mouse, button_map={'left': 'LEFT', 'right': 'RIGHT'})
+    executor.start()
+    return executor, keyboard, mouse
+
+def test_batch_with_hold_does_not_block_submitter():
+    executor, keyboard, mouse = _executor()
+    t0 = time.monotonic()
+    executor.submit([
+        {'type': 'keyboard', 'key': 'w', 'hold': 0.1},
+        {'type': 'mouse', 'click': 'left'},
+        {'type': 'noop'},
+    ])
+    assert time.monotonic() - t0 < 0.01
+    assert executor.wait_idle(1.0)
+    (_, _, pressed), (_, _, released) = keyboard.calls
+    assert [c[:2] for c in keyboard.calls] == [('press', 'w'), ('release', 'w')]
+    assert 0.09 <= released - pressed < 0.2
+    assert mouse.calls[0][:2] == ('click', 'LEFT')
+    stats = executor.stats()
+    assert stats['dispatched'] == 3 and stats['latency_p95_ms'] is not None
+    executor.stop()
+
+def test_moves_due_together_are_coalesced():
+    executor, _, mouse = _executor()
+    now = time.monotonic() + 0.05  # Due shortly after both batches are queued
+    executor.submit([{'type': 'mouse', 'move': (10, 0)}, {'type': 'mouse', 'move': (0, 5)}], submit_time=now)
+    executor.submit([{'type': 'mouse', 'move': (-3, 1)}], submit_time=now)
+    assert executor.wait_idle(1.0)
+    assert [c[:2] for c in mouse.calls] == [('move', (7, 6))]
+    assert executor.coalesced_moves == 2
+    executor.stop()
+
+def test_moves_are_not_coalesced_across_clicks():
+    executor, _, mouse = _executor()
+    now = time.monotonic() + 0.05
+    executor.submit([{'type': 'mouse', 'move': (100, 0)}, {'type': 'mouse', 'move': (0, 10)},
+                     {'type': 'mouse', 'click': 'left'}, {'type': 'mouse', 'move': (-100, 0)}], submit_time=now)
+    assert executor.wait_idle(1.0)
+    # The click lands where the agent aimed it; only the moves before it are merged
+    assert [c[:2] for c in mouse.calls] == [('move', (100, 10)), ('click', 'LEFT'), ('move', (-100, 0))]
+    assert executor.coalesced_moves == 1
+    executor.stop()
+
+def test_release_all_cancels_pending_releases():
+    executor, keyboard, mouse = _executor()
+    executor.submit([{'type': 'keyboard', 'key': 'e', 'hold': 5.0}, {'type': 'mouse', 'button': 'right', 'hold': 5.0}])
+    deadline = time.monotonic() + 1.0
+    while len(keyboard.calls) + len(mouse.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    executor.release_all()
+    assert executor.wait_idle(1.0)  # Nothing left scheduled
+    assert [c[:2] for c in keyboard.calls] == [('press', 'e'), ('release', 'e')]
+    assert [c[:2] for c in mouse.calls] == [('press', 'RIGHT'), ('release', 'RIGHT')]
+    executor.stop()
+
+def test_release_all_cancels_delayed_presses():
+    executor, keyboard, mouse = _executor()
+    executor.submit([{'type': 'keyboard', 'key': 'q', 'delay': 0.05, 'hold': 0.5},
+                     {'type': 'mouse', 'button': 'left', 'delay': 0.05, 'hold': 0.5},
+                     {'type': 'keyboard', 'key': 'w', 'hold': 0.5}])
+    deadline = time.monotonic() + 1.0
+    while not keyboard.calls and time.monotonic() < deadline:
+        time.sleep(0.001)
+    executor.release_all()
+    assert executor.wait_idle(1.0)
+    time.sleep(0.1)  # Past the delayed presses' due time
+    assert executor.stats()['pending'] == 0
+    assert [c[:2] for c in keyboard.calls] == [('press', 'w'), ('release', 'w')]
+    assert mouse.calls == []
+    assert not executor._held
+    executor.stop()
+
+def test_release_all_cancels_delayed_moves_and_clicks():
+    executor, _, mouse = _executor()
+    executor.submit([{'type': 'mouse', 'move': (5, 5), 'delay': 0.05}, {'type': 'mouse', 'click': 'left', 'delay': 0.05}])
+    executor.release_all()  # E.g., focus lost: nothing may land in the window that has focus now
+    assert executor.wait_idle(1.0)
+    time.sleep(0.1)
+    assert mouse.calls == [] and executor.stats()['pending'] == 0
+    executor.stop()
+
+class BlockingKeyboard(RecordingController):
+    """press() blocks until unblocked; records the thread each call ran on."""
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.threads = []
+
+    def press(self, target):
+        super().press(target)
+        self.unblock.wait(2.0)
+
+    def release(self, target):
+        self.threads.append(threading.current_thread().name)
+        super().release(target)
+
+def test_stop_timeout_leaves_release_to_the_executor_thread():
+    keyboard, mouse = BlockingKeyboard(), RecordingController()
+    executor = ActionExecutor(keyboard, mouse, button_map={})
+    executor.start()
+    executor.submit([{'type': 'keyboard', 'key': 'w', 'press': True}])
+    deadline = time.monotonic() + 1.0
+    while not keyboard.calls and time.monotonic() < deadline:
+        time.sleep(0.001)
+    executor.stop(timeout=0.05)  # The executor thread is stuck dispatching
+    assert executor._thread is not None and executor._thread.is_alive()
+    assert keyboard.threads == []  # Not released concurrently from the caller's thread
+    thread = executor._thread
+    keyboard.unblock.set()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert [c[:2] for c in keyboard.calls] == [('press', 'w'), ('release', 'w')]
+    assert keyboard.threads == ['ActionExecutor']
+
+class StubOrchestrator:
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+class StubWindowManager:
+    def __init__(self):
+        self.focused = True
+
+    def is_focused(self):
+        return self.focused
+
+def test_send_action_goes_through_executor():
+    keyboard, mouse = RecordingController(), RecordingController()
+    window_manager = StubWindowManager()
+    interface = AgentEnvInterface(StubOrchestrator(), window_manager, keyboard=keyboard, mouse=mouse,
+                                  button_map={'left': 'LEFT'})
+    interface.send_action({'type': 'keyboard', 'key': 'w', 'press': True})
+    interface.send_action({'type': 'mouse', 'move': (2, 3), 'click': 'left'})
+    assert interface.executor.wait_idle(1.0)
+    assert interface.executor._held == {('key', 'w')}  # Tracked, so losing focus releases it
+    window_manager.focused = False
+    interface.send_action({'type': 'keyboard', 'key': 'e', 'press': True})  # Dropped, releases held keys
+    assert interface.executor.wait_idle(1.0)
+    assert [c[:2] for c in keyboard.calls] == [('press', 'w'), ('release', 'w')]
+    assert [c[:2] for c in mouse.calls] == [('move', (2, 3)), ('click', 'LEFT')]
+    interface.close()
+
+if __name__ == "__main__":
+    test_batch_with_hold_does_not_block_submitter()
+    test_moves_due_together_are_coalesced()
+    test_moves_are_not_coalesced_across_clicks()
+    test_release_all_cancels_pending_releases()
+    test_release_all_cancels_delayed_presses()
+    test_release_all_cancels_delayed_moves_and_clicks()
+    test_stop_timeout_leaves_release_to_the_executor_thread()
+    test_send_action_goes_through_executor()
+    print("All action executor tests passed.")
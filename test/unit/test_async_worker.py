@@ -0,0 +1,27 @@
+import time
+import numpy as np
+from visual.async_worker import LatestFrameWorker
+
+def test_latest_frame_worker_drops_stale_frames():
+    def slow_mean(frame):
+        time.sleep(0.05)
+        return float(frame.mean())
+    worker = LatestFrameWorker(slow_mean)
+    worker.start()
+    try:
+        for i in range(5):
+            worker.submit(np.full((4, 4), i, dtype=np.uint8), float(i))
+        deadline = time.time() + 2.0
+        while worker.busy and time.time() < deadline:
+            time.sleep(0.01)
+        value, source_timestamp, _ = worker.latest()
+        # The newest frame is always processed, with its own source timestamp
+        assert value == 4.0 and source_timestamp == 4.0
+        assert worker.frames_dropped >= 1
+        assert worker.frames_processed + worker.frames_dropped == 5
+    finally:
+        worker.stop()
+
+if __name__ == "__main__":
+    test_latest_frame_worker_drops_stale_frames()
+    print("LatestFrameWorker test passed.")
@@ -1,4 +1,7 @@
+import threading
+import time
 import numpy as np
+from audio import audio_capture
 from audio.audio_capture import AudioInputCapture
 
 def test_audio_input_capture_pause_resume():
@@ -10,6 +13,78 @@ def test_audio_input_capture_pause_resume():
     chunk = capture.get_one_second_chunk()
     assert chunk.shape == (100, 1)
 
+class IdleStream:
+    """Stands in for an open sd.InputStream whose device delivers no samples."""
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+class FakeInputStream(IdleStream):
+    """Stands in for sd.InputStream: records that it was opened and started."""
+    opened = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        FakeInputStream.opened.append(self)
+
+    def start(self):
+        self.started = True
+
+def _fail_rec(*args, **kwargs):
+    raise AssertionError("get_chunk recorded per chunk instead of reading the stream")
+
+def test_get_chunk_starts_the_stream_instead_of_blocking():
+    FakeInputStream.opened = []
+    original = audio_capture.sd.InputStream, audio_capture.sd.rec
+    audio_capture.sd.InputStream, audio_capture.sd.rec = FakeInputStream, _fail_rec
+    try:
+        capture = AudioInputCapture("/tmp", samplerate=8000, channels=1)
+        t0 = time.monotonic()
+        assert np.all(capture.get_one_second_chunk() == 0)  # Nothing captured yet: zero-padded, no wait
+        assert time.monotonic() - t0 < 0.5
+        assert capture.streaming and len(FakeInputStream.opened) == 1 and FakeInputStream.opened[0].started
+        capture.ring.write(np.full((100, 1), 7, dtype=np.int16), time.monotonic())
+        chunk = capture.get_chunk(100)
+        assert chunk.shape == (100, 1) and np.all(chunk == 7)
+        assert len(FakeInputStream.opened) == 1  # Opened once, on first use
+        capture.stop_stream()
+    finally:
+        audio_capture.sd.InputStream, audio_capture.sd.rec = original
+
+def test_stream_audio_times_out_when_device_stalls():
+    capture = AudioInputCapture("/tmp", samplerate=8000, channels=1, segment_duration=0.01)
+    capture._stream = IdleStream()
+    segments = []
+    t0 = time.monotonic()
+    capture.stream_audio(lambda audio, ts: segments.append(audio), stall_timeout=0.05)
+    assert time.monotonic() - t0 < 1.0
+    assert segments == []
+
+def test_stream_audio_ends_when_stream_stops():
+    capture = AudioInputCapture("/tmp", samplerate=8000, channels=1, segment_duration=0.01)
+    capture._stream = IdleStream()
+    def device():
+        while capture._stream is not None:
+            capture.ring.write(np.ones((80, 1), dtype=np.int16), time.monotonic())  # One segment per 10 ms
+            time.sleep(0.01)
+    segments = []
+    threading.Thread(target=device, daemon=True).start()
+    thread = threading.Thread(target=capture.stream_audio, args=(lambda audio, ts: segments.append(audio),),
+                              kwargs={'stall_timeout': 10.0})
+    thread.start()
+    deadline = time.monotonic() + 1.0
+    while not segments and time.monotonic() < deadline:
+        time.sleep(0.001)
+    capture.stop_stream()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert segments and all(segment.shape == (80, 1) for segment in segments)
+
 if __name__ == "__main__":
     test_audio_input_capture_pause_resume()
-    print("AudioInputCapture pause/resume test passed.")
+    test_get_chunk_starts_the_stream_instead_of_blocking()
+    test_stream_audio_times_out_when_device_stalls()
+    test_stream_audio_ends_when_stream_stops()
+    print("AudioInputCapture tests passed.")
@@ -0,0 +1,51 @@
+import numpy as np
+from audio.audio_ring import AudioRingBuffer
+
+def test_audio_ring_buffer_gapless_reads_and_wraparound():
+    ring = AudioRingBuffer(100, channels=2, samplerate=1000)
+    samples = np.arange(250 * 2, dtype=np.int16).reshape(250, 2)
+    for i in range(0, 250, 30):
+        ring.write(samples[i:i + 30], timestamp=(i + len(samples[i:i + 30])) / 1000.0)
+    assert ring.total_written == 250
+    # Latest samples, across the wrap point
+    assert np.array_equal(ring.get_latest(40), samples[210:250])
+    # Overwritten samples are trimmed, not returned torn
+    chunk, first = ring.read(100, 100)
+    assert first == 150 and np.array_equal(chunk, samples[150:200])
+    # Time-based range is sample-accurate
+    chunk, first = ring.get_range(0.200, 0.220)
+    assert first == 200 and np.array_equal(chunk, samples[200:220])
+
+class OverlappingRing(AudioRingBuffer):
+    """Runs a producer write in the middle of each of the first `overlaps` reader copies."""
+    def __init__(self, *args, overlaps=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.overlaps = overlaps
+        self.pending = []
+
+    def _copy(self, start, n):
+        chunk, first = super()._copy(start, n)
+        if self.overlaps > 0 and self.pending:
+            self.overlaps -= 1
+            self.write(self.pending.pop(0))
+        return chunk, first
+
+def test_reads_overlapping_writes_are_retried_or_trimmed():
+    samples = np.arange(300 * 2, dtype=np.int16).reshape(300, 2)
+    ring = OverlappingRing(100, overlaps=1)
+    ring.write(samples[:100])
+    ring.pending = [samples[100:150]]
+    chunk, first = ring.read(0, 100)  # Retried after the overlapping write
+    assert first == 50 and np.array_equal(chunk, samples[50:100])
+    ring = OverlappingRing(100, overlaps=10)
+    ring.write(samples[:100])
+    ring.pending = [samples[100 + 20 * i:120 + 20 * i] for i in range(10)]
+    chunk, first = ring.read(0, 100, retries=3)  # Every copy overlaps: trimmed, never torn
+    assert np.array_equal(chunk, samples[first:first + len(chunk)])
+    assert first >= ring.total_written - ring.capacity
+    assert ring._seq % 2 == 0
+
+if __name__ == "__main__":
+    test_audio_ring_buffer_gapless_reads_and_wraparound()
+    test_reads_overlapping_writes_are_retried_or_trimmed()
+    print("AudioRingBuffer test passed.")
@@ -0,0 +1,50 @@
+import numpy as np
+from features.registry import FeatureRegistry
+from benchmarks.bench_perception import bench_registry, compare, summarize
+
+def test_summarize_percentiles_and_throughput():
+    summary = summarize([0.001] * 98 + [0.010, 0.020])
+    assert summary['n'] == 100
+    assert summary['p50_ms'] == 1.0
+    assert summary['p99_ms'] > summary['p95_ms'] >= 1.0
+    assert abs(summary['throughput_per_s'] - 100 / 0.128) < 1e-6
+
+def test_bench_registry_feeds_dependencies():
+    registry = FeatureRegistry()
+    registry.register('gray', lambda frame: frame.mean(axis=2), inputs=('frame',), output=False)
+    registry.register('brightness', lambda gray: float(gray.mean()), inputs=('gray',))
+    registry.register('broken', lambda frame: 1 / 0, inputs=('frame',))
+    frames = [{'frame': np.full((8, 8, 3), v, dtype=np.uint8)} for v in (10, 20)]
+    results = bench_registry(registry, frames, repeat=2, pipeline=('pipeline', lambda raw: raw['frame'].sum()))
+    assert results['gray']['n'] == results['brightness']['n'] == 4
+    assert results['brightness']['peak_kb'] >= 0
+    assert results['broken'] == {'n': 0, 'errors': 4}
+    assert results['pipeline']['n'] == 4
+
+def test_compare_relative_and_absolute_thresholds():
+    thresholds = {'relative': {'metric': 'p95_ms', 'max_regression': 0.25, 'min_delta_ms': 0.1},
+                  'absolute': {'visual/*/1280x720/*': {'p95_ms': 10.0}}}
+    baseline = {'visual/edges/320x180/synthetic': {'p95_ms': 1.0},
+                'audio/pitch/1024/synthetic': {'p95_ms': 0.01}}
+    results = {'visual/edges/320x180/synthetic': {'p95_ms': 1.5},  # +50%: regression
+               'audio/pitch/1024/synthetic': {'p95_ms': 0.05},  # +400% but under the noise floor
+               'visual/edges/1280x720/synthetic': {'p95_ms': 12.0}}  # Over the absolute limit, no baseline
+    failures = compare(results, baseline, thresholds)
+    assert len(failures) == 2
+    assert failures[0].startswith('visual/edges/320x180/synthetic')
+    assert 'exceeds limit' in failures[1]
+    assert compare(baseline, baseline, thresholds) == []
+    # Broken extractors (every call raised), partial failures and results missing from a run all fail
+    broken = dict(baseline, **{'visual/broken/320x180/synthetic': {'n': 0, 'errors': 4},
+                               'visual/flaky/320x180/synthetic': {'n': 3, 'errors': 1, 'p95_ms': 1.0}})
+    failures = compare(broken, baseline, thresholds)
+    assert len(failures) == 2
+    assert failures[0].startswith('visual/broken/320x180/synthetic') and failures[1].startswith('visual/flaky')
+    failures = compare({'visual/edges/320x180/synthetic': {'p95_ms': 1.0}}, baseline, thresholds)
+    assert failures == ['audio/pitch/1024/synthetic: in baseline but missing from results']
+
+if __name__ == "__main__":
+    test_summarize_percentiles_and_throughput()
+    test_bench_registry_feeds_dependencies()
+    test_compare_relative_and_absolute_thresholds()
+    print("All perception benchmark tests passed.")
@@ -0,0 +1,28 @@
+import tempfile
+import numpy as np
+from db.blob_store import BlobStore
+
+def test_blob_store_roundtrip_dedup_and_segments():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = BlobStore(tmpdir, segment_size=10000)
+        frame = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)  # 9216 bytes
+        audio = np.random.randint(-32768, 32767, (441, 2), dtype=np.int16)
+        frame_ref = store.put(frame[:, :, ::-1])  # Non-contiguous views are stored contiguously
+        audio_ref = store.put(audio)
+        assert store.put(audio) == audio_ref  # Same content stored once
+        assert audio_ref['segment'] == frame_ref['segment'] + 1  # Rolled over past segment_size
+        restored = store.get(frame_ref)
+        assert np.array_equal(restored, frame[:, :, ::-1])
+        assert not restored.flags.writeable  # Zero-copy view over the memory map
+        assert np.array_equal(store.get(audio_ref), audio)
+        store.close()
+        # References stay valid across reopen
+        reopened = BlobStore(tmpdir, segment_size=10000)
+        assert np.array_equal(reopened.get(audio_ref), audio)
+        assert reopened.put(audio) == audio_ref
+        del restored
+        reopened.close()
+
+if __name__ == "__main__":
+    test_blob_store_roundtrip_dedup_and_segments()
+    print("BlobStore test passed.")
@@ -0,0 +1,97 @@
+import numpy as np
+from tracing.tracer import tracer
+from db.bulk_writer import BulkObservationWriter, MemorySink, PostgresSink
+
+def make_observation(i):
+    return {
+        'timestamp': f'2025-07-23 12:00:00.{i:06d}',
+        'video_frame': np.full((48, 64, 3), i % 255, dtype=np.uint8),
+        'audio_chunk': np.zeros((441, 2), dtype=np.int16),
+        'audio_shape': (441, 2),
+        'audio_dtype': 'int16',
+        'keyboard_state': {},
+        'mouse_state': {'buttons': {}, 'position': (0, 0)},
+        'events': [],
+    }
+
+def test_bulk_writer_batches_rows_and_reports_throughput():
+    sink = MemorySink()
+    writer = BulkObservationWriter(sink, batch_size=10, flush_interval=5.0, max_queue=4)
+    writer.start()
+    for i in range(25):
+        writer.submit(make_observation(i))  # Blocks when the 4-slot queue is full
+    writer.close()
+    assert len(sink.rows) == 25
+    assert sink.batches == 3  # 10 + 10 + remainder on close
+    assert [row[0] for row in sink.rows] == [make_observation(i)['timestamp'] for i in range(25)]
+    stats = writer.stats()
+    assert stats['rows'] == 25 and stats['megabytes'] > 0.2 and stats['rows_per_s'] > 0
+
+def test_flush_without_writer_thread_writes_on_caller():
+    sink = MemorySink()
+    writer = BulkObservationWriter(sink, batch_size=2, max_queue=8)
+    for i in range(5):
+        writer.submit(make_observation(i))
+    writer.flush(timeout=1.0)  # Must not block: start() was never called
+    assert len(sink.rows) == 5 and sink.batches == 3
+    writer.submit(make_observation(5))
+    writer.close()
+    assert len(sink.rows) == 6
+
+class FailingConnection:
+    """psycopg2-like connection whose INSERTs fail; records commit/rollback calls."""
+    encoding = 'UTF8'
+
+    def __init__(self):
+        self.calls = []
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def mogrify(self, *args):
+                raise RuntimeError("insert failed")
+        Cursor.connection = connection
+        return Cursor()
+
+    def commit(self):
+        self.calls.append('commit')
+
+    def rollback(self):
+        self.calls.append('rollback')
+
+def test_postgres_sink_rolls_back_failed_batches():
+    conn = FailingConnection()
+    writer = BulkObservationWriter(PostgresSink(conn), batch_size=2)
+    writer.submit(make_observation(0))
+    writer.flush()
+    assert conn.calls == ['rollback'] and writer.errors == 1
+    tracer.configure(level='error')
+    try:
+        writer.submit(make_observation(1))
+        writer.flush()
+        assert [event[4] for event in tracer.events()] == ['db.bulk_write']
+    finally:
+        tracer.configure(level='off')
+        tracer.clear()
+
+def test_submit_without_writer_thread_never_blocks():
+    sink = MemorySink()
+    writer = BulkObservationWriter(sink, batch_size=8, max_queue=3)
+    for i in range(10):
+        writer.submit(make_observation(i), timeout=1.0)  # queue.Full would mean nothing drained it
+    writer.close()
+    assert len(sink.rows) == 10
+
+if __name__ == "__main__":
+    test_bulk_writer_batches_rows_and_reports_throughput()
+    test_flush_without_writer_thread_writes_on_caller()
+    test_postgres_sink_rolls_back_failed_batches()
+    test_submit_without_writer_thread_never_blocks()
+    print("BulkObservationWriter test passed.")
@@ -0,0 +1,83 @@
+import numpy as np
+from encoding.frame_codecs import FrameDecoder, decode_frame, get_frame_codec, is_encoded_frame
+from encoding.audio_codecs import decode_audio, get_audio_codec
+from encoding.encoding_stage import EncodingStage
+from visual.perception import decode_video_frame_bytes
+from audio.perception import decode_audio_chunk_bytes
+
+def _frames(n=5):
+    base = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+    for i in range(n):
+        frame = base.copy()
+        frame[10:20, i * 5:i * 5 + 10] = 255
+        yield frame
+
+def test_lossless_frame_codecs_roundtrip():
+    frame = next(_frames())
+    for name in ('raw', 'png'):
+        data = get_frame_codec(name).encode(frame)
+        assert is_encoded_frame(data)
+        assert np.array_equal(decode_frame(data), frame)
+    lossy = decode_frame(get_frame_codec('jpeg').encode(frame))
+    assert lossy.shape == frame.shape and lossy.dtype == frame.dtype
+
+def test_delta_codec_keyframes_and_reference():
+    frames = list(_frames(5))
+    codec = get_frame_codec('delta', keyframe_interval=3)
+    encoded = [codec.encode(f) for f in frames]
+    decoder = FrameDecoder()
+    assert all(np.array_equal(decoder.decode(e), f) for e, f in zip(encoded, frames))
+    assert np.array_equal(decode_frame(encoded[3]), frames[3])  # Keyframe decodes on its own
+    try:
+        decode_frame(encoded[1])
+        assert False, "delta frame without reference should fail"
+    except ValueError:
+        pass
+    assert np.array_equal(decode_video_frame_bytes(memoryview(encoded[1]), reference=frames[0]), frames[1])
+
+def test_audio_codecs_roundtrip():
+    t = np.arange(4410) / 44100.0
+    chunk = (np.stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 220 * t)], axis=1) * 20000).astype(np.int16)
+    for name in ('raw', 'delta'):
+        data = get_audio_codec(name).encode(chunk)
+        assert np.array_equal(decode_audio(data), chunk)
+    assert np.array_equal(decode_audio_chunk_bytes(get_audio_codec('delta').encode(chunk)), chunk)
+    assert len(get_audio_codec('delta').encode(chunk)) < chunk.nbytes
+
+def test_encoding_stage_preserves_order_and_metadata():
+    stage = EncodingStage(video_codec='delta', audio_codec='delta', max_workers=2)
+    frames = list(_frames(4))
+    audio = np.zeros((100, 2), dtype=np.int16)
+    futures = [stage.submit({'video_frame': f, 'audio_chunk': audio, 'timestamp': i}) for i, f in enumerate(frames)]
+    encoded = [future.result() for future in futures]
+    stage.close()
+    decoder = FrameDecoder()
+    for i, obs in enumerate(encoded):
+        assert obs['timestamp'] == i and obs['video_codec'] == 'delta'
+        assert obs['video_frame_shape'] == frames[i].shape
+        assert np.array_equal(decoder.decode(obs['video_frame']), frames[i])
+        assert np.array_equal(decode_audio(obs['audio_chunk']), audio)
+
+def test_encoding_stage_workers_only_encode():
+    stage = EncodingStage(video_codec='png', audio_codec='raw', max_workers=2)
+    tasks = []
+    submit = stage._pool.submit
+    stage._pool.submit = lambda fn, *args: tasks.append(fn) or submit(fn, *args)
+    frames = list(_frames(8))
+    audio = np.zeros((100, 2), dtype=np.int16)
+    futures = [stage.submit({'video_frame': f, 'audio_chunk': audio, 'timestamp': i}) for i, f in enumerate(frames)]
+    encoded = [future.result(timeout=5.0) for future in futures]
+    stage.close()
+    # One pool task per encode: records are assembled by callbacks, not by workers blocking on other futures
+    assert len(tasks) == 2 * len(frames)
+    assert [obs['timestamp'] for obs in encoded] == list(range(len(frames)))
+    assert all(obs['video_codec'] == 'png' and obs['audio_codec'] == 'raw' for obs in encoded)
+    assert stage.encode({'timestamp': 'none'}) == {'timestamp': 'none'}
+
+if __name__ == "__main__":
+    test_lossless_frame_codecs_roundtrip()
+    test_delta_codec_keyframes_and_reference()
+    test_audio_codecs_roundtrip()
+    test_encoding_stage_preserves_order_and_metadata()
+    test_encoding_stage_workers_only_encode()
+    print("Codec tests passed.")
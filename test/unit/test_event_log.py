@@ -0,0 +1,29 @@
+from input.event_log import EventLog
+
+def test_event_log_range_cursor_and_bound():
+    log = EventLog(chunk_size=4, max_chunks=3)
+    for i in range(10):
+        log.append('mouse_move', (i, 0), timestamp=float(i))
+    assert [e[2][0] for e in log.range(2.0, 6.0)] == [2, 3, 4, 5]
+    # Consumed cursor: only new events are returned
+    events, cursor = log.read(0)
+    assert len(events) == 10 and cursor == 10
+    log.append('key_press', "'w'", timestamp=10.0)
+    events, cursor = log.read(cursor)
+    assert events == [(10.0, 'key_press', "'w'")] and cursor == 11
+    # Bounded: oldest chunk dropped once max_chunks is exceeded
+    for i in range(11, 14):
+        log.append('mouse_move', (i, 0), timestamp=float(i))
+    assert len(log) == 10 and log.range(0.0, 4.0) == []
+
+def test_event_log_timestamps_never_go_backwards():
+    log = EventLog()
+    log.append('key_press', 'a', timestamp=5.0)
+    event = log.append('key_press', 'b', timestamp=4.0)  # Wall clock stepped back
+    assert event[0] == 5.0
+    assert len(log.range(5.0, 5.1)) == 2
+
+if __name__ == "__main__":
+    test_event_log_range_cursor_and_bound()
+    test_event_log_timestamps_never_go_backwards()
+    print("EventLog tests passed.")
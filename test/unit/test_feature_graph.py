@@ -0,0 +1,60 @@
+import concurrent.futures
+import time
+import numpy as np
+from features.feature_graph import FeatureGraph
+from audio.perception import AudioPerception
+
+def _graph(executor=None, default_deadline=None):
+    graph = FeatureGraph(executor, default_deadline=default_deadline)
+    graph.add('total', lambda doubled, x: doubled + x, deps=('doubled', 'x'))  # Declared before its dependency
+    graph.add('doubled', lambda x: 2 * x, deps=('x',), output=False)
+    graph.add('slow', lambda x: time.sleep(0.3) or x, deps=('x',), deadline=0.1)
+    graph.add('broken', lambda x: 1 / 0, deps=('x',))
+    graph.add('after_broken', lambda b: b, deps=('broken',))
+    return graph
+
+def test_inline_and_parallel_runs_agree():
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        parallel = _graph(pool).run({'x': 3}, capture_time=time.time())
+    inline = _graph().run({'x': 3})
+    for obs in (parallel, inline):
+        assert obs['total']['value'] == 9
+        assert 'doubled' not in obs  # Intermediate, not an output
+        assert obs['broken']['value'].startswith('Error')
+        assert obs['after_broken']['value'] == 'Error: dependency failed'
+
+def test_deadline_drops_slow_feature_without_delaying_run():
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        graph = _graph(pool)
+        t0 = time.time()
+        obs = graph.run({'x': 1})
+        assert time.time() - t0 < 0.25
+        assert obs['slow'] == {'value': None, 'lag': None, 'dropped': True}
+        assert obs['total']['value'] == 3
+        assert graph.dropped['slow'] == 1
+
+def test_cycle_is_rejected():
+    graph = FeatureGraph().add('a', lambda b: b, deps=('b',)).add('b', lambda a: a, deps=('a',))
+    try:
+        graph.order()
+        assert False, "cycle should be rejected"
+    except ValueError:
+        pass
+
+def test_parallel_audio_perception_matches_sequential():
+    t = np.arange(44100) / 44100
+    chunk = (np.stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 220 * t)], axis=1) * 10000).astype(np.int16)
+    sequential = AudioPerception().process_chunk(chunk, chunk_timestamp=0.0)
+    ap = AudioPerception(parallel=True)
+    parallel = ap.process_chunk(chunk, chunk_timestamp=0.0)
+    ap.close()
+    assert sequential.keys() == parallel.keys()
+    assert sequential['pitch']['value'] == parallel['pitch']['value']
+    assert np.allclose(sequential['spectral_centroid']['value'], parallel['spectral_centroid']['value'])
+
+if __name__ == "__main__":
+    test_inline_and_parallel_runs_agree()
+    test_deadline_drops_slow_feature_without_delaying_run()
+    test_cycle_is_rejected()
+    test_parallel_audio_perception_matches_sequential()
+    print("Feature graph tests passed.")
@@ -0,0 +1,91 @@
+import time
+import numpy as np
+from features.registry import FeatureRegistry, FeatureScheduler
+
+def _registry(calls):
+    registry = FeatureRegistry()
+
+    def counted(name, fn):
+        def wrapper(*args):
+            calls[name] = calls.get(name, 0) + 1
+            return fn(*args)
+        return wrapper
+
+    registry.register('gray', counted('gray', lambda frame: frame.mean(axis=2)), inputs=('frame',), cost='cheap', output=False)
+    registry.register('brightness', counted('brightness', lambda gray: float(gray.mean())), inputs=('gray',), cost='cheap')
+    registry.register('changed', counted('changed', lambda gray: bool(gray.max() > 100)), inputs=('gray',), cost='cheap')
+    registry.register('edges', counted('edges', lambda gray: int(np.count_nonzero(np.diff(gray)))), inputs=('gray',), rate=3)
+    registry.register('text', counted('text', lambda gray, changed: 'read'), inputs=('gray', 'changed'),
+                      cost='expensive', rate='on_change', trigger=('changed',))
+    return registry
+
+def _frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+def test_shared_intermediate_and_rates():
+    calls = {}
+    scheduler = FeatureScheduler(_registry(calls))
+    observations = [scheduler.run({'frame': _frame(v)}, capture_time=time.time()) for v in (200, 10, 10, 10, 200)]
+    assert calls['gray'] == 5  # Computed once per tick, shared by all features
+    assert 'gray' not in observations[0]
+    assert calls['edges'] == 2  # Ticks 0 and 3
+    assert observations[1]['edges']['stale'] and not observations[3].get('edges', {}).get('stale')
+    assert calls['text'] == 2  # First tick (never computed) and the tick where 'changed' fired again
+    assert observations[2]['text'] == {'value': 'read', 'lag': observations[2]['text']['lag'], 'stale': True}
+    assert 'stale' not in observations[4]['text']
+
+def test_budget_defers_then_forces():
+    calls = {}
+    registry = _registry(calls)
+    scheduler = FeatureScheduler(registry, budget=0.2, max_deferrals=2)
+    scheduler.run({'frame': _frame(200)})  # Everything runs once (never computed)
+    scheduler._estimates['brightness'] = 1.0  # Pretend it is too slow for the budget
+    obs = scheduler.run({'frame': _frame(200)})
+    assert obs['brightness']['stale']
+    scheduler._estimates['brightness'] = 1.0
+    scheduler.run({'frame': _frame(200)})
+    scheduler._estimates['brightness'] = 1.0
+    obs = scheduler.run({'frame': _frame(200)})  # Deferred max_deferrals times: forced
+    assert 'stale' not in obs['brightness']
+    assert scheduler.stats()['brightness']['deferred'] == 2
+
+def test_subscriptions_run_only_needed_features():
+    calls = {}
+    scheduler = FeatureScheduler(_registry(calls), subscriptions=['text'])
+    assert scheduler.needed() == {'text', 'gray', 'changed'}
+    obs = scheduler.run({'frame': _frame(200)})
+    assert set(obs) == {'text'}
+    assert 'brightness' not in calls and 'edges' not in calls
+
+def test_invalid_specs_rejected():
+    registry = FeatureRegistry()
+    for kwargs in ({'cost': 'free'}, {'rate': 0}, {'rate': 'on_change', 'trigger': ('y',)},
+                   {'rate': 'on_change'}):
+        try:
+            registry.register('f', lambda x: x, inputs=('x',), **kwargs)
+        except ValueError:
+            continue
+        assert False, kwargs
+
+def test_rate_overrides_are_validated():
+    registry = FeatureRegistry()
+    registry.register('changed', lambda x: x, inputs=('x',), cost='cheap')
+    registry.register('f', lambda x, changed: x, inputs=('x', 'changed'))
+    registry.set_rates({'f': 3})
+    assert registry.get('f').rate == 3
+    for name, rate in (('f', 'on_change'), ('f', -1), ('missing', 2)):
+        try:
+            registry.set_rate(name, rate)
+        except (ValueError, KeyError):
+            continue
+        assert False, (name, rate)
+    registry.set_rates({'f': ('on_change', ('changed',))})
+    assert registry.get('f').trigger == ('changed',)
+
+if __name__ == "__main__":
+    test_shared_intermediate_and_rates()
+    test_budget_defers_then_forces()
+    test_subscriptions_run_only_needed_features()
+    test_invalid_specs_rejected()
+    test_rate_overrides_are_validated()
+    print("All feature registry tests passed.")
@@ -0,0 +1,50 @@
+import time
+from agent_env_interface.focus_tracker import FakeFocusBackend, FocusTracker, normalize_window_id
+
+def _wait_for(condition, timeout=1.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.001)
+    return condition()
+
+def test_is_focused_is_cached_and_event_driven():
+    backend = FakeFocusBackend(window_id='0x3e00004', title='Eastshade')
+    with FocusTracker(backend, target_id='0x3E00004', poll_interval=5.0) as tracker:
+        assert tracker.is_focused()
+        queries = backend.queries
+        for _ in range(1000):
+            tracker.is_focused()
+        assert backend.queries == queries  # Answered from memory
+        backend.set_active(0x123, title='Terminal')
+        assert _wait_for(lambda: not tracker.is_focused())  # Pushed, not polled (poll_interval is 5 s)
+        backend.set_active(0x3e00004, title='Eastshade')
+        assert _wait_for(tracker.is_focused)
+        assert tracker.changes == 3
+
+def test_target_name_matching():
+    backend = FakeFocusBackend(window_id=0x10, title='Eastshade (Vulkan)')
+    tracker = FocusTracker(backend, target_name='Eastshade')
+    assert tracker.refresh()
+    backend.set_active(None)
+    assert not tracker.refresh()
+
+def test_normalize_window_id():
+    assert normalize_window_id('0x3e00004') == normalize_window_id(0x3e00004) == 65011716
+    assert normalize_window_id(None) is None
+
+def test_stopped_tracker_cannot_restart():
+    tracker = FocusTracker(FakeFocusBackend(window_id=1), target_id=1)
+    tracker.start()
+    tracker.stop()
+    try:
+        tracker.start()
+    except RuntimeError:
+        return
+    assert False, "restarting a stopped tracker should raise"
+
+if __name__ == "__main__":
+    test_is_focused_is_cached_and_event_driven()
+    test_target_name_matching()
+    test_normalize_window_id()
+    test_stopped_tracker_cannot_restart()
+    print("All focus tracker tests passed.")
@@ -0,0 +1,38 @@
+import numpy as np
+from visual.frame_cache import FrameCache
+from visual.perception import VisualPerception
+
+def test_frame_cache_computes_each_conversion_once():
+    frame = np.random.randint(0, 255, (72, 128, 3), dtype=np.uint8)
+    cache = FrameCache(frame)
+    gray = cache.gray()
+    assert gray.shape == (72, 128)
+    assert cache.gray() is gray
+    assert cache.pyramid(2).shape == (18, 32)
+    assert cache.pyramid(1).shape == (36, 64)  # Built while computing level 2
+    assert cache.stats() == {'computed': 3, 'skipped': 3}
+
+def test_visual_perception_shares_gray_across_extractors():
+    vp = VisualPerception()
+    frame = np.random.randint(0, 255, (72, 128, 3), dtype=np.uint8)
+    obs = vp.process_frame(frame)
+    # edges, motion, change, light/dark and attention all share one grayscale conversion
+    assert obs['frame_cache']['skipped'] >= 4
+    assert vp.conversion_stats()['skipped'] >= 4
+
+def test_text_reads_the_cached_gray():
+    vp = VisualPerception(async_detection=False)
+    ocr_inputs = []
+    vp.text_reader._pytesseract = object()  # Pretend pytesseract is installed; _read_regions is replaced below
+    vp.text_reader._read_regions = lambda image: ocr_inputs.append(image) or ""
+    frame = np.random.randint(0, 255, (72, 128, 3), dtype=np.uint8)
+    vp.process_frame(frame)
+    # OCR gets the grayscale motion/change detection already computed, not a second conversion
+    assert len(ocr_inputs) == 1 and ocr_inputs[0] is vp._get_frame_cache(frame).gray()
+    vp.close()
+
+if __name__ == "__main__":
+    test_frame_cache_computes_each_conversion_once()
+    test_visual_perception_shares_gray_across_extractors()
+    test_text_reads_the_cached_gray()
+    print("FrameCache tests passed.")
@@ -0,0 +1,97 @@
+import numpy as np
+from visual.frame_cache import FrameCache
+from visual.visual_capture import FrameRing, channel_view
+from input.input_orchestrator import InputOrchestrator
+from sim.clock import SimClock
+from sim.synthetic_capture import SyntheticAudioCapture
+from sim.scripted_input import ScriptedInputCapture
+
+class CountingCapture:
+    """Every grab fills the next ring slot with the grab number, like VisualInputCapture.get_frame_array."""
+    def __init__(self, ring_size=4):
+        self.ring = FrameRing(8, 8, size=ring_size)
+        self.grabs = 0
+        self.output_dir = None
+
+    def get_frame_array(self, channels='bgr'):
+        self.grabs += 1
+        self.ring.fill(np.full((8, 8, 4), self.grabs % 256, dtype=np.uint8))
+        return channel_view(self.ring.latest(), channels)
+
+class EngineCapture(CountingCapture):
+    """CountingCapture with a background engine: records whether it was running when each frame was read."""
+    def __init__(self):
+        super().__init__()
+        self.running = False
+        self.running_at_grab = []
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def get_latest(self, channels='bgr'):
+        self.running_at_grab.append(self.running)
+        return self.get_frame_array(channels), None, self.grabs
+
+def _orchestrator(video):
+    clock = SimClock()
+    return InputOrchestrator(video, SyntheticAudioCapture(clock, 1000, 1), ScriptedInputCapture(clock), timestep=1/200)
+
+def test_streamed_frames_survive_ring_wraparound():
+    video = CountingCapture(ring_size=4)
+    observations = _orchestrator(video).stream_observations(duration=0.1, degrade=False)
+    assert len(observations) > video.ring.size
+    assert [int(obs['video_frame'][0, 0, 0]) for obs in observations] == list(range(1, len(observations) + 1))
+
+def test_stream_starts_capture_engines_it_needs():
+    video = EngineCapture()
+    orchestrator = _orchestrator(video)
+    orchestrator.stream_observations(duration=0.02, degrade=False)
+    # Started for the stream (no blocking per-tick grab), stopped after it
+    assert video.running_at_grab and all(video.running_at_grab)
+    assert not video.running and not orchestrator.running
+    # Engines the caller started stay running
+    orchestrator.start()
+    orchestrator.stream_observations(duration=0.02, degrade=False)
+    assert video.running and orchestrator.running
+    orchestrator.stop()
+
+def test_skipped_video_reuses_a_stable_frame():
+    video = CountingCapture(ring_size=2)
+    orchestrator = _orchestrator(video)
+    first = orchestrator.get_observation()['video_frame']
+    value = int(first[0, 0, 0])
+    reused = orchestrator.get_observation(skip={'video'})['video_frame']
+    for _ in range(4):
+        video.get_frame_array('rgb')  # Capture keeps filling the ring meanwhile
+    assert int(reused[0, 0, 0]) == value
+    assert int(orchestrator.get_observation(skip={'video'})['video_frame'][0, 0, 0]) == value
+
+def test_frame_path_views_share_the_ring_and_copy_once_for_opencv():
+    ring = FrameRing(6, 8, size=2)
+    bgra = np.random.randint(0, 255, (6, 8, 4), dtype=np.uint8)
+    slot = ring.fill(bgra)
+    bgr, rgb = channel_view(slot, 'bgr'), channel_view(slot, 'rgb')
+    # Capture -> orchestrator: channel views of the ring slot, no copy
+    assert np.shares_memory(bgr, slot) and np.shares_memory(rgb, slot)
+    assert np.array_equal(rgb, bgra[:, :, 2::-1]) and np.array_equal(bgr, bgra[:, :, :3])
+    # The views are strided, so the one contiguous copy OpenCV needs is made (once) by the frame cache
+    assert not bgr.flags['C_CONTIGUOUS']
+    cache = FrameCache(bgr)
+    contiguous = cache.contiguous()
+    assert contiguous.flags['C_CONTIGUOUS'] and np.array_equal(contiguous, bgr)
+    assert cache.contiguous() is contiguous
+    cache.gray()
+    cache.resized((4, 3))
+    assert cache.stats() == {'computed': 3, 'skipped': 3}  # contiguous, gray, resized; the copy is reused by both
+    # Contiguous frames are used as they are
+    assert FrameCache(contiguous).contiguous() is contiguous
+
+if __name__ == "__main__":
+    test_streamed_frames_survive_ring_wraparound()
+    test_stream_starts_capture_engines_it_needs()
+    test_skipped_video_reuses_a_stable_frame()
+    test_frame_path_views_share_the_ring_and_copy_once_for_opencv()
+    print("InputOrchestrator frame retention tests passed.")
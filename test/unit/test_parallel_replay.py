@@ -0,0 +1,132 @@
+import tempfile
+import numpy as np
+from replay.session_writer import SessionWriter
+from replay import parallel_replay
+from replay.parallel_replay import ParallelReplay, plan_shards
+
+def _record(path, n_frames=40):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+    with SessionWriter(path, samplerate=100) as writer:
+        for i in range(n_frames):
+            frame = background.copy()
+            if i % 3 == 0:
+                frame[:, :40] = 255 - frame[:, :40]  # Motion/change every third frame
+            writer.write_frame(frame, 1000.0 + i * 0.1)
+            writer.write_audio(np.full((10, 2), i, dtype=np.int16), 1000.0 + i * 0.1)
+
+def test_plan_shards_cover_frames_with_overlap():
+    times = 1000.0 + np.arange(100) * 0.1
+    shards = plan_shards(times, 4, overlap_seconds=0.5)
+    assert shards[0] == (0, 0, shards[0][2])
+    assert [s[1] for s in shards[1:]] == [s[2] for s in shards[:-1]]  # Contiguous, disjoint
+    assert shards[-1][2] == 100
+    assert all(start - warmup == 5 for warmup, start, _ in shards[1:])
+
+def test_sharded_replay_matches_sequential():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _record(tmpdir)
+        sequential = list(ParallelReplay(tmpdir, workers=1, shards_per_worker=1, read_text=False, audio=True).run())
+        sharded = list(ParallelReplay(tmpdir, workers=2, shards_per_worker=3, overlap_seconds=0.5, read_text=False, audio=True).run())
+        assert [(t, i, m) for t, i, m, _ in sharded] == [(t, i, m) for t, i, m, _ in sequential]
+        assert [r[1] for r in sharded if r[2] == 'visual'] == list(range(40))
+        for a, b in zip(sequential, sharded):
+            if a[2] == 'visual':
+                keys = ('motion_detected', 'change_detected', 'light_dark', 'objects')
+                assert {k: a[3][k] for k in keys} == {k: b[3][k] for k in keys}
+
+class _FakeTesseract:
+    # Deterministic stand-in for pytesseract: the text names the region's pixel value
+    def image_to_string(self, roi):
+        return f"text{int(roi[0, 0])}"
+
+def test_sharded_text_matches_sequential_on_reused_workers():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with SessionWriter(tmpdir, samplerate=100) as writer:
+            for i in range(40):
+                # Two static screens: OCR is change-gated, so text is only re-read at frame 0 and frame 20
+                writer.write_frame(np.full((30, 40, 3), 50 if i < 20 else 150, dtype=np.uint8), 1000.0 + i * 0.1)
+        replay = ParallelReplay(tmpdir, workers=1, shards_per_worker=6, read_text=True,
+                                visual_options={'text_regions': [(0, 0, 10, 10)]})
+        try:
+            parallel_replay._init_worker(replay.options)
+            parallel_replay._worker['visual'].text_reader._pytesseract = _FakeTesseract()
+            sequential = parallel_replay._replay_shard(tmpdir, (0, 0, replay.n_frames), replay.options)
+            # A pool worker may be handed a later shard before an earlier one: run them in reverse
+            by_shard = {shard: parallel_replay._replay_shard(tmpdir, shard, replay.options)
+                        for shard in reversed(replay.shards)}
+        finally:
+            parallel_replay._close_worker()
+        sharded = [r for shard in replay.shards for r in by_shard[shard]]
+        assert [r[3]['text'] for r in sharded] == [r[3]['text'] for r in sequential]
+        assert {r[3]['text'] for r in sequential} == {'text50', 'text150'}
+
+def test_reset_drops_async_detections():
+    import time
+    from visual.async_worker import LatestFrameWorker
+    from visual.perception import VisualPerception
+    vp = VisualPerception(async_detection=True, subscriptions=())
+    # No YOLO weights here: stand in a worker with a deterministic detector
+    vp._detection_worker = LatestFrameWorker(lambda frame: [{'label': 'old', 'confidence': 1.0, 'box': [0, 0, 1, 1]}])
+    vp._detection_worker.start()
+    try:
+        frame = np.zeros((30, 40, 3), dtype=np.uint8)
+        vp.process_frame(frame, 1000.0)
+        deadline = time.time() + 1.0
+        while vp._detection_worker.latest() is None and time.time() < deadline:
+            time.sleep(0.005)
+        assert vp.process_frame(frame, 1000.1)['objects']['value'] == ['old']
+        vp.reset()
+        vp._detection_worker.process_fn = lambda frame: time.sleep(0.2) or []  # New stream: nothing detected yet
+        obs = vp.process_frame(frame, 2000.0)
+        assert obs['objects']['value'] == [] and obs['objects']['frame_timestamp'] == 0.0
+    finally:
+        vp.close()
+
+def _fake_detect_objects_batch(self, frames):
+    # Deterministic stand-in for YOLO: the label names the frame it was detected in (pixel tag)
+    return [[{'label': f"frame{int(frame[0, 0, 0])}", 'confidence': 1.0, 'box': [0, 0, 1, 1]}] for frame in frames]
+
+def test_sharded_detection_schedule_matches_sequential():
+    from visual.perception import VisualPerception
+    original = VisualPerception._detect_objects_batch
+    VisualPerception._detect_objects_batch = _fake_detect_objects_batch
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SessionWriter(tmpdir, samplerate=100) as writer:
+                for i in range(40):
+                    writer.write_frame(np.full((30, 40, 3), i, dtype=np.uint8), 1000.03 + i * 0.1)
+            options = {'detection_interval': 0.5}
+            sequential = list(ParallelReplay(tmpdir, workers=1, shards_per_worker=1, read_text=False,
+                                             visual_options=options).run())
+            # In-process shards (same code path as the pool workers), each reset and warmed up on its own
+            sharded_replay = ParallelReplay(tmpdir, workers=1, shards_per_worker=6, read_text=False, visual_options=options)
+            assert len(sharded_replay.shards) == 6 and sharded_replay.overlap_seconds >= 0.5
+            sharded = list(sharded_replay.run())
+            keys = ('objects', 'object_detections', 'motion_detected', 'change_detected', 'light_dark')
+            assert [{k: r[3][k] for k in keys} for r in sharded] == [{k: r[3][k] for k in keys} for r in sequential]
+            assert len({tuple(r[3]['objects']) for r in sequential}) > 4  # Detections actually ran periodically
+    finally:
+        VisualPerception._detect_objects_batch = original
+
+def test_in_process_replays_use_their_own_options():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _record(tmpdir, n_frames=6)
+        seen = []
+        for interval in (0.5, 2.0):
+            replay = ParallelReplay(tmpdir, workers=1, read_text=False, visual_options={'detection_interval': interval})
+            shard = replay.shards[0]
+            parallel_replay._replay_shard(tmpdir, shard, replay.options)
+            seen.append(parallel_replay._worker['visual'].detection_interval)
+            list(replay.run())
+            assert parallel_replay._worker == {}  # Per-run state is released when the run ends
+        assert seen == [0.5, 2.0]
+
+if __name__ == "__main__":
+    test_plan_shards_cover_frames_with_overlap()
+    test_sharded_replay_matches_sequential()
+    test_sharded_text_matches_sequential_on_reused_workers()
+    test_reset_drops_async_detections()
+    test_sharded_detection_schedule_matches_sequential()
+    test_in_process_replays_use_their_own_options()
+    print("Parallel replay tests passed.")
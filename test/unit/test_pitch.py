@@ -0,0 +1,31 @@
+import numpy as np
+from audio.perception import pitch_detection, pitch_track
+from benchmarks.bench_pitch import legacy_pitch_detection, make_chunk
+
+def test_fft_pitch_matches_legacy_autocorrelation():
+    chunk = make_chunk(0.25)
+    assert pitch_detection(chunk, 44100) == legacy_pitch_detection(chunk, 44100)
+    left, right = pitch_detection(chunk, 44100)
+    assert abs(left - 220) < 2 and abs(right - 330) < 3
+
+def test_pitch_detection_silence_and_short_chunks():
+    assert pitch_detection(np.zeros((44100, 2), dtype=np.int16), 44100) == [None, None]
+    assert pitch_detection(np.ones((100, 2), dtype=np.int16), 44100) == [None, None]
+
+def test_pitch_track_follows_a_glide():
+    sr = 16000
+    t = np.arange(sr) / sr
+    freq = np.where(t < 0.5, 200.0, 400.0)
+    tone = np.sin(2 * np.pi * np.cumsum(freq) / sr)
+    chunk = (np.stack([tone, np.zeros_like(tone)], axis=1) * 20000).astype(np.int16)
+    times, pitches = pitch_track(chunk, sr)
+    assert pitches.shape == (len(times), 2)
+    assert np.all(np.isnan(pitches[:, 1]))  # Silent channel is unvoiced
+    early, late = pitches[times < 0.45, 0], pitches[times > 0.55, 0]
+    assert abs(np.median(early) - 200) < 5 and abs(np.median(late) - 400) < 10
+
+if __name__ == "__main__":
+    test_fft_pitch_matches_legacy_autocorrelation()
+    test_pitch_detection_silence_and_short_chunks()
+    test_pitch_track_follows_a_glide()
+    print("Pitch tests passed.")
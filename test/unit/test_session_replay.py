@@ -0,0 +1,67 @@
+import tempfile
+import numpy as np
+from replay.session_writer import SessionWriter
+from replay.session_reader import SessionReader
+
+def _record(path, frame_codec=None, n_frames=20):
+    frames = [np.full((24, 32, 3), i, dtype=np.uint8) for i in range(n_frames)]
+    t0 = 1000.0
+    with SessionWriter(path, frame_codec=frame_codec, samplerate=100, channels=2) as writer:
+        for i, frame in enumerate(frames):
+            writer.write_frame(frame, t0 + i * 0.1)
+            # 10 samples per 0.1 s frame, first sample at the frame time
+            writer.write_audio(np.full((10, 2), i, dtype=np.int16), t0 + i * 0.1)
+            writer.write_events([(t0 + i * 0.1 + 0.05, 'key_press', f"'k{i}'"), (t0 + i * 0.1 + 0.06, 'mouse_move', (i, i))])
+    return frames, t0
+
+def test_random_access_and_zero_copy_views():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames, t0 = _record(tmpdir)
+        reader = SessionReader(tmpdir)
+        assert len(reader) == 20
+        frame = reader.frame(7)
+        assert np.array_equal(frame, frames[7])
+        assert not frame.flags.writeable and not frame.flags.owndata  # View over the memory map
+        frame, ts, index = reader.frame_at(t0 + 0.75)
+        assert index == 7 and ts == t0 + 0.7
+        assert reader.index_at(t0 - 5) == 0
+        audio = reader.audio_range(t0 + 0.3, t0 + 0.5)
+        assert audio.shape == (20, 2) and audio[0, 0] == 3 and audio[-1, 0] == 4
+        events = reader.events_range(t0 + 0.3, t0 + 0.5)
+        assert [e[1] for e in events] == ['key_press', 'mouse_move'] * 2
+        assert events[1][2] == (3, 3)
+        del frame, audio
+        reader.close()
+
+def test_sequential_prefetch_and_observations():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames, t0 = _record(tmpdir)
+        with SessionReader(tmpdir, prefetch=3) as reader:
+            seen = [(i, f[0, 0, 0]) for i, _, f in reader.iter_frames(step=2)]
+            assert seen == [(i, i) for i in range(0, 20, 2)]
+            # Stopping early must not leave the prefetch thread blocked
+            for i, _, _ in reader.iter_frames():
+                if i == 3:
+                    break
+            observations = list(reader.iter_observations(start=5, stop=8))
+            assert [o['video_frame_index'] for o in observations] == [5, 6, 7]
+            assert len(observations[1]['audio_chunk']) == 10
+            assert len(observations[1]['events']) == 2
+
+def test_encoded_session_roundtrip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames, t0 = _record(tmpdir, frame_codec='png', n_frames=5)
+        with SessionReader(tmpdir) as reader:
+            assert reader.encoded
+            assert all(np.array_equal(f, frames[i]) for i, _, f in reader.iter_frames())
+        try:
+            SessionWriter(tmpdir + '/delta', frame_codec='delta')
+            assert False, "stateful codecs need sequential decoding and are rejected"
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    test_random_access_and_zero_copy_views()
+    test_sequential_prefetch_and_observations()
+    test_encoded_session_roundtrip()
+    print("Session replay tests passed.")
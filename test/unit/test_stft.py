@@ -0,0 +1,52 @@
+import numpy as np
+from audio.stft import STFTEngine, pick_onsets
+from audio.perception import AudioPerception, StreamingAudioPerception, spatial_localization, spectral_centroid
+
+SR = 44100
+
+def _tone(freq, seconds=0.5, left_gain=1.0, right_gain=1.0):
+    t = np.arange(int(seconds * SR)) / SR
+    tone = 0.3 * np.sin(2 * np.pi * freq * t)
+    return (np.stack([left_gain * tone, right_gain * tone], axis=1) * 32767).astype(np.int16)
+
+def test_centroid_and_band_energies_follow_the_tone():
+    spectrogram = STFTEngine(SR).compute(_tone(1000))
+    assert len(spectrogram) == 1 + (int(0.5 * SR) - 1024) // 512
+    assert np.all(np.abs(spectrogram.centroid() - 1000) < 150)
+    energies = spectrogram.band_energies([(20, 250), (250, 2000), (2000, 8000)])
+    assert energies.shape == (len(spectrogram), 3, 2)
+    assert np.all(energies[:, 1] > 100 * energies[:, 0])
+    left, right = spectral_centroid(_tone(1000), SR)
+    assert abs(left - 1000) < 150 and abs(right - 1000) < 150
+
+def test_interaural_cues_and_localization():
+    cues = STFTEngine(SR).compute(_tone(500, right_gain=0.25)).interaural()
+    assert np.all(cues['ild_db'] > 10) and cues['lateralization'] < -0.8  # Louder on the left
+    assert np.all(np.abs(cues['ipd']) < 0.01)  # In phase
+    assert spatial_localization(_tone(500, left_gain=0.0), SR) == 1.0
+
+def test_flux_onsets_and_compact_observation():
+    signal = np.zeros((SR, 2), dtype=np.int16)
+    signal[SR // 2:] = _tone(800, seconds=0.5)
+    spectrogram = STFTEngine(SR).compute(signal)
+    onsets = pick_onsets(spectrogram.flux(), spectrogram.times)
+    assert len(onsets) == 1 and abs(onsets[0] - 0.5) < 0.03
+    obs = AudioPerception(SR).process_chunk(signal, chunk_timestamp=0.0)
+    assert obs['envelope']['value'].shape[1] == 2 and obs['envelope']['value'].shape[0] < 100
+    assert obs['spectral_centroid']['value'].shape == (len(spectrogram), 2)
+    assert obs['onset']['value']['onset_times'] == onsets
+
+def test_streaming_spectral_features_span_short_chunks():
+    ap = StreamingAudioPerception(SR)
+    first = ap.process_chunk(_tone(1000, seconds=0.02), chunk_timestamp=0.0)  # 882 samples: no full frame yet
+    assert first['spectral_centroid']['value'] is None
+    second = ap.process_chunk(_tone(1000, seconds=0.02), chunk_timestamp=0.02)
+    assert abs(second['spectral_centroid']['value'][0] - 1000) < 200
+    assert second['spatial_localization']['value'] == 0.0
+
+if __name__ == "__main__":
+    test_centroid_and_band_energies_follow_the_tone()
+    test_interaural_cues_and_localization()
+    test_flux_onsets_and_compact_observation()
+    test_streaming_spectral_features_span_short_chunks()
+    print("STFT tests passed.")
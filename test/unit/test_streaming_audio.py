@@ -0,0 +1,38 @@
+import numpy as np
+from audio.perception import StreamingAudioPerception, bandpass_filter, butter_bandpass_sos
+
+def _tone(seconds=0.2, sample_rate=44100):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    left = 8000 * np.sin(2 * np.pi * 1000 * t)
+    right = 8000 * np.sin(2 * np.pi * 60 * t)  # Below the 300-3400 Hz band
+    return np.stack([left, right], axis=1).astype(np.int16)
+
+def test_sos_design_is_cached():
+    assert butter_bandpass_sos(300, 3400, 44100) is butter_bandpass_sos(300, 3400, 44100)
+    filtered = bandpass_filter(_tone(), 300, 3400, 44100)
+    assert filtered.shape == (8820, 2)
+
+def test_streaming_state_matches_one_long_filter():
+    signal = _tone()
+    ap = StreamingAudioPerception(sample_rate=44100)
+    chunks = np.array_split(signal, 10)  # 20 ms chunks
+    streamed = np.concatenate([ap._filter((300, 3400), c.astype(np.float64)) for c in chunks])
+    ap.reset()
+    whole = ap._filter((300, 3400), signal.astype(np.float64))
+    assert np.allclose(streamed, whole)
+
+def test_process_chunk_returns_compact_summaries():
+    ap = StreamingAudioPerception(sample_rate=44100)
+    chunks = np.array_split(_tone(), 10)
+    for chunk in chunks:
+        obs = ap.process_chunk(chunk, chunk_timestamp=0.0)
+    band = obs['bandpass_300_3400Hz']['value']
+    assert len(band) == 2 and band[0] > 10 * band[1]  # 1 kHz passes, 60 Hz is attenuated
+    assert len(obs['envelope']['value']['peak']) == 2
+    assert len(obs['onset']['value']) == 2
+
+if __name__ == "__main__":
+    test_sos_design_is_cached()
+    test_streaming_state_matches_one_long_filter()
+    test_process_chunk_returns_compact_summaries()
+    print("Streaming audio tests passed.")
@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+from visual.text_reader import TextReader, propose_text_regions
+
+class FakeTesseract:
+    def __init__(self):
+        self.calls = 0
+
+    def image_to_string(self, roi):
+        self.calls += 1
+        return f"text{roi.shape}"
+
+def make_frame():
+    frame = np.full((360, 640), 200, dtype=np.uint8)
+    cv2.putText(frame, "Hello traveler, welcome", (40, 300), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+    cv2.putText(frame, "HP 100", (500, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 0, 2)
+    return frame
+
+def test_propose_text_regions_finds_text_lines():
+    regions = propose_text_regions(make_frame())
+    assert len(regions) == 2
+    assert any(y < 300 < y + h for x, y, w, h in regions)
+
+def test_text_reader_gates_on_change_and_caches_regions():
+    reader = TextReader(async_ocr=False)
+    reader._pytesseract = tesseract = FakeTesseract()
+    frame = make_frame()
+    first = reader.read(frame)
+    assert tesseract.calls == 2
+    # Unchanged frame: cached text, no OCR at all
+    assert reader.read(frame, changed=False) == first
+    assert reader.frames_skipped == 1
+    # Changed frame with identical regions: served from the region-hash cache
+    assert reader.read(frame.copy(), changed=True) == first
+    assert tesseract.calls == 2 and reader.regions_cached == 2
+
+def test_text_reader_reset_forgets_last_text():
+    reader = TextReader(async_ocr=False)
+    reader._pytesseract = FakeTesseract()
+    reader.read(make_frame())
+    reader.reset()
+    # New stream: an 'unchanged' first frame is read, not served the previous stream's text
+    assert reader.read(np.full((360, 640), 200, dtype=np.uint8), changed=False) == ""
+    assert reader.frames_skipped == 0
+
+if __name__ == "__main__":
+    test_propose_text_regions_finds_text_lines()
+    test_text_reader_gates_on_change_and_caches_regions()
+    test_text_reader_reset_forgets_last_text()
+    print("TextReader tests passed.")
@@ -0,0 +1,61 @@
+from input.tick_scheduler import TickScheduler
+
+class FakeClock:
+    """Virtual monotonic clock: sleep() and work() advance it instantly, so tests do not depend on machine load."""
+    def __init__(self, start=100.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+def _scheduler(rate_hz):
+    clock = FakeClock()
+    return TickScheduler(rate_hz=rate_hz, clock=clock, sleep=clock.sleep), clock
+
+def test_tick_scheduler_holds_rate_without_drift():
+    scheduler, clock = _scheduler(100)
+    start = clock()
+    for _ in range(20):
+        scheduler.wait()
+        clock.work(0.004)  # Work inside the tick must not stretch the period
+        scheduler.record_stage('work', 0.004)
+    # 20 ticks start at 0, 10, ..., 190 ms; the last one's work ends at 194 ms
+    assert abs((clock() - start) - 0.194) < 1e-9
+    stats = scheduler.stats()
+    assert stats['ticks'] == 20 and stats['missed_deadlines'] == 0
+    assert stats['jitter_max_ms'] < 1e-6
+    assert abs(stats['stages']['work']['mean_ms'] - 4.0) < 1e-9
+
+def test_tick_scheduler_counts_and_skips_missed_deadlines():
+    scheduler, clock = _scheduler(100)
+    scheduler.wait()
+    clock.work(0.055)  # Overrun by 4.5 periods
+    scheduler.wait()
+    assert scheduler.missed_deadlines == 1  # One overrunning tick
+    assert scheduler.skipped_ticks == 4
+    # Next tick is back on schedule rather than bursting to catch up
+    assert abs(scheduler.remaining() - 0.005) < 1e-9
+
+def test_tick_scheduler_counts_small_overruns():
+    scheduler, clock = _scheduler(50)
+    scheduler.wait()
+    clock.work(0.025)  # Past the deadline by less than one period
+    scheduler.wait()
+    assert scheduler.missed_deadlines == 1 and scheduler.skipped_ticks == 0
+    clock.work(0.005)
+    scheduler.wait()  # On time
+    assert scheduler.stats()['missed_deadlines'] == 1
+
+if __name__ == "__main__":
+    test_tick_scheduler_holds_rate_without_drift()
+    test_tick_scheduler_counts_and_skips_missed_deadlines()
+    test_tick_scheduler_counts_small_overruns()
+    print("TickScheduler tests passed.")
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import time
+from tracing.tracer import Tracer, NULL_SPAN, DEBUG, INFO, WARN, OFF
+
+class CountingValue:
+    """Counts how often it is formatted."""
+    formatted = 0
+
+    def __format__(self, spec):
+        CountingValue.formatted += 1
+        return 'value'
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(level=OFF)
+    assert not tracer.enabled(DEBUG)
+    assert tracer.span('x') is NULL_SPAN
+    tracer.debug('x', 'never {value}', value=1)
+    assert tracer.events() == []
+
+def test_levels_sampling_and_ring_capacity():
+    tracer = Tracer(level=INFO, capacity=8)
+    tracer.debug('hidden')
+    tracer.info('shown')
+    assert [e[4] for e in tracer.events()] == ['shown']
+    tracer.clear()
+    tracer.sample('hot', 4)
+    for i in range(20):
+        tracer.info('hot', i=i)
+    assert [e[6]['i'] for e in tracer.events()] == [0, 4, 8, 12, 16]
+    for i in range(20):
+        tracer.event(WARN, 'cold', i=i)
+    assert len(tracer.events()) == 8  # Oldest dropped
+
+def test_messages_are_formatted_lazily_and_spans_timed():
+    tracer = Tracer(level=DEBUG)
+    CountingValue.formatted = 0
+    tracer.debug('lazy', 'got {value}', value=CountingValue())
+    assert CountingValue.formatted == 0
+    with tracer.span('work', size=3) as span:
+        time.sleep(0.01)
+        span.set(result='ok')
+    kind, _, duration, _, name, _, fields, _ = tracer.events()[-1]
+    assert (kind, name, fields) == ('span', 'work', {'size': 3, 'result': 'ok'}) and duration >= 0.009
+    assert tracer.summary()['work']['count'] == 1
+
+def test_flush_to_json_lines_and_chrome_trace():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lines_path = os.path.join(tmpdir, 'trace.jsonl')
+        tracer = Tracer(level=DEBUG, output=lines_path, flush_interval=0.01)
+        tracer.debug('decode', 'reshaped to {shape}', shape=(2, 3))
+        tracer.close()
+        record = json.loads(open(lines_path).readline())
+        assert record['name'] == 'decode' and record['message'] == 'reshaped to (2, 3)'
+        chrome_path = os.path.join(tmpdir, 'trace.json')
+        tracer = Tracer(level=DEBUG, output=chrome_path, flush_interval=0.01)
+        with tracer.span('capture'):
+            pass
+        tracer.info('instant')
+        tracer.close()
+        events = json.load(open(chrome_path))['traceEvents']
+        assert [(e['name'], e['ph']) for e in events] == [('capture', 'X'), ('instant', 'i')]
+
+def test_chrome_trace_is_streamed_across_flushes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        chrome_path = os.path.join(tmpdir, 'trace.json')
+        tracer = Tracer(level=DEBUG, output=chrome_path, flush_interval=60.0)
+        for i in range(3):
+            tracer.debug('tick', index=i)
+            tracer.flush()
+            assert not tracer.events()  # Written out, not kept until close()
+        assert os.path.getsize(chrome_path) > 0
+        tracer.close()
+        events = json.load(open(chrome_path))['traceEvents']
+        assert [e['args']['index'] for e in events] == [0, 1, 2]
+
+if __name__ == "__main__":
+    test_disabled_tracer_records_nothing()
+    test_levels_sampling_and_ring_capacity()
+    test_messages_are_formatted_lazily_and_spans_timed()
+    test_flush_to_json_lines_and_chrome_trace()
+    test_chrome_trace_is_streamed_across_flushes()
+    print("All tracer tests passed.")
@@ -0,0 +1,68 @@
+import threading
+import time
+import numpy as np
+from visual.perception import VisualPerception
+
+def test_process_batch_matches_process_frame():
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (60, 80, 3), dtype=np.uint8) for _ in range(4)]
+    frames[2] = frames[1].copy()  # No motion between frames 1 and 2
+    timestamps = [float(i) for i in range(4)]
+    batch = VisualPerception(async_detection=False).process_batch(frames, timestamps, read_text=False)
+    vp = VisualPerception(async_detection=False)
+    single = [vp.process_frame(f, t) for f, t in zip(frames, timestamps)]
+    assert len(batch) == len(frames)
+    for key in ('edges', 'dominant_color', 'motion_detected', 'change_detected', 'light_dark'):
+        assert [o[key]['value'] for o in batch] == [o[key]['value'] for o in single], key
+    assert [o['motion_detected']['value'] for o in batch][2] is False
+
+def test_process_batch_shares_gray_and_follows_subscriptions():
+    rng = np.random.default_rng(1)
+    frames = [rng.integers(0, 255, (60, 80, 3), dtype=np.uint8) for _ in range(3)]
+    vp = VisualPerception(async_detection=False, subscriptions=['light_dark', 'visual_attention', 'motion_detected'])
+    batch = vp.process_batch(frames, [0.0, 1.0, 2.0], read_text=False)
+    assert all(set(o) >= {'light_dark', 'visual_attention', 'motion_detected'} for o in batch)
+    assert all('edges' not in o and 'text' not in o for o in batch)
+    stats = vp.conversion_stats()
+    # One grayscale conversion per frame (the batch one), reused by attention and motion
+    assert stats['computed'] == len(frames) and stats['skipped'] >= 2 * len(frames), stats
+
+class ConcurrencyCheckingNet:
+    """cv2.dnn.Net stand-in that fails if two forward passes overlap; returns stacked (N * rows, 85) outputs."""
+    def __init__(self):
+        self.active = 0
+        self.overlaps = 0
+        self.batch = 1
+
+    def setInput(self, blob):
+        self.active += 1
+        if self.active > 1:
+            self.overlaps += 1
+        self.batch = blob.shape[0]
+
+    def getUnconnectedOutLayersNames(self):
+        return ['out']
+
+    def forward(self, names):
+        time.sleep(0.002)
+        self.active -= 1
+        return [np.zeros((self.batch * 3, 85), dtype=np.float32)]
+
+def test_batch_and_single_detection_share_the_net_safely():
+    vp = VisualPerception(async_detection=False)
+    vp.net = ConcurrencyCheckingNet()
+    frames = [np.zeros((60, 80, 3), dtype=np.uint8)] * 3
+    threads = [threading.Thread(target=lambda: [vp.detect_objects(frames[0]) for _ in range(20)]),
+               threading.Thread(target=lambda: [vp._detect_objects_batch(frames) for _ in range(20)])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert vp.net.overlaps == 0
+    assert vp._detect_objects_batch(frames) == [[], [], []]
+
+if __name__ == "__main__":
+    test_process_batch_matches_process_frame()
+    test_process_batch_shares_gray_and_follows_subscriptions()
+    test_batch_and_single_detection_share_the_net_safely()
+    print("VisualPerception.process_batch test passed.")
@@ -1,7 +1,39 @@
 import os
 import tempfile
+import threading
+import time
+import numpy as np
 from visual.visual_capture import VisualInputCapture
 
+class FakeScreenShot:
+    def __init__(self, raw, width, height):
+        self.raw = raw
+        self.size = (width, height)
+
+class FakeSession:
+    """Stand-in for an mss session: grab n returns fixed BGRA bytes filled with n (mod 256)."""
+    sessions = []
+
+    def __init__(self):
+        self.thread = threading.current_thread().name
+        self.grabs = 0
+        self.closed = False
+        FakeSession.sessions.append(self)
+
+    def grab(self, region):
+        self.grabs += 1
+        raw = np.full((region['height'], region['width'], 4), self.grabs % 256, dtype=np.uint8).tobytes()
+        return FakeScreenShot(raw, region['width'], region['height'])
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 def test_visual_input_capture_pause_resume():
     region = {"top": 0, "left": 0, "width": 100, "height": 100}
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -18,6 +50,41 @@ def test_visual_input_capture_pause_resume():
         frame = capture.get_frame()
         assert frame is not None
 
+def test_background_capture_thread_rotates_ring():
+    region = {"top": 0, "left": 0, "width": 8, "height": 6}
+    FakeSession.sessions = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        capture = VisualInputCapture(region, tmpdir, frame_rate=200, ring_size=3, session_factory=FakeSession)
+        assert capture.get_latest() == (None, None, None)
+        capture.start()
+        thread = capture._thread
+        seen = []
+        deadline = time.time() + 2.0
+        while (not seen or seen[-1][0] < 8) and time.time() < deadline:
+            frame, timestamp, seq = capture.get_latest()
+            if seq is not None and (not seen or seq != seen[-1][0]):
+                seen.append((seq, timestamp, capture.get_latest_monotonic()))
+            time.sleep(0.002)
+        capture.stop()
+        assert not thread.is_alive() and capture._thread is None and not capture.running
+        # Sequence numbers increase, capture timestamps (wall and monotonic) never go backwards
+        assert len(seen) >= 2 and seen[-1][0] >= 8
+        assert all(a[0] < b[0] and a[1] <= b[1] and a[2] <= b[2] for a, b in zip(seen, seen[1:]))
+        # One session, owned (and closed) by the capture thread
+        assert [(s.thread, s.closed) for s in FakeSession.sessions] == [("VisualCaptureThread", True)]
+        # The latest frame is the newest ring slot, and slots rotate through the ring
+        frame, _, seq = capture.get_latest()
+        assert seq == capture.frame_seq == FakeSession.sessions[0].grabs
+        assert capture._ring.index == (seq - 1) % 3
+        assert np.shares_memory(frame, capture._ring.buffers[capture._ring.index])
+        assert frame.shape == (6, 8, 3) and np.all(frame == seq % 256)
+        assert [int(capture._ring.buffers[(seq - k - 1) % 3][0, 0, 0]) for k in range(3)] == [(seq - k) % 256 for k in range(3)]
+        # Paused: no frame is handed out
+        capture.pause()
+        assert capture.get_latest() == (None, None, None)
+        capture.close()
+
 if __name__ == "__main__":
     test_visual_input_capture_pause_resume()
-    print("VisualInputCapture pause/resume test passed.")
+    test_background_capture_thread_rotates_ring()
+    print("VisualInputCapture tests passed.")
@@ -0,0 +1,25 @@
+import numpy as np
+from visual.perception import decode_yolo_outputs
+
+def test_decode_yolo_outputs_boxes_and_confidences():
+    n_classes = 80
+    out = np.zeros((4, 5 + n_classes), dtype=np.float32)
+    # Two overlapping detections of class 3 (NMS keeps the stronger) and one of class 7
+    out[0, :4] = [0.5, 0.5, 0.2, 0.2]; out[0, 5 + 3] = 0.9
+    out[1, :4] = [0.51, 0.5, 0.2, 0.2]; out[1, 5 + 3] = 0.8
+    out[2, :4] = [0.1, 0.1, 0.1, 0.1]; out[2, 5 + 7] = 0.7
+    out[3, :4] = [0.9, 0.9, 0.1, 0.1]; out[3, 5 + 1] = 0.3  # Below threshold
+    boxes, confidences, class_ids = decode_yolo_outputs([out[:2], out[2:]], (100, 200, 3))
+    assert class_ids.tolist() == [3, 7]
+    assert np.allclose(confidences, [0.9, 0.7])
+    assert boxes.tolist() == [[80, 40, 40, 20], [10, 5, 20, 10]]
+
+def test_decode_yolo_outputs_empty():
+    out = np.zeros((10, 85), dtype=np.float32)
+    boxes, confidences, class_ids = decode_yolo_outputs([out], (100, 100, 3))
+    assert boxes.shape == (0, 4) and len(confidences) == 0 and len(class_ids) == 0
+
+if __name__ == "__main__":
+    test_decode_yolo_outputs_boxes_and_confidences()
+    test_decode_yolo_outputs_empty()
+    print("YOLO decode tests passed.")
@@ -0,0 +1,345 @@
+"""
+tracer.py
+
+Low-overhead structured tracing for hot paths (replaces per-call print debugging).
+- Leveled events (DEBUG/INFO/WARN/ERROR) and span timings are appended as tuples to an in-memory ring buffer;
+  nothing is formatted or written on the calling thread.
+- Messages are format templates filled from the event's fields only when the event is exported, so a
+  dropped or never-flushed event costs no string formatting.
+- Per-name sampling (record 1 in N events of a name) keeps 60 Hz call sites cheap even when tracing is on.
+- A background thread flushes the ring asynchronously to a JSON-lines file, to Chrome trace JSON
+  (chrome://tracing, Perfetto; streamed to the file and closed by close()) or to stdout.
+- Disabled by default: the module-level tracer is configured from environment variables, and call sites
+  guard on tracer.enabled(level) (one attribute compare) or use span(), which returns a shared no-op
+  context manager when disabled.
+
+Environment:
+    EMBODIED_TRACE         level name (debug, info, warn, error) or off (default)
+    EMBODIED_TRACE_FILE    output path; '.json' writes Chrome trace format, anything else JSON lines;
+                           '-' prints formatted events to stdout
+    EMBODIED_TRACE_SAMPLE  default sampling: record 1 in N events per name (default 1)
+    EMBODIED_TRACE_BUFFER  ring buffer capacity in events (default 65536)
+"""
+
+import atexit
+import collections
+import json
+import os
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+OFF = 100
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warn': WARN, 'warning': WARN, 'error': ERROR, 'off': OFF}
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARN: 'WARN', ERROR: 'ERROR'}
+
+
+class _NullSpan:
+    """Shared no-op span returned when tracing is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, level, fields):
+        self.tracer = tracer
+        self.name = name
+        self.level = level
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def set(self, **fields):
+        """Attach fields known only inside the span (e.g., a result size)."""
+        self.fields.update(fields)
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.tracer._buffer.append(('span', self.start, end - self.start, self.level, self.name, None,
+                                    self.fields, threading.get_ident()))
+        return False
+
+
+def _text(event):
+    # Fill the message template (or list the fields); the only place event text is formatted
+    kind, _, duration, _, _, message, fields, _ = event
+    if kind == 'span':
+        text = f"{duration * 1000.0:.3f} ms"
+        if fields:
+            text += ' ' + ' '.join(f"{k}={v}" for k, v in fields.items())
+        return text
+    if message is not None:
+        try:
+            return message.format(**fields)
+        except (KeyError, IndexError, ValueError):
+            return f"{message} {fields}"
+    return ' '.join(f"{k}={v}" for k, v in fields.items())
+
+
+def format_event(event):
+    """Human-readable line for a recorded event."""
+    wall = time.strftime('%H:%M:%S', time.localtime(_wall_time(event[1])))
+    return f"[{LEVEL_NAMES.get(event[3], event[3])}] {wall} {event[4]}: {_text(event)}"
+
+
+# perf_counter -> wall clock offset (fixed at import; exported timestamps are approximate wall times)
+_PERF_TO_WALL = time.time() - time.perf_counter()
+
+
+def _wall_time(perf_time):
+    return _PERF_TO_WALL + perf_time
+
+
+def _json_safe(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    return str(value)
+
+
+class Tracer:
+    def __init__(self, level=OFF, capacity=65536, sample_every=1, output=None, flush_interval=1.0):
+        """
+        level: minimum level recorded (OFF disables everything)
+        capacity: ring buffer size in events; the oldest events are dropped when it is full
+        sample_every: default sampling; record 1 in N events per name (spans and events)
+        output: None (keep in memory only), '-' (stdout), a '.json' path (Chrome trace) or another path (JSON lines)
+        flush_interval: seconds between background flushes when output is set
+        """
+        self.level = level
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.output = output
+        self.flush_interval = flush_interval
+        self._buffer = collections.deque(maxlen=capacity)
+        self._sampling = {}  # Name -> N (overrides sample_every)
+        self._counters = collections.Counter()
+        self._last_due = {}
+        self._flush_lock = threading.Lock()
+        self._chrome_open = False  # Chrome trace JSON is one document: its array is streamed, then closed on close()
+        self._thread = None
+        self._stop = threading.Event()
+        if output is not None and level < OFF:
+            self.start()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        level = LEVELS.get(environ.get('EMBODIED_TRACE', 'off').strip().lower(), OFF)
+        return cls(
+            level=level,
+            capacity=int(environ.get('EMBODIED_TRACE_BUFFER', 65536)),
+            sample_every=max(1, int(environ.get('EMBODIED_TRACE_SAMPLE', 1))),
+            output=environ.get('EMBODIED_TRACE_FILE') or None,
+        )
+
+    def configure(self, level=None, sample_every=None, output=None):
+        """Change level/sampling/output at runtime (e.g., from a test or a debugging session)."""
+        if level is not None:
+            self.level = LEVELS[level.lower()] if isinstance(level, str) else level
+        if sample_every is not None:
+            self.sample_every = max(1, sample_every)
+        if output is not None:
+            self.output = output
+        if self.output is not None and self.level < OFF:
+            self.start()
+
+    def enabled(self, level=DEBUG):
+        """Cheap guard for call sites that would build fields: `if tracer.enabled(DEBUG): tracer.event(...)`."""
+        return level >= self.level
+
+    def sample(self, name, every):
+        """Record only 1 in every events/spans named name."""
+        self._sampling[name] = max(1, every)
+
+    def _sampled(self, name):
+        every = self._sampling.get(name, self.sample_every)
+        if every == 1:
+            return True
+        count = self._counters[name]
+        self._counters[name] = count + 1
+        return count % every == 0
+
+    def due(self, name, interval):
+        """True at most once per interval seconds for name (rate-limits periodic reports such as system stats)."""
+        now = time.monotonic()
+        last = self._last_due.get(name)
+        if last is not None and now - last < interval:
+            return False
+        self._last_due[name] = now
+        return True
+
+    def event(self, level, name, message=None, **fields):
+        """
+        Record an instant event. message is a str.format template filled from fields at export time,
+        e.g. tracer.event(DEBUG, 'visual.decode', 'reshaped to {shape}', shape=frame.shape).
+        """
+        if level < self.level or not self._sampled(name):
+            return
+        self._buffer.append(('event', time.perf_counter(), None, level, name, message, fields, threading.get_ident()))
+
+    def debug(self, name, message=None, **fields):
+        self.event(DEBUG, name, message, **fields)
+
+    def info(self, name, message=None, **fields):
+        self.event(INFO, name, message, **fields)
+
+    def span(self, name, level=DEBUG, **fields):
+        """Time a block: `with tracer.span('audio.capture'): ...`. A shared no-op when not recorded."""
+        if level < self.level or not self._sampled(name):
+            return NULL_SPAN
+        return _Span(self, name, level, fields)
+
+    def events(self):
+        """Snapshot of the ring buffer (oldest first)."""
+        return list(self._buffer)
+
+    def summary(self):
+        """Per-span-name count and duration statistics (ms: mean/max) over the ring buffer."""
+        spans = collections.defaultdict(list)
+        for kind, _, duration, _, name, _, _, _ in self.events():
+            if kind == 'span':
+                spans[name].append(duration)
+        return {name: {'count': len(d), 'mean_ms': 1000.0 * sum(d) / len(d), 'max_ms': 1000.0 * max(d)}
+                for name, d in spans.items()}
+
+    def clear(self):
+        self._buffer.clear()
+
+    # Export
+
+    def _drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self._buffer.popleft())
+            except IndexError:
+                return events
+
+    def flush(self):
+        """Write buffered events to the output (called by the background thread; safe to call directly)."""
+        if self.output is None:
+            return
+        with self._flush_lock:
+            events = self._drain()
+            if not events:
+                return
+            if self.output == '-':
+                for event in events:
+                    print(format_event(event))
+            elif self.output.endswith('.json'):
+                # Append to the open traceEvents array instead of holding events until close()
+                entries = ',\n'.join(json.dumps(entry) for entry in to_chrome_trace(events))
+                with open(self.output, 'a' if self._chrome_open else 'w') as f:
+                    f.write(',\n' + entries if self._chrome_open else '{"traceEvents": [\n' + entries)
+                self._chrome_open = True
+            else:
+                with open(self.output, 'a') as f:
+                    for event in events:
+                        f.write(json.dumps(to_record(event)) + '\n')
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TraceFlusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # Write what is left (and the Chrome trace document) at exit
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[WARN] Tracer flush failed: {e}")
+
+    def close(self):
+        """Stop the flusher, write remaining events and (for Chrome trace output) close the trace document."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.close)
+        self.flush()
+        with self._flush_lock:
+            if self._chrome_open:
+                with open(self.output, 'a') as f:
+                    f.write('\n], "displayTimeUnit": "ms"}\n')
+                self._chrome_open = False
+
+
+def to_record(event):
+    """JSON-serializable dict for an event (JSON-lines export)."""
+    kind, start, duration, level, name, message, fields, thread = event
+    record = {'kind': kind, 'time': _wall_time(start), 'level': LEVEL_NAMES.get(level, level), 'name': name,
+              'thread': thread, 'fields': _json_safe(fields)}
+    if duration is not None:
+        record['duration_ms'] = 1000.0 * duration
+    if message is not None:
+        record['message'] = _text(event)
+    return record
+
+
+def to_chrome_trace(events):
+    """Chrome trace-event dicts: spans as complete ('X') events, events as instant ('i') events (times in us)."""
+    pid = os.getpid()
+    trace = []
+    for event in events:
+        kind, start, duration, level, name, _, fields, thread = event
+        entry = {'name': name, 'cat': LEVEL_NAMES.get(level, str(level)), 'pid': pid, 'tid': thread,
+                 'ts': _wall_time(start) * 1e6, 'args': _json_safe(fields)}
+        if kind == 'span':
+            entry.update(ph='X', dur=duration * 1e6)
+        else:
+            entry.update(ph='i', s='t')
+            if event[5] is not None:
+                entry['args']['message'] = _text(event)
+        trace.append(entry)
+    return trace
+
+
+def system_snapshot():
+    """RAM/CPU/load (psutil) and GPU (GPUtil) figures as a dict; empty entries if the packages are missing."""
+    snapshot = {}
+    try:
+        import psutil
+        vm = psutil.virtual_memory()
+        snapshot.update(ram_used_gb=vm.used / 1024 ** 3, ram_total_gb=vm.total / 1024 ** 3, ram_percent=vm.percent,
+                        cpu_percent=psutil.cpu_percent(interval=None))
+        try:
+            snapshot['load_avg'] = psutil.getloadavg()
+        except (AttributeError, OSError):
+            pass
+    except ImportError:
+        snapshot['psutil'] = 'not installed'
+    try:
+        import GPUtil
+        snapshot['gpus'] = [{'id': gpu.id, 'name': gpu.name, 'load_percent': gpu.load * 100,
+                             'vram_used_mb': gpu.memoryUsed, 'vram_total_mb': gpu.memoryTotal}
+                            for gpu in GPUtil.getGPUs()]
+    except ImportError:
+        pass
+    except Exception as e:
+        snapshot['gpus'] = f"unavailable: {e}"
+    return snapshot
+
+
+# Process-wide tracer, configured from the environment (disabled unless EMBODIED_TRACE is set)
+tracer = Tracer.from_env()
@@ -0,0 +1,120 @@
+"""
+async_worker.py
+
+Background worker that runs an expensive per-frame function (e.g., YOLO object detection) off the frame loop.
+- Holds a single pending slot: submitting a new frame replaces any frame that has not started processing yet.
+- Always processes the newest frame and drops stale ones, so results never fall further behind than one call.
+- Publishes each result together with the timestamp of the frame it was computed from.
+"""
+
+import threading
+import time
+
+
+class LatestFrameWorker:
+    def __init__(self, process_fn, name="LatestFrameWorker", copy_frames=True):
+        """
+        process_fn: function called as process_fn(frame) on the worker thread; its return value is published
+        name: thread name (for debugging)
+        copy_frames: if True, submitted frames are copied so capture buffers can be reused by the caller
+        """
+        self.process_fn = process_fn
+        self.name = name
+        self.copy_frames = copy_frames
+        self._cond = threading.Condition()
+        self._pending = None  # (frame, source_timestamp)
+        self._result = None   # (value, source_timestamp, completed_time)
+        self._busy = False
+        self._generation = 0  # Bumped by clear(): results of frames taken before it are discarded
+        self._running = False
+        self._thread = None
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_processed = 0
+        self.errors = 0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._pending = None
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def clear(self):
+        """
+        Drop the pending frame and the published result, e.g., when the stream restarts. A frame already being
+        processed finishes, but its result is discarded.
+        """
+        with self._cond:
+            self._pending = None
+            self._result = None
+            self._generation += 1
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def busy(self):
+        """True while a frame is pending or being processed."""
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def submit(self, frame, source_timestamp):
+        """
+        Queue frame for processing without blocking. Replaces (drops) any frame still waiting.
+        Args:
+            frame: numpy array
+            source_timestamp: capture time of frame (float seconds)
+        """
+        if frame is None:
+            return
+        if self.copy_frames:
+            frame = frame.copy()
+        with self._cond:
+            if self._pending is not None:
+                self.frames_dropped += 1
+            self._pending = (frame, source_timestamp)
+            self.frames_submitted += 1
+            self._cond.notify()
+
+    def latest(self):
+        """
+        Returns the most recent result as (value, source_timestamp, completed_time), or None if no frame
+        has been processed yet. Never blocks on processing.
+        """
+        with self._cond:
+            return self._result
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, source_timestamp = self._pending
+                self._pending = None
+                self._busy = True
+                generation = self._generation
+            try:
+                value = self.process_fn(frame)
+            except Exception as e:
+                print(f"[WARN] {self.name}: processing failed: {e}")
+                self.errors += 1
+                value = None
+            with self._cond:
+                self._busy = False
+                if value is not None and generation == self._generation:
+                    self._result = (value, source_timestamp, time.time())
+                self.frames_processed += 1
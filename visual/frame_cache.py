@@ -0,0 +1,93 @@
+"""
+frame_cache.py
+
+Per-frame cache of derived image representations for visual perception.
+- Lazily computes contiguous, grayscale, RGB, resized/downscaled and float32 views of a frame.
+- Capture hands out strided channel views of its BGRA ring buffer; the one contiguous copy OpenCV needs is made
+  here, once per frame, instead of inside every cv2 call.
+- Each representation is computed at most once per frame and shared by every feature extractor.
+- Counts how many conversions were computed and how many were skipped (served from cache).
+"""
+
+import cv2
+import numpy as np
+
+
+class FrameCache:
+    def __init__(self, frame):
+        """
+        frame: raw image (numpy array, BGR (H, W, 3) or grayscale (H, W))
+        """
+        self.frame = frame
+        self._cache = {}
+        self.computed = 0  # Conversions actually performed
+        self.skipped = 0   # Conversions served from cache
+
+    def _get(self, key, compute):
+        if key in self._cache:
+            self.skipped += 1
+            return self._cache[key]
+        value = compute()
+        self._cache[key] = value
+        self.computed += 1
+        return value
+
+    def seed(self, key, value):
+        """
+        Store a representation computed elsewhere (e.g., grayscale converted for a whole batch at once).
+        Counted as computed, since the conversion did happen, just not here.
+        """
+        if key not in self._cache:
+            self._cache[key] = value
+            self.computed += 1
+
+    def contiguous(self):
+        """
+        C-contiguous version of the frame. Channel views of a BGRA capture buffer (stride 4, or reversed channels)
+        are copied by OpenCV on every call; converting them once here lets every extractor share the copy.
+        Contiguous input is returned as-is.
+        """
+        if self.frame.flags['C_CONTIGUOUS']:
+            return self.frame
+        return self._get('contiguous', lambda: np.ascontiguousarray(self.frame))
+
+    def gray(self):
+        """Grayscale (H, W) uint8 view of the frame. Grayscale input is returned as-is."""
+        if self.frame.ndim == 2:
+            return self.contiguous()
+        return self._get('gray', lambda: cv2.cvtColor(self.contiguous(), cv2.COLOR_BGR2GRAY))
+
+    def rgb(self):
+        """RGB (H, W, 3) uint8 version of the frame (e.g., for pytesseract)."""
+        if self.frame.ndim == 2:
+            return self._get('rgb', lambda: cv2.cvtColor(self.contiguous(), cv2.COLOR_GRAY2RGB))
+        return self._get('rgb', lambda: cv2.cvtColor(self.contiguous(), cv2.COLOR_BGR2RGB))
+
+    def resized(self, size, gray=False):
+        """
+        Frame resized to size=(width, height), as used by cv2.resize.
+        Args:
+            size: (width, height) tuple.
+            gray: if True, resize the grayscale view instead of the color frame.
+        """
+        source = self.gray if gray else self.contiguous
+        return self._get(('resized', tuple(size), gray), lambda: cv2.resize(source(), tuple(size)))
+
+    def pyramid(self, level, gray=True):
+        """
+        Downscaled frame at the given pyramid level (each level halves width and height).
+        Level 0 is the full-resolution frame. Levels are built from the previous level, so
+        requesting level 2 also caches level 1.
+        """
+        if level <= 0:
+            return self.gray() if gray else self.contiguous()
+        return self._get(('pyramid', level, gray), lambda: cv2.pyrDown(self.pyramid(level - 1, gray)))
+
+    def float32(self, gray=True):
+        """float32 view of the grayscale (default) or color frame, scaled to [0, 1]."""
+        source = self.gray if gray else self.contiguous
+        return self._get(('float32', gray), lambda: source().astype(np.float32) / 255.0)
+
+    def stats(self):
+        """Returns dict with computed/skipped conversion counts for this frame."""
+        return {'computed': self.computed, 'skipped': self.skipped}
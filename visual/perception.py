@@ -1,37 +1,46 @@
 import numpy as np
 
-def decode_video_frame_bytes(video_frame_bytes, shape=None, dtype=np.uint8):
+def decode_video_frame_bytes(video_frame_bytes, shape=None, dtype=np.uint8, reference=None):
     """
     Decodes video_frame bytes to a numpy array (image).
-    If shape is provided, assumes raw array; otherwise, tries to decode as compressed image.
+    Bytes produced by encoding.frame_codecs (raw, png, jpeg, webp, delta) are detected and decoded by codec.
+    Otherwise, if shape is provided, assumes raw array; if not, tries to decode as compressed image.
     Args:
         video_frame_bytes: bytes or memoryview containing image data.
         shape: tuple, if known (e.g., (480, 640, 3)) for raw arrays.
         dtype: numpy dtype, default np.uint8.
+        reference: previous decoded frame, needed for non-key frames of the delta codec.
     Returns:
         frame: numpy array (image) or None if decoding fails.
     """
-    # Convert memoryview to bytes if needed
-    if isinstance(video_frame_bytes, memoryview):
-        print(f"[DEBUG] Converting memoryview to bytes (length: {len(video_frame_bytes)})")
-        video_frame_bytes = video_frame_bytes.tobytes()
+    try:
+        from encoding.frame_codecs import decode_frame, is_encoded_frame
+    except ImportError:  # encoding package not on sys.path (e.g., run as a script from inside this folder)
+        is_encoded_frame = None
+    if is_encoded_frame is not None and video_frame_bytes is not None and is_encoded_frame(video_frame_bytes):
+        try:
+            return decode_frame(video_frame_bytes, reference=reference)
+        except Exception as e:
+            print(f"[ERROR] Could not decode encoded video_frame: {e}")
+            return None
+    # np.frombuffer reads bytes and memoryviews (e.g., psycopg2 bytea) directly: no .tobytes() copy
     if shape is not None:
         try:
-            print(f"[DEBUG] Attempting to reshape buffer to shape {shape} and dtype {dtype} (buffer length: {len(video_frame_bytes)})")
             frame = np.frombuffer(video_frame_bytes, dtype=dtype).reshape(shape)
-            print(f"[DEBUG] Successfully reshaped raw video_frame: {frame.shape}, dtype: {frame.dtype}")
+            if tracer.enabled(DEBUG):
+                tracer.debug('visual.decode_raw', 'reshaped {length} bytes to {shape} {dtype}',
+                             length=len(video_frame_bytes), shape=frame.shape, dtype=frame.dtype)
             return frame
         except Exception as e:
             print(f"[ERROR] Could not reshape raw video_frame: {e}")
             return None
     else:
-        print(f"[DEBUG] Attempting to decode as compressed image (buffer length: {len(video_frame_bytes)})")
         nparr = np.frombuffer(video_frame_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        with tracer.span('visual.decode_image') as span:
+            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            span.set(length=len(video_frame_bytes))
         if frame is None:
-            print(f"[ERROR] Could not decode video_frame bytes to image. First 20 bytes: {video_frame_bytes[:20]}")
-        else:
-            print(f"[DEBUG] Successfully decoded image: shape {frame.shape}, dtype: {frame.dtype}")
+            print(f"[ERROR] Could not decode video_frame bytes to image. First 20 bytes: {bytes(video_frame_bytes[:20])}")
         return frame
 """
 Visual Perception Module Scaffold
@@ -56,12 +65,138 @@ The output is a dictionary of features suitable for agent decision logic and dir
 import cv2
 import numpy as np
 import random
+import threading
+
+try:
+    from visual.frame_cache import FrameCache
+    from visual.async_worker import LatestFrameWorker
+    from visual.text_reader import TextReader
+except ImportError:  # Running as a script from inside visual/
+    from frame_cache import FrameCache
+    from async_worker import LatestFrameWorker
+    from text_reader import TextReader
+try:
+    from features.registry import FeatureRegistry, FeatureScheduler
+    from tracing.tracer import tracer, system_snapshot, DEBUG, INFO
+except ImportError:  # Running as a script from inside visual/
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from features.registry import FeatureRegistry, FeatureScheduler
+    from tracing.tracer import tracer, system_snapshot, DEBUG, INFO
+
+def decode_yolo_outputs(layer_outputs, frame_shape, conf_threshold=0.5, nms_threshold=0.4):
+    """
+    Decode raw YOLO output layers into boxes with one batched NumPy pass and a single NMS call.
+    Args:
+        layer_outputs: sequence of arrays of shape (n_rows, 5 + n_classes) (as returned by net.forward)
+        frame_shape: shape of the source frame, (height, width, ...)
+        conf_threshold: minimum class confidence to keep a detection
+        nms_threshold: IoU threshold for non-max suppression
+    Returns:
+        (boxes, confidences, class_ids): int array (n, 4) of [x, y, width, height] in pixels,
+        float32 array (n,), int array (n,); sorted by NMS priority.
+    """
+    outputs = np.concatenate([np.asarray(o).reshape(-1, o.shape[-1]) for o in layer_outputs], axis=0)
+    scores = outputs[:, 5:]
+    class_ids = np.argmax(scores, axis=1)
+    confidences = scores[np.arange(len(scores)), class_ids]
+    mask = confidences > conf_threshold
+    if not np.any(mask):
+        return np.empty((0, 4), dtype=int), np.empty(0, dtype=np.float32), np.empty(0, dtype=int)
+    detections = outputs[mask]
+    confidences = confidences[mask]
+    class_ids = class_ids[mask]
+    h, w = frame_shape[:2]
+    # Center/size are relative to the frame; truncate to int pixels like int() does
+    center_x = (detections[:, 0] * w).astype(int)
+    center_y = (detections[:, 1] * h).astype(int)
+    width = (detections[:, 2] * w).astype(int)
+    height = (detections[:, 3] * h).astype(int)
+    x = (center_x - width / 2).astype(int)
+    y = (center_y - height / 2).astype(int)
+    boxes = np.stack([x, y, width, height], axis=1)
+    # Non-max suppression to remove duplicates
+    idxs = cv2.dnn.NMSBoxes(boxes.tolist(), confidences.astype(float).tolist(), conf_threshold, nms_threshold)
+    keep = np.asarray(idxs, dtype=int).reshape(-1)
+    return boxes[keep], confidences[keep], class_ids[keep]
+
+# Default seconds between object detection requests (ParallelReplay sizes its shard warmup from it)
+DEFAULT_DETECTION_INTERVAL = 1.5
+
+# Shared feature thresholds (used by both process_frame and process_batch)
+def _brightness_label(avg_brightness):
+    if avg_brightness < 50:
+        return 'dark'
+    elif avg_brightness < 100:
+        return 'dim'
+    elif avg_brightness < 180:
+        return 'normal'
+    else:
+        return 'bright'
+
+def _edge_label(edge_count):
+    if edge_count < 100:
+        return 'none'
+    elif edge_count < 1000:
+        return 'some'
+    else:
+        return 'many'
+
+def _color_label(b, g, r):
+    if r > g and r > b:
+        return 'red'
+    elif g > r and g > b:
+        return 'green'
+    elif b > r and b > g:
+        return 'blue'
+    else:
+        return 'gray'
+
+def _to_seconds(timestamp):
+    # Frame timestamps may be floats (time.time()) or datetimes
+    return timestamp if isinstance(timestamp, (int, float)) else timestamp.timestamp()
 
 class VisualPerception:
-    def __init__(self):
-        # For periodic object detection
+    def __init__(self, async_detection=True, detection_interval=DEFAULT_DETECTION_INTERVAL, text_regions=None, async_ocr=None,
+                 feature_budget=None, subscriptions=None, feature_rates=None):
+        """
+        async_detection: if True, YOLO runs on a background worker and process_frame never blocks on it;
+            if False, detection runs inline (e.g., for offline replay where determinism matters more than latency)
+        detection_interval: seconds (in frame time) between object detection requests; requests fall in fixed
+            detection_interval-long slots of absolute frame time, so the schedule does not depend on where a
+            stream (or replay shard) started
+        text_regions: optional list of (x, y, width, height) rectangles to OCR (e.g., Eastshade HUD/dialog boxes);
+            if None, text-likely regions are proposed per frame
+        async_ocr: run OCR on a background worker (defaults to async_detection)
+        feature_budget: per-frame latency budget (seconds) for the registered extractors; features that do not
+            fit are deferred (reported with their last value and 'stale': True)
+        subscriptions: feature names to compute (None: all), e.g., the features an agent actually uses
+        feature_rates: optional {feature name: rate or (rate, trigger)} overrides (N = every N frames, or
+            'on_change' with trigger features; see FeatureRegistry.set_rate)
+        """
+        # Registered extractors, scheduled per frame by rate, subscriptions and budget
+        self.registry = self._build_registry(FeatureRegistry())
+        self.registry.set_rates(feature_rates)
+        self.scheduler = FeatureScheduler(self.registry, budget=feature_budget, subscriptions=subscriptions)
+        # Change-gated, region-of-interest OCR
+        self.text_reader = TextReader(
+            regions=text_regions,
+            async_ocr=async_detection if async_ocr is None else async_ocr,
+        )
+        # For periodic object detection.
+        # _last_detected_objects/_last_object_detection_time are the read side of the detection worker:
+        # the newest published result and the capture timestamp of the frame it came from.
         self._last_object_detection_time = 0.0
         self._last_detected_objects = []
+        self._last_detections = []  # Same objects with confidences and boxes
+        self._last_detection_request_time = None
+        self.detection_interval = detection_interval
+        self._detection_worker = None
+        self._net_lock = threading.Lock()  # cv2.dnn.Net is not thread-safe: detection worker vs. process_batch
+        # Shared per-frame cache of derived representations (gray, RGB, resized, ...)
+        self._frame_cache = None
+        self._retired_conversions = {'computed': 0, 'skipped': 0}
         # Load YOLO model (YOLOv3 as example)
         # Paths to YOLO weights and config (update these as needed)
         self.yolo_weights = "yolov4-tiny.weights"
@@ -94,6 +229,52 @@ class VisualPerception:
             print(f"YOLO model not loaded: {e}")
             self.net = None
             self.classes = []
+        if async_detection and self.net is not None:
+            self._detection_worker = LatestFrameWorker(self.detect_objects, name="ObjectDetectionWorker")
+            self._detection_worker.start()
+
+    def _build_registry(self, registry):
+        # Extractors share grayscale/resized conversions through the per-frame cache (_get_frame_cache);
+        # motion/change keep their previous frame internally
+        registry.register('edges', self.detect_edges, inputs=('frame',), cost='cheap')
+        registry.register('dominant_color', self.analyze_color, inputs=('frame',), cost='medium')
+        registry.register('motion_detected', self.detect_motion, inputs=('frame',), cost='cheap')
+        registry.register('change_detected', self.detect_change, inputs=('frame',), cost='cheap')
+        registry.register('light_dark', self.light_dark_adaptation, inputs=('frame',), cost='cheap')
+        registry.register('visual_attention', self.visual_attention, inputs=('frame',), cost='medium')
+        # OCR only when motion/change detection says the frame changed
+        registry.register(
+            'text',
+            lambda frame, motion, change, frame_timestamp: self.read_text(
+                frame, changed=motion or change, frame_timestamp=frame_timestamp),
+            inputs=('frame', 'motion_detected', 'change_detected', 'frame_timestamp'),
+            cost='expensive',
+        )
+        return registry
+
+    def close(self):
+        """Stop the background object detection and OCR workers (if any)."""
+        if self._detection_worker is not None:
+            self._detection_worker.stop()
+            self._detection_worker = None
+        self.text_reader.close()
+
+    def reset(self):
+        """
+        Clear temporal state (previous frames for motion/change, detection schedule and last detections, last OCR
+        text) so the next frame starts a new stream, e.g., a replay shard. Loaded models are kept.
+        """
+        for name in ('_prev_gray', '_prev_change_gray'):
+            if hasattr(self, name):
+                delattr(self, name)
+        self._last_detection_request_time = None
+        self._last_detections = []
+        self._last_detected_objects = []
+        self._last_object_detection_time = 0.0
+        if self._detection_worker is not None:
+            self._detection_worker.clear()
+        self.text_reader.reset()
+        self.scheduler.reset()
 
     def process_frame(self, frame, frame_timestamp=None):
         """
@@ -102,7 +283,8 @@ class VisualPerception:
             frame: Raw image/frame data (could be numpy array, etc.)
             frame_timestamp: float or datetime, time when frame was captured (for lag calculation)
         Returns:
-            observation: dict with high-level features and per-feature lag (in seconds)
+            observation: dict with high-level features and per-feature lag (in seconds); features not
+            recomputed for this frame (rate or budget) have their last value with 'stale': True
         """
         import time
         t_start = time.time()
@@ -110,67 +292,209 @@ class VisualPerception:
             # Use current time as fallback
             frame_timestamp = t_start
         observation = {}
-        # Each feature: record start, end, and lag
-        def timed_feature(fn, *args, **kwargs):
-            t0 = time.time()
-            result = fn(*args, **kwargs)
-            t1 = time.time()
-            lag = t1 - frame_timestamp if isinstance(frame_timestamp, (int, float)) else (t1 - frame_timestamp.timestamp())
-            return {'value': result, 'lag': lag}
-
-
-        observation['edges'] = timed_feature(self.detect_edges, frame)
-        observation['dominant_color'] = timed_feature(self.analyze_color, frame)
-        observation['motion_detected'] = timed_feature(self.detect_motion, frame)
-        observation['change_detected'] = timed_feature(self.detect_change, frame)
-        observation['light_dark'] = timed_feature(self.light_dark_adaptation, frame)
-        observation['visual_attention'] = timed_feature(self.visual_attention, frame)
-        observation['text'] = timed_feature(self.read_text, frame)
-
-        # Periodic object detection every 1.5 seconds
-        now = time.time()
-        if (now - self._last_object_detection_time) >= 1.5:
-            self._last_detected_objects = self.recognize_objects(frame)
-            self._last_object_detection_time = now
+        # One derived-representation cache per frame, shared by all extractors below
+        cache = self._get_frame_cache(frame)
+        # Registered extractors (see _build_registry); features skipped this frame report their last value
+        observation.update(self.scheduler.run(
+            {'frame': frame, 'frame_timestamp': frame_timestamp},
+            capture_time=_to_seconds(frame_timestamp),
+        ))
+
+        # Periodic object detection: once per detection_interval slot of frame time
+        frame_time = _to_seconds(frame_timestamp)
+        if self._detection_due(frame_time):
+            if self._detection_worker is not None:
+                # Non-blocking: the worker always picks up the newest submitted frame
+                self._detection_worker.submit(frame, frame_time)
+            else:
+                self._last_detections = self.detect_objects(cache.contiguous() if cache is not None else frame)
+                self._last_detected_objects = [d['label'] for d in self._last_detections]
+                self._last_object_detection_time = frame_time
+        if self._detection_worker is not None:
+            result = self._detection_worker.latest()
+            if result is not None:
+                self._last_detections, self._last_object_detection_time, _ = result
+                self._last_detected_objects = [d['label'] for d in self._last_detections]
         # Use the last detected objects for skipped frames
-        # Lag is now time since last detection, not time since frame capture
-        observation['objects'] = {'value': self._last_detected_objects, 'lag': now - self._last_object_detection_time}
+        # Lag is time since capture of the frame the objects were detected in
+        now = time.time()
+        observation['objects'] = {
+            'value': self._last_detected_objects,
+            'lag': now - self._last_object_detection_time,
+            'frame_timestamp': self._last_object_detection_time,
+        }
+        observation['object_detections'] = {
+            'value': self._last_detections,
+            'lag': now - self._last_object_detection_time,
+        }
         observation['frame_timestamp'] = frame_timestamp
+        observation['frame_cache'] = cache.stats() if cache is not None else None
 
-        t_end = time.time()
-        print(f"[DEBUG] Perception processing time: {t_end - t_start:.4f}s (frame timestamp: {frame_timestamp})")
+        if tracer.enabled(DEBUG):
+            tracer.debug('visual.process_frame', 'processed in {seconds:.4f}s (frame timestamp: {frame_timestamp})',
+                         seconds=time.time() - t_start, frame_timestamp=frame_timestamp)
+        # System performance monitoring: a rate-limited snapshot in the trace instead of a printout per frame
+        if tracer.enabled(INFO) and tracer.due('system.hardware', 5.0):
+            tracer.info('system.hardware', **system_snapshot())
 
-        # System performance monitoring
-        try:
-            import psutil
-            try:
-                import GPUtil
-                gpus = GPUtil.getGPUs()
-            except ImportError:
-                GPUtil = None
-                gpus = []
-            print("[SYSTEM] Hardware performance:")
-            vm = psutil.virtual_memory()
-            print(f"  RAM: {vm.used / (1024**3):.2f} GB used / {vm.total / (1024**3):.2f} GB total ({vm.percent}%)")
-            cpu_percent = psutil.cpu_percent(interval=None)
-            print(f"  CPU: {cpu_percent:.1f}% usage")
-            try:
-                load1, load5, load15 = psutil.getloadavg()
-                print(f"  Load average (1/5/15 min): {load1:.2f} / {load5:.2f} / {load15:.2f}")
-            except (AttributeError, OSError):
-                pass
-            if gpus:
-                for gpu in gpus:
-                    print(f"  GPU {gpu.id}: {gpu.name}, load={gpu.load*100:.1f}%, VRAM used={gpu.memoryUsed}MB / {gpu.memoryTotal}MB ({gpu.memoryUtil*100:.1f}%)")
-            elif GPUtil is not None:
-                print("  No GPUs detected.")
+        return observation
+
+    def process_batch(self, frames, timestamps=None, read_text=True):
+        """
+        Process a batch of frames (e.g., offline reprocessing of a recorded session) in one pass.
+        Grayscale conversion and the stateless extractors (brightness, edge counts, color) are computed on
+        stacked arrays, and YOLO runs once per batch on an N-frame blob built with cv2.dnn.blobFromImages.
+        Each frame then goes through the feature scheduler as in process_frame (subscriptions, rates and budget
+        apply; batch values stand in for the extractors they replace), with its frame cache seeded with the
+        batch grayscale. Temporal state (previous frame for motion/change) carries over as in process_frame.
+        Args:
+            frames: list of numpy arrays (BGR or grayscale), in capture order
+            timestamps: list of float/datetime capture times (defaults to now)
+            read_text: if False, skip OCR (usually the slowest per-frame feature)
+        Returns:
+            observations: list of dicts with the same structure as process_frame, in input order
+        """
+        import time
+        n = len(frames)
+        if n == 0:
+            return []
+        if timestamps is None:
+            timestamps = [time.time()] * n
+        shapes = {f.shape for f in frames if f is not None}
+        if len(shapes) != 1 or any(f is None for f in frames):
+            # Mixed shapes (or missing frames) can't be stacked: fall back to per-frame processing
+            return [self.process_frame(f, t) for f, t in zip(frames, timestamps)]
+        frame_times = [_to_seconds(t) for t in timestamps]
+        # Caches become current one frame at a time below, so conversion_stats counts each exactly once
+        caches = [FrameCache(f) for f in frames]
+        needed = self.scheduler.needed()
+        batch_values = [{} for _ in range(n)]
+
+        def record(name, values):
+            for frame_values, value in zip(batch_values, values):
+                frame_values[name] = value
+
+        # Grayscale for the whole batch in one conversion (frames stacked vertically)
+        stack = np.stack(frames)
+        h, w = stack.shape[1:3]
+        if stack.ndim == 4:
+            grays = cv2.cvtColor(stack.reshape(n * h, w, stack.shape[3]), cv2.COLOR_BGR2GRAY).reshape(n, h, w)
+            for cache, gray in zip(caches, grays):
+                cache.seed('gray', gray)
+        else:
+            grays = stack
+        if 'edges' in needed:
+            # Edges: Canny is per-image (stacking would add edges at frame seams); counting is vectorized
+            edges = np.stack([cv2.Canny(g, 100, 200) for g in grays])
+            record('edges', [_edge_label(c) for c in np.count_nonzero(edges.reshape(n, -1), axis=1)])
+        if 'dominant_color' in needed:
+            # Dominant color: k-means with K=1 converges to the mean pixel, so take the mean of the 50x50 thumbnails
+            if stack.ndim == 4:
+                small = np.stack([c.resized((50, 50)) for c in caches]).reshape(n, -1, stack.shape[3])
+                centers = small.mean(axis=1).astype(int)
+                record('dominant_color', [_color_label(b, g, r) for b, g, r in centers[:, :3]])
             else:
-                print("  GPUtil not installed (no GPU/VRAM info). To enable: pip install gputil")
-        except Exception as e:
-            print(f"[WARN] Could not print system info: {e}")
+                record('dominant_color', ['gray'] * n)
+        if 'light_dark' in needed:
+            record('light_dark', [_brightness_label(b) for b in grays.reshape(n, -1).mean(axis=1)])
+        # Per frame, in order: scheduled extractors (motion/change keep their previous frame; visual attention
+        # and OCR are not batchable) reuse the seeded grayscale
+        observations = []
+        for frame, cache, frame_values, timestamp, frame_time in zip(frames, caches, batch_values, timestamps, frame_times):
+            self._set_frame_cache(cache)
+            observations.append(self.scheduler.run(
+                {'frame': frame, 'frame_timestamp': timestamp},
+                capture_time=frame_time,
+                precomputed=frame_values,
+                exclude=() if read_text else ('text',),
+            ))
+        # Object detection: one forward pass over every frame that is due for detection
+        due = []
+        for i, frame_time in enumerate(frame_times):
+            if self._detection_due(frame_time):
+                due.append(i)
+        # Rows of the stacked batch are contiguous, unlike capture channel views (no per-frame copy in OpenCV)
+        detections = dict(zip(due, self._detect_objects_batch([stack[i] for i in due])))
+        t_done = time.time()
+        for i, (obs, frame_time) in enumerate(zip(observations, frame_times)):
+            if i in detections:
+                self._last_detections = detections[i]
+                self._last_detected_objects = [d['label'] for d in detections[i]]
+                self._last_object_detection_time = frame_time
+            obs['objects'] = {
+                'value': self._last_detected_objects,
+                'lag': t_done - self._last_object_detection_time,
+                'frame_timestamp': self._last_object_detection_time,
+            }
+            obs['object_detections'] = {'value': self._last_detections, 'lag': t_done - self._last_object_detection_time}
+            obs['frame_timestamp'] = timestamps[i]
+            obs['frame_cache'] = caches[i].stats()
+        return observations
+
+    def _detection_due(self, frame_time):
+        """
+        True (and recorded as requested) for the first frame in each detection_interval slot of absolute frame
+        time, and for the first frame after reset(). Aligned slots keep replay shards in phase with one pass.
+        """
+        last = self._last_detection_request_time
+        if last is not None and frame_time // self.detection_interval == last // self.detection_interval:
+            return False
+        self._last_detection_request_time = frame_time
+        return True
+
+    def _detect_objects_batch(self, frames):
+        """Runs YOLO once on an N-frame blob. Returns one detect_objects-style list per frame."""
+        if not frames or self.net is None:
+            return [[] for _ in frames]
+        blob = cv2.dnn.blobFromImages(frames, 1/255.0, (416, 416), swapRB=True, crop=False)
+        with self._net_lock:
+            self.net.setInput(blob)
+            layer_outputs = self.net.forward(self.net.getUnconnectedOutLayersNames())
+        n = len(frames)
+        # Batched outputs are either (N, rows, 5 + classes) or N blocks stacked as (N * rows, 5 + classes)
+        layer_outputs = [o if o.ndim == 3 else np.split(o, n) for o in layer_outputs]
+        results = []
+        for i, frame in enumerate(frames):
+            per_frame = [o[i] for o in layer_outputs]
+            boxes, confidences, class_ids = decode_yolo_outputs(per_frame, frame.shape)
+            results.append([
+                {'label': self._label(int(class_id)), 'confidence': float(conf), 'box': box.tolist()}
+                for box, conf, class_id in zip(boxes, confidences, class_ids)
+            ])
+        return results
+
+    def _get_frame_cache(self, frame):
+        """
+        Returns the FrameCache for frame, creating a new one when a different frame is seen.
+        Extractors called on their own still work; within process_frame they share one cache.
+        """
+        if frame is None:
+            return None
+        cache = self._frame_cache
+        if cache is None or cache.frame is not frame:
+            cache = self._set_frame_cache(FrameCache(frame))
+        return cache
+
+    def _set_frame_cache(self, cache):
+        """Make cache the current frame cache, adding the previous one's counts to conversion_stats."""
+        previous = self._frame_cache
+        if previous is not None:
+            self._retired_conversions['computed'] += previous.computed
+            self._retired_conversions['skipped'] += previous.skipped
+        self._frame_cache = cache
+        return cache
+
+    def conversion_stats(self):
+        """
+        Returns dict with total 'computed' and 'skipped' frame conversions since creation.
+        'skipped' counts conversions (grayscale, RGB, resize, ...) served from the per-frame cache.
+        """
+        stats = dict(self._retired_conversions)
+        if self._frame_cache is not None:
+            stats['computed'] += self._frame_cache.computed
+            stats['skipped'] += self._frame_cache.skipped
+        return stats
 
-        return observation
-    
     def detect_change(self, frame):
         """
         Detects scene changes over time (frame differencing, but with longer memory).
@@ -179,10 +503,7 @@ class VisualPerception:
         if frame is None:
             return False
         # Convert to grayscale
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+        gray = self._get_frame_cache(frame).gray()
         # Store previous frame for change detection
         if not hasattr(self, '_prev_change_gray'):
             self._prev_change_gray = gray
@@ -191,26 +512,20 @@ class VisualPerception:
         change_pixels = np.sum(diff > 50)
         self._prev_change_gray = gray
         # Heuristic: change detected if enough pixels changed
-        return change_pixels > 2000
+        return bool(change_pixels > 2000)
 
-    def read_text(self, frame):
+    def read_text(self, frame, changed=True, frame_timestamp=None):
         """
-        Reads text from the frame using OCR (pytesseract).
+        Reads text from the frame using OCR (pytesseract) on text-likely regions only.
+        If changed is False (frame unchanged per motion/change detection), the cached text is reused.
+        OCR runs on the frame cache's grayscale, shared with motion/change detection.
         Returns detected text (str).
         """
-        try:
-            import pytesseract
-        except ImportError:
-            return "(pytesseract not installed)"
         if frame is None:
             return ""
-        # Convert to RGB for pytesseract
-        if len(frame.shape) == 2:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
-        else:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        text = pytesseract.image_to_string(rgb)
-        return text.strip()
+        timestamp = _to_seconds(frame_timestamp) if frame_timestamp is not None else 0.0
+        gray = self._get_frame_cache(frame).gray()
+        return self.text_reader.read(frame, changed=changed, timestamp=timestamp, gray=gray)
 
     def light_dark_adaptation(self, frame):
         """
@@ -220,19 +535,9 @@ class VisualPerception:
         if frame is None:
             return 'unknown'
         # Convert to grayscale
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+        gray = self._get_frame_cache(frame).gray()
         avg_brightness = np.mean(gray)
-        if avg_brightness < 50:
-            return 'dark'
-        elif avg_brightness < 100:
-            return 'dim'
-        elif avg_brightness < 180:
-            return 'normal'
-        else:
-            return 'bright'
+        return _brightness_label(avg_brightness)
 
     def visual_attention(self, frame):
         """
@@ -246,10 +551,7 @@ class VisualPerception:
         except AttributeError:
             return '(OpenCV saliency not available)'
         # Convert to grayscale if needed
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+        gray = self._get_frame_cache(frame).gray()
         (success, saliencyMap) = saliency.computeSaliency(gray)
         if not success:
             return 'unknown'
@@ -269,21 +571,13 @@ class VisualPerception:
         if frame is None:
             return 'none'
         # Convert to grayscale if needed
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+        gray = self._get_frame_cache(frame).gray()
         # Apply Canny edge detector
         edges = cv2.Canny(gray, 100, 200)
         # Count edge pixels
         edge_count = np.sum(edges > 0)
         # Heuristic: classify edge density
-        if edge_count < 100:
-            return 'none'
-        elif edge_count < 1000:
-            return 'some'
-        else:
-            return 'many'
+        return _edge_label(edge_count)
 
     def analyze_color(self, frame):
         """
@@ -293,7 +587,7 @@ class VisualPerception:
         if frame is None:
             return 'unknown'
         # Resize for speed
-        small = cv2.resize(frame, (50, 50))
+        small = self._get_frame_cache(frame).resized((50, 50))
         # Reshape to a list of pixels
         pixels = small.reshape((-1, 3))
         pixels = np.float32(pixels)
@@ -304,14 +598,7 @@ class VisualPerception:
         dominant = centers[0].astype(int)
         # Map to color name (simple heuristic)
         b, g, r = dominant
-        if r > g and r > b:
-            return 'red'
-        elif g > r and g > b:
-            return 'green'
-        elif b > r and b > g:
-            return 'blue'
-        else:
-            return 'gray'
+        return _color_label(b, g, r)
 
     def detect_motion(self, frame):
         """
@@ -321,10 +608,7 @@ class VisualPerception:
         if frame is None:
             return False
         # Convert to grayscale for comparison
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
+        gray = self._get_frame_cache(frame).gray()
         # Initialize previous frame storage
         if not hasattr(self, '_prev_gray'):
             self._prev_gray = gray
@@ -336,50 +620,44 @@ class VisualPerception:
         motion_pixels = np.sum(thresh > 0)
         self._prev_gray = gray
         # Heuristic: motion detected if enough pixels changed
-        return motion_pixels > 500
+        return bool(motion_pixels > 500)
 
-    def recognize_objects(self, frame):
+    def _forward_yolo(self, frame):
+        """Runs the YOLO forward pass on one frame and returns the raw output layers."""
+        # Prepare input blob for YOLO
+        blob = cv2.dnn.blobFromImage(frame, 1/255.0, (416, 416), swapRB=True, crop=False)
+        with self._net_lock:
+            self.net.setInput(blob)
+            # Get output layer names
+            ln = self.net.getUnconnectedOutLayersNames()
+            # Run forward pass
+            return self.net.forward(ln)
+
+    def _label(self, class_id):
+        return self.classes[class_id] if class_id < len(self.classes) else str(class_id)
+
+    def detect_objects(self, frame):
         """
-        Recognize objects in the frame using YOLO and OpenCV DNN.
-        Returns: list of object names
+        Detect objects in the frame using YOLO and OpenCV DNN.
+        When async detection is enabled this runs on the detection worker thread; forward passes are
+        serialized with process_batch's by a lock (the DNN net is not thread-safe).
+        Returns: list of dicts with 'label', 'confidence' and 'box' ([x, y, width, height] in pixels)
         """
         if frame is None or self.net is None:
             return []
-        # Prepare input blob for YOLO
-        blob = cv2.dnn.blobFromImage(frame, 1/255.0, (416, 416), swapRB=True, crop=False)
-        self.net.setInput(blob)
-        # Get output layer names
-        ln = self.net.getUnconnectedOutLayersNames()
-        # Run forward pass
-        layer_outputs = self.net.forward(ln)
-        boxes = []
-        confidences = []
-        class_ids = []
-        h, w = frame.shape[:2]
-        # Parse outputs
-        for output in layer_outputs:
-            for detection in output:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
-                if confidence > 0.5:
-                    center_x = int(detection[0] * w)
-                    center_y = int(detection[1] * h)
-                    width = int(detection[2] * w)
-                    height = int(detection[3] * h)
-                    x = int(center_x - width / 2)
-                    y = int(center_y - height / 2)
-                    boxes.append([x, y, width, height])
-                    confidences.append(float(confidence))
-                    class_ids.append(class_id)
-        # Non-max suppression to remove duplicates
-        idxs = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
-        detected_objects = []
-        if len(idxs) > 0:
-            for i in idxs.flatten():
-                label = self.classes[class_ids[i]] if class_ids[i] < len(self.classes) else str(class_ids[i])
-                detected_objects.append(label)
-        return detected_objects
+        layer_outputs = self._forward_yolo(frame)
+        boxes, confidences, class_ids = decode_yolo_outputs(layer_outputs, frame.shape)
+        return [
+            {'label': self._label(int(class_id)), 'confidence': float(conf), 'box': box.tolist()}
+            for box, conf, class_id in zip(boxes, confidences, class_ids)
+        ]
+
+    def recognize_objects(self, frame):
+        """
+        Recognize objects in the frame using YOLO and OpenCV DNN.
+        Returns: list of object names (see detect_objects for boxes and confidences)
+        """
+        return [d['label'] for d in self.detect_objects(frame)]
 
 if __name__ == "__main__":
     # Example usage: decode a video_frame_bytes (from DB or file) and process once
@@ -4,12 +4,12 @@ test_perception.py (visual, streaming)
 Test script to stream live visual frames through the visual perception pipeline and print results in real time.
 """
 
+import functools
 import time
 from visual_capture import VisualInputCapture
 from perception import VisualPerception
 
-def perception_callback(frame, timestamp):
-    vp = VisualPerception()
+def perception_callback(vp, frame, timestamp):
     obs = vp.process_frame(frame, frame_timestamp=timestamp)
     print("\n[RESULT] Visual perception output:")
     for k, v in obs.items():
@@ -22,5 +22,11 @@ if __name__ == "__main__":
     region = {"top": 0, "left": 0, "width": 1280, "height": 720}
     output_dir = "training_data/frames"
     capture = VisualInputCapture(region, output_dir, frame_rate=5)
+    # One instance for the whole stream: construction loads the YOLO model, and motion/change detection
+    # need the previous frame
+    vp = VisualPerception()
     print("[INFO] Starting visual streaming test. Press Ctrl+C to stop.")
-    capture.stream_frames(perception_callback)
+    try:
+        capture.stream_frames(functools.partial(perception_callback, vp))
+    finally:
+        vp.close()
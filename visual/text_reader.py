@@ -0,0 +1,149 @@
+"""
+text_reader.py
+
+Region-of-interest, change-gated OCR for visual perception.
+- Skips OCR entirely on frames the motion/change detectors call unchanged and reuses the cached text.
+- OCRs only text-likely regions: configured rectangles (e.g., Eastshade HUD/dialog boxes) or
+  edge-density proposals, instead of the whole frame.
+- Caches OCR results keyed by a hash of each region's pixels, so unchanged dialog boxes are never re-read.
+- Optionally runs OCR on a background worker so the frame loop never waits on pytesseract.
+"""
+
+import collections
+import hashlib
+import cv2
+import numpy as np
+
+try:
+    from visual.async_worker import LatestFrameWorker
+except ImportError:  # Running as a script from inside visual/
+    from async_worker import LatestFrameWorker
+
+
+def propose_text_regions(gray, max_regions=8, min_area=400):
+    """
+    Propose text-likely rectangles using edge density: text has dense, short, mostly horizontal strokes,
+    so a morphological gradient closed with a wide kernel merges characters into line blobs.
+    Args:
+        gray: grayscale image (H, W) uint8
+        max_regions: keep at most this many regions (largest first)
+        min_area: ignore blobs smaller than this (in full-resolution pixels)
+    Returns:
+        list of (x, y, width, height) rectangles in full-resolution pixel coordinates
+    """
+    # Work at half resolution; text lines survive one pyramid level
+    small = cv2.pyrDown(gray)
+    scale = gray.shape[1] / small.shape[1]
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        x, y, w, h = int(x * scale), int(y * scale), int(w * scale), int(h * scale)
+        # Text lines are wider than tall and filled with strokes
+        if w * h < min_area or w < h or h < 8:
+            continue
+        regions.append((x, y, w, h))
+    regions.sort(key=lambda r: r[2] * r[3], reverse=True)
+    return regions[:max_regions]
+
+
+class TextReader:
+    def __init__(self, regions=None, async_ocr=True, max_regions=8, cache_size=256, padding=4):
+        """
+        regions: optional list of (x, y, width, height) rectangles to OCR (e.g., HUD/dialog boxes).
+            If None, text-likely regions are proposed per frame with propose_text_regions.
+        async_ocr: if True, OCR runs on a background worker and read() returns the latest published text
+        max_regions: maximum number of proposed regions to OCR per frame
+        cache_size: number of region hashes to keep OCR results for
+        padding: pixels added around each region before OCR
+        """
+        self.regions = regions
+        self.max_regions = max_regions
+        self.cache_size = cache_size
+        self.padding = padding
+        self._cache = collections.OrderedDict()  # region hash -> text
+        self._last_text = None
+        self.frames_skipped = 0   # Unchanged frames served from cached text
+        self.regions_ocr = 0      # Regions actually sent to pytesseract
+        self.regions_cached = 0   # Regions served from the region-hash cache
+        try:
+            import pytesseract
+            self._pytesseract = pytesseract
+        except ImportError:
+            self._pytesseract = None
+        self._worker = None
+        if async_ocr and self._pytesseract is not None:
+            self._worker = LatestFrameWorker(self._read_regions, name="OCRWorker")
+            self._worker.start()
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+
+    def reset(self):
+        """
+        Forget the last text (and any pending or published async result) so the next frame starts a new stream,
+        e.g., a replay shard. The region-hash cache is kept: it is keyed by pixels, not by stream position.
+        """
+        self._last_text = None
+        if self._worker is not None:
+            self._worker.clear()
+
+    def read(self, frame, changed=True, timestamp=0.0, gray=None):
+        """
+        Returns the text visible in frame.
+        Args:
+            frame: BGR or grayscale numpy array
+            changed: False if motion/change detection found the frame unchanged (reuse cached text)
+            timestamp: capture time of frame (published with async results)
+            gray: grayscale version of frame if already computed (e.g., from the FrameCache); OCR then runs on it
+                without converting again, and the async worker copies it instead of the color frame
+        """
+        if self._pytesseract is None:
+            return "(pytesseract not installed)"
+        if frame is None:
+            return ""
+        if gray is not None:
+            frame = gray
+        if not changed and self._last_text is not None:
+            self.frames_skipped += 1
+            return self._last_text
+        if self._worker is not None:
+            self._worker.submit(frame, timestamp)
+            result = self._worker.latest()
+            if result is not None:
+                self._last_text = result[0]
+            return self._last_text if self._last_text is not None else ""
+        self._last_text = self._read_regions(frame)
+        return self._last_text
+
+    def _read_regions(self, frame):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        regions = self.regions if self.regions is not None else propose_text_regions(gray, self.max_regions)
+        height, width = gray.shape
+        texts = []
+        # Reading order: top-to-bottom, then left-to-right
+        for x, y, w, h in sorted(regions, key=lambda r: (r[1], r[0])):
+            x0, y0 = max(0, x - self.padding), max(0, y - self.padding)
+            x1, y1 = min(width, x + w + self.padding), min(height, y + h + self.padding)
+            roi = gray[y0:y1, x0:x1]
+            if roi.size == 0:
+                continue
+            key = hashlib.blake2b(np.ascontiguousarray(roi).data, digest_size=16).digest() + bytes(str(roi.shape), 'ascii')
+            text = self._cache.get(key)
+            if text is None:
+                text = self._pytesseract.image_to_string(roi).strip()
+                self.regions_ocr += 1
+                self._cache[key] = text
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+                self.regions_cached += 1
+            if text:
+                texts.append(text)
+        return "\n".join(texts)
@@ -10,22 +10,196 @@ Visual input capture for embodied agent using mss.
 
 import mss
 import mss.tools
+import numpy as np
 import os
+import threading
 import time
 from datetime import datetime
 
+try:
+    from tracing.tracer import tracer, DEBUG
+except ImportError:  # Running as a script from inside visual/
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from tracing.tracer import tracer, DEBUG
+
+def screenshot_view(img):
+    """
+    Zero-copy (H, W, 4) uint8 BGRA view of an mss ScreenShot's raw pixel memory.
+    The view is only valid while img is alive (mss may reuse the memory on the next grab).
+    """
+    width, height = img.size
+    return np.frombuffer(img.raw, dtype=np.uint8).reshape((height, width, 4))
+
+def channel_view(bgra, channels='bgr'):
+    """
+    Channel handling as views (no copy) of a BGRA frame.
+    channels: 'bgra' (as captured), 'bgr' (OpenCV order) or 'rgb' (reversed, negative-stride view)
+    The 'bgr' and 'rgb' views are not C-contiguous, so OpenCV (and np.ascontiguousarray) copy them: the path is
+    zero-copy up to the first such consumer. VisualPerception makes that copy once per frame
+    (FrameCache.contiguous) and shares it across its extractors.
+    """
+    if channels == 'bgra':
+        return bgra
+    if channels == 'bgr':
+        return bgra[:, :, :3]
+    if channels == 'rgb':
+        return bgra[:, :, 2::-1]
+    raise ValueError(f"Unknown channel layout: {channels}")
+
+class FrameRing:
+    """
+    Preallocated ring of BGRA frame buffers reused across grabs, so capturing never allocates.
+    A frame handed out from the ring stays valid until the ring wraps around (size grabs later);
+    consumers that keep frames longer than that must copy them.
+    """
+    def __init__(self, height, width, size=4, channels=4):
+        self.buffers = np.empty((size, height, width, channels), dtype=np.uint8)
+        self.size = size
+        self.index = -1
+
+    @property
+    def shape(self):
+        return self.buffers.shape[1:]
+
+    def fill(self, bgra):
+        """Copy a BGRA frame (e.g., screenshot_view) into the next slot and return that slot."""
+        self.index = (self.index + 1) % self.size
+        slot = self.buffers[self.index]
+        np.copyto(slot, bgra)
+        return slot
+
+    def latest(self):
+        return self.buffers[self.index] if self.index >= 0 else None
+
 class VisualInputCapture:
-    def __init__(self, region, output_dir, frame_rate=10):
+    def __init__(self, region, output_dir, frame_rate=10, ring_size=4, session_factory=None):
         """
         region: dict with 'top', 'left', 'width', 'height' keys
         output_dir: directory to save frames
         frame_rate: frames per second
+        ring_size: number of preallocated frame buffers reused by get_frame_array/stream_frames
+        session_factory: callable returning a new screen-grab session (default: mss.mss); tests inject fakes
         """
         self.region = region
+        self.session_factory = session_factory or mss.mss
         self.output_dir = output_dir
         self.frame_rate = frame_rate
+        self.ring_size = ring_size
+        self._ring = None
         os.makedirs(self.output_dir, exist_ok=True)
         self.paused = False
+        # mss sessions are per-thread (X11 display + shared memory); keep one alive per calling thread
+        self._local = threading.local()
+        # Background capture engine state (see start())
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self._latest = None  # (ring slot, capture timestamp, monotonic time, sequence number)
+        self.frame_seq = 0
+
+    def _session(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._local.sct = self.session_factory()
+        return sct
+
+    def close(self):
+        """Stop the capture thread and close this thread's mss session."""
+        self.stop()
+        sct = getattr(self._local, 'sct', None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        """
+        Start the background capture engine: one long-lived mss session owned by a dedicated thread that
+        grabs at frame_rate into the ring buffer. get_latest()/get_frame_array() then return the newest
+        frame in O(1) without paying the grab latency.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="VisualCaptureThread", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _capture_loop(self):
+        period = 1.0 / self.frame_rate
+        with self.session_factory() as sct:
+            next_deadline = time.monotonic()
+            while self._running:
+                if not self.paused:
+                    try:
+                        t_capture = time.time()
+                        t_mono = time.monotonic()
+                        slot = self._grab_into_ring(sct)
+                        with self._lock:
+                            self.frame_seq += 1
+                            self._latest = (slot, t_capture, t_mono, self.frame_seq)
+                    except Exception as e:
+                        print(f"[ERROR] VisualCaptureThread grab failed: {e}")
+                # Deadline-based pacing: sleep until the next slot, skip slots we already missed
+                next_deadline += period
+                now = time.monotonic()
+                if next_deadline < now:
+                    next_deadline = now
+                time.sleep(max(0.0, next_deadline - now))
+
+    def get_latest(self, channels='bgr'):
+        """
+        Latest frame from the background capture engine, in O(1).
+        Returns:
+            (frame, timestamp, seq): channel view into the ring buffer (valid for ring_size frames),
+            capture time (time.time()) and frame sequence number; (None, None, None) if paused or
+            nothing has been captured yet.
+        """
+        if self.paused:
+            return None, None, None
+        with self._lock:
+            latest = self._latest
+        if latest is None:
+            return None, None, None
+        slot, timestamp, _, seq = latest
+        return channel_view(slot, channels), timestamp, seq
+
+    def get_latest_monotonic(self):
+        """Monotonic capture time of the latest frame (time.monotonic()), for cross-modal alignment."""
+        with self._lock:
+            return self._latest[2] if self._latest is not None else None
+
+    def _grab_into_ring(self, sct):
+        # Copy mss's BGRA memory straight into a preallocated buffer (the only copy on this path)
+        img = sct.grab(self.region)
+        bgra = screenshot_view(img)
+        if self._ring is None or self._ring.shape != bgra.shape:
+            self._ring = FrameRing(bgra.shape[0], bgra.shape[1], size=self.ring_size)
+        return self._ring.fill(bgra)
+
+    def get_frame_array(self, channels='bgr'):
+        """
+        Capture a frame into the ring buffer and return it as a NumPy view.
+        If the background capture engine is running, returns its latest frame instead (no grab).
+        Args:
+            channels: 'bgr' (default, OpenCV order), 'rgb' or 'bgra'; all are views, no conversion copy
+        Returns:
+            (H, W, C) uint8 view into a ring slot (valid for ring_size grabs), or None if paused.
+        """
+        if self.paused:
+            return None
+        if self._running:
+            return self.get_latest(channels)[0]
+        return channel_view(self._grab_into_ring(self._session()), channels)
 
     def get_frame(self):
         """
@@ -34,9 +208,8 @@ class VisualInputCapture:
         """
         if self.paused:
             return None
-        with mss.mss() as sct:
-            img = sct.grab(self.region)
-            return img  # You may convert to numpy array if needed
+        img = self._session().grab(self.region)
+        return img  # You may convert to numpy array if needed
     def pause(self):
         self.paused = True
 
@@ -47,7 +220,7 @@ class VisualInputCapture:
         """
         Capture frames for a given duration (seconds).
         """
-        with mss.mss() as sct:
+        with self.session_factory() as sct:
             end_time = time.time() + duration
             while time.time() < end_time:
                 t0 = time.time()
@@ -55,7 +228,8 @@ class VisualInputCapture:
                 timestamp = t0
                 frame_path = os.path.join(self.output_dir, f"frame_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png")
                 mss.tools.to_png(img.rgb, img.size, output=frame_path)
-                print(f"[DEBUG] Frame captured in {time.time() - t0:.4f}s at timestamp {timestamp}")
+                if tracer.enabled(DEBUG):
+                    tracer.debug('visual.capture_frame', seconds=time.time() - t0, timestamp=timestamp)
                 time.sleep(1.0 / self.frame_rate)
                 os.remove(frame_path)
 
@@ -65,21 +239,18 @@ class VisualInputCapture:
         If duration is set, stream for that many seconds; else, run until interrupted.
         """
         import traceback
-        import numpy as np
-        with mss.mss() as sct:
+        with self.session_factory() as sct:
             start_time = time.time()
             try:
                 while True:
                     t0 = time.time()
-                    img = sct.grab(self.region)
-                    # Convert ScreenShot to numpy array (H, W, 3, uint8)
-                    frame = np.array(img)
-                    # mss returns BGRA; convert to BGR for OpenCV compatibility
-                    if frame.shape[2] == 4:
-                        frame = frame[:, :, :3]
+                    # mss returns BGRA; the BGR view is OpenCV compatible without a conversion copy.
+                    # Frames live in the ring buffer: callbacks that keep them must copy.
+                    with tracer.span('visual.grab'):
+                        frame = channel_view(self._grab_into_ring(sct), 'bgr')
                     timestamp = t0
-                    print(f"[DEBUG] Frame captured in {time.time() - t0:.4f}s at timestamp {timestamp}")
-                    callback(frame, timestamp)
+                    with tracer.span('visual.frame_callback'):
+                        callback(frame, timestamp)
                     if duration and (time.time() - start_time) > duration:
                         break
                     time.sleep(max(0, 1.0 / self.frame_rate - (time.time() - t0)))